@@ -0,0 +1,103 @@
+import argparse
+import json
+import platform
+import sys
+
+from benchmark.suite import STRUCTURES, WORKLOADS, runBenchmark
+
+
+# Benchmark suite for the structures in src/.
+# Usage: python -m benchmark --structures btree skiplist --workloads random zipf --sizes 1000 100000
+#            --repeat 5 --warmup 1 --output current.json --baseline previous.json --threshold 0.1
+# Results are written as JSON. With a baseline, every operation whose ops/s dropped
+# or whose peak memory grew by more than the threshold (a fraction) is reported and the exit code is 1.
+# Ops/s are compared as the median of the repeats, and a drop only counts when it is also larger than
+# the spread measured in either run, so the default 10% threshold is a floor for quiet machines:
+# on a noisy one the gate widens itself instead of flagging noise. Use at least 5 repeats for a gate,
+# with a single repeat there is no spread and the median is just one sample.
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    previous = {(r['structure'], r['workload'], r['size']): r for r in baseline['results']}
+    regressions = []
+
+    for result in results:
+        old = previous.get((result['structure'], result['workload'], result['size']))
+        if old is None:
+            continue
+        name = f"{result['structure']}/{result['workload']}/{result['size']}"
+
+        for operation, measured in result['operations'].items():
+            oldMeasured = old['operations'].get(operation)
+            if oldMeasured is None:
+                continue
+            change = measured['opsPerSecond'] / oldMeasured['opsPerSecond'] - 1
+            allowed = max(threshold, measured.get('spread', 0), oldMeasured.get('spread', 0))
+            print(f"{name} {operation}: {change:+.1%} ops/s (allowed -{allowed:.1%})")
+            if change < -allowed:
+                regressions.append(f"{name} {operation} ops/s {change:+.1%}")
+
+        if result['peakBytes'] is not None and old.get('peakBytes'):
+            change = result['peakBytes'] / old['peakBytes'] - 1
+            print(f"{name} peak memory: {change:+.1%}")
+            if change > threshold:
+                regressions.append(f"{name} peak memory {change:+.1%}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description="Benchmark suite for the structures in src/")
+    parser.add_argument('--structures', nargs='+', choices=sorted(STRUCTURES), default=sorted(STRUCTURES))
+    parser.add_argument('--workloads', nargs='+', choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON file of a previous run to compare with")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per configuration, the median is reported")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs per configuration before the timed ones")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="allowed relative regression of the median, widened to the measured spread")
+    arguments = parser.parse_args()
+
+    results = []
+    for structure in arguments.structures:
+        for workload in arguments.workloads:
+            for size in arguments.sizes:
+                result = runBenchmark(structure, workload, size, arguments.seed, not arguments.no_memory,
+                                      arguments.repeat, arguments.warmup)
+                results.append(result)
+                for operation, measured in result['operations'].items():
+                    print(f"{structure}/{workload}/{size} {operation}: {measured['opsPerSecond']:,.0f} ops/s "
+                          f"(spread {measured['spread']:.1%}), p50 {measured['p50Ns']:,.0f} ns, "
+                          f"p99 {measured['p99Ns']:,.0f} ns")
+                if result['peakBytes'] is not None:
+                    print(f"{structure}/{workload}/{size} peak memory: {result['peakBytes']:,} bytes")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': arguments.seed,
+        'repeat': arguments.repeat,
+        'warmup': arguments.warmup,
+        'results': results,
+    }
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(results, json.load(file), arguments.threshold)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import argparse
+import random
+import threading
+import time
+
+from src.skiplist.concurrent_skiplist import ConcurrentSkipList
+from src.skiplist.skiplist import SkipList
+
+
+# Multi-threaded stress benchmark: every thread runs the same mix of get/add/delete on one shared skip list.
+# The lazy ConcurrentSkipList is compared with the sequential SkipList wrapped in one global lock.
+# Usage: python -m benchmark.concurrent_skiplist --keys 100000 --operations 200000 --threads 1 2 4 8
+
+
+class LockedSkipList:
+
+    def __init__(self, maxLevel: int, fractionOfLevelReferencingNextLevel: float):
+        self.__skipList = SkipList(maxLevel, fractionOfLevelReferencingNextLevel)
+        self.__lock = threading.Lock()
+
+    def add(self, key):
+        with self.__lock:
+            self.__skipList.add(key)
+
+    def delete(self, key):
+        with self.__lock:
+            self.__skipList.delete(key)
+
+    def get(self, key):
+        with self.__lock:
+            return self.__skipList.get(key)
+
+
+def runWorkload(skipList, threadCount: int, operations: int, keys: int, writeRatio: float) -> float:
+    perThread = operations // threadCount
+    barrier = threading.Barrier(threadCount + 1)
+
+    def worker(seed):
+        generator = random.Random(seed)
+        barrier.wait()
+        for _ in range(perThread):
+            key = generator.randrange(keys)
+            choice = generator.random()
+            if choice < writeRatio / 2:
+                skipList.add(key)
+            elif choice < writeRatio:
+                skipList.delete(key)
+            else:
+                skipList.get(key)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(threadCount)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return perThread * threadCount / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of shared skip lists by thread count")
+    parser.add_argument('--keys', type=int, default=100_000)
+    parser.add_argument('--operations', type=int, default=200_000)
+    parser.add_argument('--write-ratio', type=float, default=0.1)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--max-level', type=int, default=17)
+    arguments = parser.parse_args()
+
+    print(f"{'threads':>7} {'locked ops/s':>14} {'concurrent ops/s':>17}")
+    for threadCount in arguments.threads:
+        results = []
+        for factory in (LockedSkipList, ConcurrentSkipList):
+            skipList = factory(arguments.max_level, 0.5)
+            for key in range(0, arguments.keys, 2):
+                skipList.add(key)
+            results.append(runWorkload(skipList, threadCount, arguments.operations, arguments.keys,
+                                       arguments.write_ratio))
+        print(f"{threadCount:>7} {results[0]:>14,.0f} {results[1]:>17,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.kd_tree.kd_forest import KDForest
+from src.kd_tree.kdtree import KDTree
+
+
+# Recall against queries per second of the approximate k-NN modes of KDTree and KDForest.
+# 1. Points are drawn around random cluster centres, like embeddings, queries come from the same clusters.
+# 2. The exact answers are computed by brute force, recall is the fraction of the true k nearest ids returned.
+# 3. Every configuration answers all queries one by one, queries/s is the number of queries over the wall time.
+# Usage: python -m benchmark.kd_tree_approximate --points 100000 --dimensions 32 --checks 8 32 128 512
+#            --trees 1 4 8 --epsilons 0.5 1 --output approximate.json
+
+
+def clusteredPoints(generator: np.random.Generator, centres: np.ndarray, size: int) -> np.ndarray:
+    return centres[generator.integers(len(centres), size=size)] + generator.normal(size=(size, centres.shape[1]))
+
+
+def exactNeighbours(points: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    squaredNorms = np.einsum('ij,ij->i', points, points)
+    neighbours = []
+    for chunk in np.array_split(queries, max(1, len(queries) // 64)):
+        distances = squaredNorms - 2 * chunk @ points.T
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        neighbours.append(nearest)
+    return np.concatenate(neighbours)
+
+
+def measure(search, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    found = 0
+    start = time.perf_counter()
+    results = [search(query)[1] for query in queries]
+    elapsed = time.perf_counter() - start
+    for ids, expected in zip(results, truth):
+        found += len(np.intersect1d(ids, expected))
+    return {'recall': found / (k * len(queries)), 'queriesPerSecond': len(queries) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall against queries/s of approximate KD-tree search")
+    parser.add_argument('--points', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=1_000)
+    parser.add_argument('--dimensions', type=int, default=32)
+    parser.add_argument('--clusters', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--checks', type=int, nargs='+', default=[8, 32, 128, 512], help="max_leaf_checks budgets")
+    parser.add_argument('--trees', type=int, nargs='+', default=[1, 4, 8], help="forest sizes, 1 is a plain KDTree")
+    parser.add_argument('--epsilons', type=float, nargs='+', default=[0.5, 1.0, 2.0])
+    parser.add_argument('--leaf-size', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results to this JSON file")
+    arguments = parser.parse_args()
+
+    generator = np.random.default_rng(arguments.seed)
+    centres = generator.normal(size=(arguments.clusters, arguments.dimensions)) * 4
+    points = clusteredPoints(generator, centres, arguments.points)
+    queries = clusteredPoints(generator, centres, arguments.queries)
+    truth = exactNeighbours(points, queries, arguments.k)
+    k = arguments.k
+
+    tree = KDTree(points, arguments.leaf_size)
+    configurations = [('exact', {}, lambda query: tree.nearest(query, k))]
+    for epsilon in arguments.epsilons:
+        configurations.append(('epsilon', {'epsilon': epsilon},
+                               lambda query, epsilon=epsilon: tree.nearest(query, k, epsilon=epsilon)))
+    for trees in arguments.trees:
+        index = tree if trees == 1 else KDForest(points, trees, arguments.leaf_size, seed=arguments.seed)
+        for checks in arguments.checks:
+            configurations.append(('best-bin-first', {'trees': trees, 'max_leaf_checks': checks},
+                                   lambda query, index=index, checks=checks:
+                                   index.nearest(query, k, max_leaf_checks=checks)))
+
+    results = []
+    print(f"{'mode':<15} {'parameters':<32} {'recall':>7} {'queries/s':>11}")
+    for mode, parameters, search in configurations:
+        measured = measure(search, queries, truth, k)
+        results.append({'mode': mode, **parameters, **measured})
+        described = ', '.join(f"{name}={value}" for name, value in parameters.items())
+        print(f"{mode:<15} {described:<32} {measured['recall']:>7.3f} {measured['queriesPerSecond']:>11,.0f}")
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump({'points': arguments.points, 'dimensions': arguments.dimensions, 'k': k,
+                       'results': results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
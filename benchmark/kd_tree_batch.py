@@ -0,0 +1,39 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.kd_tree.kdtree import KDTree
+
+
+# Throughput of KDTree.query_batch by number of worker processes.
+# Setting up the shared memory and starting the pool are timed as well, they are part of every batch.
+# Usage: python -m benchmark.kd_tree_batch --points 1000000 --queries 200000 --k 10 --workers 1 2 4 8
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of KDTree.query_batch by worker count")
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200_000)
+    parser.add_argument('--dimensions', type=int, default=3)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+
+    generator = np.random.default_rng(arguments.seed)
+    tree = KDTree(generator.random((arguments.points, arguments.dimensions)))
+    queries = generator.random((arguments.queries, arguments.dimensions))
+
+    print(f"{'workers':>7} {'queries/s':>12} {'speedup':>8}")
+    single = None
+    for workers in arguments.workers:
+        start = time.perf_counter()
+        tree.query_batch(queries, arguments.k, workers=workers)
+        throughput = len(queries) / (time.perf_counter() - start)
+        single = single or throughput
+        print(f"{workers:>7} {throughput:>12,.0f} {throughput / single:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
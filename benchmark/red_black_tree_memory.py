@@ -0,0 +1,61 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from src.red_black_tree.tree import RedBlackTree
+
+
+# Bytes per key and operation throughput of RedBlackTree.
+# Keys are created before tracing starts, so only the memory of the tree itself is counted.
+# Usage: python -m benchmark.red_black_tree_memory --keys 1000000
+
+
+def measureMemory(keys: list) -> float:
+    tracemalloc.start()
+    tree = RedBlackTree()
+    for key in keys:
+        tree.insert(key)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(keys)
+
+
+def measureThroughput(keys: list) -> dict:
+    tree = RedBlackTree()
+    results = {}
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.insert(key)
+    results['insert'] = len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.get(key)
+    results['get'] = len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.delete(key)
+    results['delete'] = len(keys) / (time.perf_counter() - start)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and throughput of RedBlackTree")
+    parser.add_argument('--keys', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+
+    keys = [x * 7 + 1000 for x in range(arguments.keys)]
+    random.Random(arguments.seed).shuffle(keys)
+
+    print(f"bytes/key: {measureMemory(keys):.1f}")
+    for operation, opsPerSecond in measureThroughput(keys).items():
+        print(f"{operation} ops/s: {opsPerSecond:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from src.ordered_set.ordered_set import BACKENDS
+from src.ordered_set.trace import OPERATION_NAMES, apply, readTrace
+
+
+# Replays a recorded ordered-set trace (see src/ordered_set/trace.py) against every backend.
+# 1. Records are loaded into memory first, so reading the file is not timed.
+# 2. Every operation is timed separately and the times are summed up per operation type.
+# 3. Peak memory is measured in a second replay under tracemalloc.
+# 4. Results of every operation are compared with the first backend, a mismatch makes the exit code 1.
+# Usage: python -m benchmark.replay_trace traffic.trace --backends btree skiplist red_black_tree --output replay.json
+
+
+def replay(backendName: str, records: list):
+    orderedSet = BACKENDS[backendName]()
+    clock = time.perf_counter_ns
+    timings = {name: [0, 0] for name in OPERATION_NAMES.values()}
+    results = []
+
+    for operation, key in records:
+        start = clock()
+        result = apply(orderedSet, operation, key)
+        elapsed = clock() - start
+        timing = timings[OPERATION_NAMES[operation]]
+        timing[0] += 1
+        timing[1] += elapsed
+        results.append(result)
+
+    breakdown = {name: {'count': count, 'totalNs': total, 'opsPerSecond': count * 1e9 / total if total else None}
+                 for name, (count, total) in timings.items() if count > 0}
+    return breakdown, results
+
+
+def measureMemory(backendName: str, records: list) -> dict:
+    tracemalloc.start()
+    try:
+        orderedSet = BACKENDS[backendName]()
+        for operation, key in records:
+            apply(orderedSet, operation, key)
+        current, peak = tracemalloc.get_traced_memory()
+        return {'finalBytes': current, 'peakBytes': peak}
+    finally:
+        tracemalloc.stop()
+
+
+def firstMismatch(expected: list, actual: list):
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left != right:
+            return index
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay an ordered-set trace against every backend")
+    parser.add_argument('trace')
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc replay")
+    parser.add_argument('--output', help="write the breakdown to this JSON file")
+    arguments = parser.parse_args()
+
+    records = list(readTrace(arguments.trace))
+    print(f"{len(records):,} operations")
+
+    report = {'operations': len(records), 'backends': {}}
+    expected = None
+    mismatches = []
+
+    for backend in arguments.backends:
+        breakdown, results = replay(backend, records)
+        report['backends'][backend] = {'operations': breakdown}
+        for name, timing in breakdown.items():
+            print(f"{backend} {name}: {timing['count']:,} ops, {timing['totalNs'] / 1e6:,.1f} ms, "
+                  f"{timing['opsPerSecond'] or 0:,.0f} ops/s")
+
+        if not arguments.no_memory:
+            memory = measureMemory(backend, records)
+            report['backends'][backend].update(memory)
+            print(f"{backend} memory: peak {memory['peakBytes']:,} bytes, final {memory['finalBytes']:,} bytes")
+
+        if expected is None:
+            expected, expectedBackend = results, backend
+        else:
+            index = firstMismatch(expected, results)
+            if index is not None:
+                operation, key = records[index]
+                mismatches.append(f"{backend} differs from {expectedBackend} at operation {index} "
+                                  f"({OPERATION_NAMES[operation]} {key!r}): "
+                                  f"{results[index]!r} != {expected[index]!r}")
+
+    report['mismatches'] = mismatches
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    for mismatch in mismatches:
+        print(mismatch)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import random
+import statistics
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+from src.b_tree.btree import BTree
+from src.min_max_heap.heap import MinMaxHeap
+from src.red_black_tree.tree import RedBlackTree
+from src.skiplist.skiplist import SkipList
+
+
+# Workloads and structures of the benchmark suite, see benchmark/__main__.py for the command line.
+# 1. A workload is a list of keys, every operation of a structure is run once per key in that order.
+# 2. Every operation is timed separately with perf_counter_ns for the p50/p99 latency,
+#    ops/s is the number of operations divided by the wall time of the whole phase (timer calls included).
+# 3. Peak memory is measured in a separate run of the first phase under tracemalloc,
+#    tracing slows the interpreter down too much to time anything at the same time.
+#    Keys are created before tracing starts, so only the memory of the structure is counted.
+# 4. A configuration is first run `warmup` times untimed, then `repeat` times on a fresh structure each.
+#    Every repeat is kept under 'repeats', the reported ops/s, p50 and p99 are the medians of the repeats
+#    and 'spread' is (max - min) / median of the repeated ops/s, i.e. how noisy the measurement was.
+
+
+def sortedKeys(size: int, generator: random.Random) -> list:
+    return [x * 7 for x in range(size)]
+
+
+def randomKeys(size: int, generator: random.Random) -> list:
+    keys = sortedKeys(size, generator)
+    generator.shuffle(keys)
+    return keys
+
+
+# Alternates between the smallest and the largest remaining key, so every insert lands at one of the two ends
+# and every search runs along the outermost spines.
+def adversarialKeys(size: int, generator: random.Random) -> list:
+    keys = sortedKeys(size, generator)
+    result = []
+    lo, hi = 0, size - 1
+    while lo <= hi:
+        result.append(keys[lo])
+        if lo != hi:
+            result.append(keys[hi])
+        lo += 1
+        hi -= 1
+    return result
+
+
+# Keys drawn from `size` distinct values with probability proportional to 1 / rank^1.1, so a few keys repeat a lot.
+# Each value's position in the key space is random, so hot keys are scattered through the structure.
+def zipfKeys(size: int, generator: random.Random, exponent: float = 1.1) -> list:
+    values = randomKeys(size, generator)
+    cumulativeWeights = list(accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+    total = cumulativeWeights[-1]
+    return [values[bisect_left(cumulativeWeights, generator.random() * total)] for _ in range(size)]
+
+
+WORKLOADS = {
+    'sorted': sortedKeys,
+    'random': randomKeys,
+    'adversarial': adversarialKeys,
+    'zipf': zipfKeys,
+}
+
+
+# A structure is a function which creates an instance for the given keys
+# and returns its phases as (operation name, function called with each key) in the order they are run.
+
+def btreePhases(keys: list) -> list:
+    tree = BTree(32)
+    return [('insert', tree.insert), ('get', tree.get), ('delete', tree.delete)]
+
+
+def skipListPhases(keys: list) -> list:
+    skipList = SkipList(max(1, len(keys).bit_length()), 0.5)
+    return [('insert', skipList.add), ('get', skipList.get), ('delete', skipList.delete)]
+
+
+def redBlackTreePhases(keys: list) -> list:
+    tree = RedBlackTree()
+    return [('insert', tree.insert), ('get', tree.get), ('delete', tree.delete)]
+
+
+def minMaxHeapPhases(keys: list) -> list:
+    heap = MinMaxHeap()
+    return [('add', heap.add),
+            ('pop_min', lambda _: heap.pop_min())]
+
+
+# Keys become points on a 2-D curve, the tree is built once from all of them and queried with every key
+def kdTreePhases(keys: list) -> list:
+    import numpy as np
+    from src.kd_tree.kdtree import KDTree
+
+    points = np.array(keys, dtype=np.float64)
+    tree = KDTree(np.column_stack((points, np.sqrt(points))))
+    return [('nearest', lambda key: tree.nearest((key, key ** 0.5)))]
+
+
+STRUCTURES = {
+    'btree': btreePhases,
+    'skiplist': skipListPhases,
+    'red_black_tree': redBlackTreePhases,
+    'min_max_heap': minMaxHeapPhases,
+    'kd_tree': kdTreePhases,
+}
+
+
+def percentile(sortedValues, percent: float) -> int:
+    return sortedValues[min(len(sortedValues) - 1, int(len(sortedValues) * percent / 100))]
+
+
+def runPhase(function, keys: list) -> dict:
+    latencies = array('q', bytes(8 * len(keys)))
+    clock = time.perf_counter_ns
+
+    start = clock()
+    for i, key in enumerate(keys):
+        operationStart = clock()
+        function(key)
+        latencies[i] = clock() - operationStart
+    elapsed = clock() - start
+
+    latencies = sorted(latencies)
+    return {
+        'opsPerSecond': len(keys) * 1e9 / elapsed,
+        'p50Ns': percentile(latencies, 50),
+        'p99Ns': percentile(latencies, 99),
+    }
+
+
+def measurePeakMemory(structure, keys: list) -> int:
+    tracemalloc.start()
+    try:
+        _, function = structure(keys)[0]
+        for key in keys:
+            function(key)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(repeats: list) -> dict:
+    opsPerSecond = [measured['opsPerSecond'] for measured in repeats]
+    median = statistics.median(opsPerSecond)
+    return {
+        'opsPerSecond': median,
+        'p50Ns': statistics.median(measured['p50Ns'] for measured in repeats),
+        'p99Ns': statistics.median(measured['p99Ns'] for measured in repeats),
+        'spread': (max(opsPerSecond) - min(opsPerSecond)) / median,
+        'repeats': repeats,
+    }
+
+
+def runBenchmark(structureName: str, workloadName: str, size: int, seed: int, measureMemory: bool = True,
+                 repeat: int = 1, warmup: int = 0) -> dict:
+    if repeat < 1 or warmup < 0:
+        raise ValueError(f"Expected repeat >= 1 and warmup >= 0, got {repeat} and {warmup}")
+    keys = WORKLOADS[workloadName](size, random.Random(seed))
+    structure = STRUCTURES[structureName]
+
+    for _ in range(warmup):
+        for _, function in structure(keys):
+            for key in keys:
+                function(key)
+
+    repeats = {}
+    for _ in range(repeat):
+        for operation, function in structure(keys):
+            repeats.setdefault(operation, []).append(runPhase(function, keys))
+
+    result = {'structure': structureName, 'workload': workloadName, 'size': size,
+              'operations': {operation: summarize(measured) for operation, measured in repeats.items()}}
+    result['peakBytes'] = measurePeakMemory(structure, keys) if measureMemory else None
+    return result
@@ -1,4 +1,7 @@
+from bisect import bisect_left
+
 from src.b_tree.node import Node
+from src.key_file.key_file import dumpKeys, loadKeys
 
 
 # Properties of B-Tree:
@@ -20,6 +23,85 @@ class BTree:
         self.root = Node(True)
         self.termMinimumDegree = termMinimumDegree
 
+    # Builds the tree bottom-up from keys in non-decreasing order in O(n).
+    # Only the rightmost node of every level is kept open while the input is streamed:
+    # once it holds `fill_factor` of the maximum keys, the next key becomes a separator in the level above
+    # and a new node is started. The underfull right spine left at the end is repaired from its left siblings.
+    @classmethod
+    def from_sorted(cls, iterable, termMinimumDegree, fill_factor=1.0):
+        if not 0 < fill_factor <= 1:
+            raise ValueError("Fill factor must be in (0, 1]")
+
+        tree = cls(termMinimumDegree)
+        maxKeys = tree.__maxKeys()
+        capacity = max(termMinimumDegree - 1, min(maxKeys, round(fill_factor * maxKeys)), 1)
+        spine = [tree.root]
+        previous = None
+        isFirst = True
+
+        for key in iterable:
+            if not isFirst and key < previous:
+                raise ValueError("Keys must be sorted in non-decreasing order")
+            previous = key
+            isFirst = False
+
+            level = 0
+            while level < len(spine) and len(spine[level].keys) == capacity:
+                level += 1
+            if level == len(spine):
+                root = Node()
+                root.child.append(spine[-1])
+                spine.append(root)
+            spine[level].keys.append(key)
+            for lowerLevel in range(level - 1, -1, -1):
+                spine[lowerLevel] = Node(lowerLevel == 0)
+                spine[lowerLevel + 1].child.append(spine[lowerLevel])
+
+        tree.root = spine[-1]
+        tree.__repairRightSpine()
+        return tree
+
+    # Writes the keys in order to a binary snapshot, see src/key_file/key_file.py
+    def dump(self, path):
+        dumpKeys(path, 'BTree', {'termMinimumDegree': self.termMinimumDegree}, list(self))
+
+    # Streams the keys of a snapshot from the memory-mapped file straight into from_sorted
+    @classmethod
+    def load(cls, path, fill_factor=1.0):
+        with loadKeys(path, 'BTree') as (parameters, keys):
+            return cls.from_sorted(keys, parameters['termMinimumDegree'], fill_factor)
+
+    def __repairRightSpine(self):
+        node = self.root
+        while not node.isLeaf:
+            if len(node.keys) == 0:
+                self.root = node = node.child[0]
+            elif len(node.child[-1].keys) < self.termMinimumDegree - 1:
+                self.__fillLastChild(node)
+                node = self.root
+            else:
+                node = node.child[-1]
+
+    def __fillLastChild(self, node: Node):
+        left, right = node.child[-2], node.child[-1]
+        keys = left.keys + [node.keys[-1]] + right.keys
+        children = left.child + right.child
+
+        if len(keys) <= self.__maxKeys():
+            left.keys = keys
+            left.child = children
+            node.keys.pop()
+            node.child.pop()
+            return
+
+        leftKeysCount = len(keys) - self.termMinimumDegree
+        left.keys = keys[:leftKeysCount]
+        node.keys[-1] = keys[leftKeysCount]
+        right.keys = keys[leftKeysCount + 1:]
+        if not left.isLeaf:
+            left.child = children[:leftKeysCount + 1]
+            right.child = children[leftKeysCount + 1:]
+
     def insert(self, key):
         root = self.root
 
@@ -41,7 +123,7 @@ class BTree:
         node.child.insert(childIndex + 1, splitChildSecondPart)
         node.keys.insert(childIndex, child.keys[self.termMinimumDegree - 1])
         splitChildSecondPart.keys = child.keys[self.termMinimumDegree: self.__maxKeys()]
-        child.keys = child.keys[0: self.termMinimumDegree]
+        child.keys = child.keys[0: self.termMinimumDegree - 1]
         if not child.isLeaf:
             splitChildSecondPart.child = child.child[self.termMinimumDegree: 2 * self.termMinimumDegree]
             child.child = child.child[0: self.termMinimumDegree]
@@ -85,3 +167,157 @@ class BTree:
             return None
 
         return self.__get(key, node.child[i])
+
+    # Deletion is a single downward pass: before descending into a child that holds only t-1 keys
+    # the child is refilled by borrowing a key from a sibling or by merging it with one,
+    # so removing a key from a leaf never leaves a node with fewer than t-1 keys behind.
+    def delete(self, key):
+        self.__deleteFromNode(self.root, key)
+        if len(self.root.keys) == 0 and not self.root.isLeaf:
+            self.root = self.root.child[0]
+
+    def __deleteFromNode(self, node: Node, key):
+        index = bisect_left(node.keys, key)
+
+        if index < len(node.keys) and node.keys[index] == key:
+            if node.isLeaf:
+                node.keys.pop(index)
+            elif len(node.child[index].keys) >= self.termMinimumDegree:
+                predecessor = self.__maximum(node.child[index])
+                node.keys[index] = predecessor
+                self.__deleteFromNode(node.child[index], predecessor)
+            elif len(node.child[index + 1].keys) >= self.termMinimumDegree:
+                successor = self.__minimum(node.child[index + 1])
+                node.keys[index] = successor
+                self.__deleteFromNode(node.child[index + 1], successor)
+            else:
+                self.__mergeChildren(node, index)
+                self.__deleteFromNode(node.child[index], key)
+            return
+
+        if node.isLeaf:
+            return
+
+        if len(node.child[index].keys) < self.termMinimumDegree:
+            index = self.__fillChild(node, index)
+        self.__deleteFromNode(node.child[index], key)
+
+    def __fillChild(self, node: Node, index: int) -> int:
+        if index > 0 and len(node.child[index - 1].keys) >= self.termMinimumDegree:
+            self.__borrowFromLeft(node, index)
+        elif index < len(node.keys) and len(node.child[index + 1].keys) >= self.termMinimumDegree:
+            self.__borrowFromRight(node, index)
+        elif index < len(node.keys):
+            self.__mergeChildren(node, index)
+        else:
+            index -= 1
+            self.__mergeChildren(node, index)
+        return index
+
+    @staticmethod
+    def __borrowFromLeft(node: Node, index: int):
+        child, left = node.child[index], node.child[index - 1]
+        child.keys.insert(0, node.keys[index - 1])
+        node.keys[index - 1] = left.keys.pop()
+        if not child.isLeaf:
+            child.child.insert(0, left.child.pop())
+
+    @staticmethod
+    def __borrowFromRight(node: Node, index: int):
+        child, right = node.child[index], node.child[index + 1]
+        child.keys.append(node.keys[index])
+        node.keys[index] = right.keys.pop(0)
+        if not child.isLeaf:
+            child.child.append(right.child.pop(0))
+
+    @staticmethod
+    def __mergeChildren(node: Node, index: int):
+        left, right = node.child[index], node.child.pop(index + 1)
+        left.keys.append(node.keys.pop(index))
+        left.keys.extend(right.keys)
+        left.child.extend(right.child)
+
+    @staticmethod
+    def __minimum(node: Node):
+        while not node.isLeaf:
+            node = node.child[0]
+        return node.keys[0]
+
+    @staticmethod
+    def __maximum(node: Node):
+        while not node.isLeaf:
+            node = node.child[-1]
+        return node.keys[-1]
+
+    def __iter__(self):
+        return self.range()
+
+    # Yields keys in [lo, hi) lazily, a missing bound means the range is open on that side.
+    # The tree is descended once to the first key, after that the cursor stack holds one (node, index) pair
+    # per level: for a leaf the index is the next key to yield, for an internal node it is the child being visited.
+    def range(self, lo=None, hi=None, reverse=False):
+        if reverse:
+            return self.__reversedRange(lo, hi)
+        return self.__forwardRange(lo, hi)
+
+    def __forwardRange(self, lo, hi):
+        stack = []
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, lo) if lo is not None else 0
+            stack.append([node, index])
+            if node.isLeaf:
+                break
+            node = node.child[index]
+
+        while len(stack) > 0:
+            cursor = stack[-1]
+            node, index = cursor
+            if index >= len(node.keys):
+                stack.pop()
+                continue
+
+            key = node.keys[index]
+            if hi is not None and not key < hi:
+                return
+            yield key
+
+            cursor[1] = index + 1
+            if not node.isLeaf:
+                child = node.child[index + 1]
+                while True:
+                    stack.append([child, 0])
+                    if child.isLeaf:
+                        break
+                    child = child.child[0]
+
+    def __reversedRange(self, lo, hi):
+        stack = []
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, hi) if hi is not None else len(node.keys)
+            stack.append([node, index])
+            if node.isLeaf:
+                break
+            node = node.child[index]
+
+        while len(stack) > 0:
+            cursor = stack[-1]
+            node, index = cursor
+            if index == 0:
+                stack.pop()
+                continue
+
+            key = node.keys[index - 1]
+            if lo is not None and key < lo:
+                return
+            yield key
+
+            cursor[1] = index - 1
+            if not node.isLeaf:
+                child = node.child[index - 1]
+                while True:
+                    stack.append([child, len(child.keys)])
+                    if child.isLeaf:
+                        break
+                    child = child.child[-1]
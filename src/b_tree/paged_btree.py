@@ -0,0 +1,217 @@
+from bisect import bisect_left, bisect_right
+
+from src.b_tree.pager import Pager, PageNode
+
+
+# Disk-backed B-Tree with the same properties as BTree, see src/b_tree/btree.py.
+# Every node is a page of a memory-mapped file (see src/b_tree/pager.py) and child pointers are page numbers.
+# Decoded nodes are kept in a bounded LRU cache, modified nodes are written back when they are evicted
+# or on flush(), so resident memory is bounded by the cache size and not by the number of keys.
+# Reopening an existing file only reads its header, nodes are loaded lazily as they are visited.
+#
+# If the minimum degree is not given it is the largest one whose node still fits into a page.
+# Keys must be packable with the `struct` key format, e.g. 'q' for int64 or 'd' for float64.
+
+
+class PagedBTree:
+
+    def __init__(self, path, pageSize=None, keyFormat=None, cacheSize: int = 1024, termMinimumDegree=None):
+        self.__pager = Pager(path, pageSize, keyFormat, cacheSize, termMinimumDegree)
+        self.termMinimumDegree = self.__pager.termMinimumDegree
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def flush(self):
+        self.__pager.flush()
+
+    def close(self):
+        self.__pager.close()
+
+    def __maxKeys(self) -> int:
+        return (2 * self.termMinimumDegree) - 1
+
+    def __child(self, node: PageNode, index: int) -> PageNode:
+        return self.__pager.read(node.child[index])
+
+    def insert(self, key):
+        self.__pager.checkKey(key)
+        root = self.__pager.read(self.__pager.root)
+
+        if len(root.keys) == self.__maxKeys():
+            node = self.__pager.allocate()
+            node.child.append(root.page)
+            self.__pager.root = node.page
+            self.__splitChild(node, 0)
+            root = node
+
+        self.__insertToNode(root, key)
+        self.__pager.release()
+
+    def __splitChild(self, node: PageNode, childIndex: int):
+        t = self.termMinimumDegree
+        child = self.__child(node, childIndex)
+        splitChildSecondPart = self.__pager.allocate(child.isLeaf)
+        node.child.insert(childIndex + 1, splitChildSecondPart.page)
+        node.keys.insert(childIndex, child.keys[t - 1])
+        splitChildSecondPart.keys = child.keys[t:]
+        child.keys = child.keys[:t - 1]
+        if not child.isLeaf:
+            splitChildSecondPart.child = child.child[t:]
+            child.child = child.child[:t]
+        self.__markDirty(node, child)
+
+    def __insertToNode(self, node: PageNode, key):
+        while not node.isLeaf:
+            index = bisect_right(node.keys, key)
+            if len(self.__child(node, index).keys) == self.__maxKeys():
+                self.__splitChild(node, index)
+                if key > node.keys[index]:
+                    index += 1
+            node = self.__child(node, index)
+
+        node.keys.insert(bisect_right(node.keys, key), key)
+        self.__markDirty(node)
+
+    def get(self, key):
+        node = self.__pager.read(self.__pager.root)
+        result = None
+
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                result = key
+                break
+            if node.isLeaf:
+                break
+            node = self.__child(node, index)
+
+        self.__pager.release()
+        return result
+
+    def delete(self, key):
+        root = self.__pager.read(self.__pager.root)
+        self.__deleteFromNode(root, key)
+        if len(root.keys) == 0 and not root.isLeaf:
+            self.__pager.root = root.child[0]
+            self.__pager.free(root)
+        self.__pager.release()
+
+    def __deleteFromNode(self, node: PageNode, key):
+        t = self.termMinimumDegree
+
+        while True:
+            index = bisect_left(node.keys, key)
+
+            if index < len(node.keys) and node.keys[index] == key:
+                if node.isLeaf:
+                    node.keys.pop(index)
+                    self.__markDirty(node)
+                    return
+                left, right = self.__child(node, index), self.__child(node, index + 1)
+                if len(left.keys) >= t:
+                    key = node.keys[index] = self.__maximum(left)
+                    self.__markDirty(node)
+                    node = left
+                elif len(right.keys) >= t:
+                    key = node.keys[index] = self.__minimum(right)
+                    self.__markDirty(node)
+                    node = right
+                else:
+                    node = self.__mergeChildren(node, index)
+                continue
+
+            if node.isLeaf:
+                return
+
+            if len(self.__child(node, index).keys) < t:
+                index = self.__fillChild(node, index)
+            node = self.__child(node, index)
+
+    def __fillChild(self, node: PageNode, index: int) -> int:
+        t = self.termMinimumDegree
+        child = self.__child(node, index)
+        left = self.__child(node, index - 1) if index > 0 else None
+        right = self.__child(node, index + 1) if index < len(node.keys) else None
+
+        if left is not None and len(left.keys) >= t:
+            child.keys.insert(0, node.keys[index - 1])
+            node.keys[index - 1] = left.keys.pop()
+            if not child.isLeaf:
+                child.child.insert(0, left.child.pop())
+            self.__markDirty(node, child, left)
+        elif right is not None and len(right.keys) >= t:
+            child.keys.append(node.keys[index])
+            node.keys[index] = right.keys.pop(0)
+            if not child.isLeaf:
+                child.child.append(right.child.pop(0))
+            self.__markDirty(node, child, right)
+        elif right is not None:
+            self.__mergeChildren(node, index)
+        else:
+            index -= 1
+            self.__mergeChildren(node, index)
+        return index
+
+    def __mergeChildren(self, node: PageNode, index: int) -> PageNode:
+        left = self.__child(node, index)
+        right = self.__pager.read(node.child.pop(index + 1))
+        left.keys.append(node.keys.pop(index))
+        left.keys.extend(right.keys)
+        left.child.extend(right.child)
+        self.__markDirty(node, left)
+        self.__pager.free(right)
+        return left
+
+    def __markDirty(self, *nodes: PageNode):
+        for node in nodes:
+            self.__pager.markDirty(node)
+
+    def __minimum(self, node: PageNode):
+        while not node.isLeaf:
+            node = self.__child(node, 0)
+        return node.keys[0]
+
+    def __maximum(self, node: PageNode):
+        while not node.isLeaf:
+            node = self.__child(node, -1)
+        return node.keys[-1]
+
+    def __iter__(self):
+        return self.range()
+
+    # Yields keys in [lo, hi) in order with an O(height) cursor stack, like BTree.range.
+    def range(self, lo=None, hi=None):
+        stack = []
+        node = self.__pager.read(self.__pager.root)
+        while True:
+            index = bisect_left(node.keys, lo) if lo is not None else 0
+            stack.append([node, index])
+            if node.isLeaf:
+                break
+            node = self.__child(node, index)
+
+        while len(stack) > 0:
+            cursor = stack[-1]
+            node, index = cursor
+            if index >= len(node.keys):
+                stack.pop()
+                continue
+
+            key = node.keys[index]
+            if hi is not None and not key < hi:
+                return
+            yield key
+
+            cursor[1] = index + 1
+            if not node.isLeaf:
+                child = self.__child(node, index + 1)
+                while True:
+                    stack.append([child, 0])
+                    if child.isLeaf:
+                        break
+                    child = self.__child(child, 0)
+                self.__pager.release()
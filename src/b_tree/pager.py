@@ -0,0 +1,189 @@
+import mmap
+import os
+import struct
+from collections import OrderedDict
+
+from src.b_tree.node import Node
+
+
+# Layout of a paged B-Tree file:
+# 1. The file is a sequence of fixed-size pages, page 0 holds the header, node pages start at 1.
+# 2. A node page is: leaf flag (1 byte), key count (2 bytes), 2t-1 key slots, 2t child page numbers.
+#    Keys are packed with a fixed-width `struct` format, unused slots are zero filled.
+# 3. Freed pages form a linked list, the first 8 bytes of a free page hold the next free page number.
+#    Page number 0 (the header) is used as the end of that list.
+# 4. All numbers are little-endian, the file is grown geometrically and mapped with mmap.
+
+MAGIC = b'PYBTREE\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHIIQQQ16s')
+NODE_HEADER = struct.Struct('<BH')
+PAGE_NUMBER = struct.Struct('<Q')
+
+
+class PageNode(Node):
+
+    def __init__(self, page: int, isLeaf=False):
+        super().__init__(isLeaf)
+        self.page = page
+
+
+class Pager:
+
+    # Page size, key format and minimum degree are fixed when the file is created,
+    # when an existing file is opened they are read from its header and only checked if given.
+    def __init__(self, path, pageSize=None, keyFormat=None, cacheSize: int = 1024, termMinimumDegree=None):
+        if cacheSize < 1:
+            raise ValueError("Cache size must be positive")
+
+        self.cacheSize = cacheSize
+        self.__cache = OrderedDict()
+        self.__dirty = set()
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.__file = open(path, 'r+b' if exists else 'w+b')
+
+        if exists:
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+            self.__readHeader(pageSize, keyFormat, termMinimumDegree)
+        else:
+            self.pageSize = pageSize or 4096
+            self.keyFormat = keyFormat or 'q'
+            self.termMinimumDegree = termMinimumDegree or self.__maxDegree()
+            self.__defineLayout()
+            self.root = 0
+            self.pageCount = 1
+            self.__freeHead = 0
+            self.__file.truncate(16 * self.pageSize)
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+            self.root = self.allocate(True).page
+            self.flush()
+
+    def __maxDegree(self) -> int:
+        keySize = struct.calcsize('<' + self.keyFormat)
+        return (self.pageSize - NODE_HEADER.size + keySize) // (2 * (keySize + PAGE_NUMBER.size))
+
+    def __defineLayout(self):
+        if self.termMinimumDegree < 2:
+            raise ValueError(f"Page size {self.pageSize} is too small for keys of format '{self.keyFormat}'")
+
+        maxKeys = 2 * self.termMinimumDegree - 1
+        self.__key = struct.Struct('<' + self.keyFormat)
+        self.__keys = struct.Struct('<' + self.keyFormat * maxKeys)
+        self.__children = struct.Struct('<' + 'Q' * (maxKeys + 1))
+        self.__keyFiller = struct.unpack('<' + self.keyFormat, bytes(struct.calcsize('<' + self.keyFormat)))[0]
+        if NODE_HEADER.size + self.__keys.size + self.__children.size > self.pageSize:
+            raise ValueError(f"Minimum degree {self.termMinimumDegree} does not fit into a page of {self.pageSize}")
+
+    def __readHeader(self, pageSize, keyFormat, termMinimumDegree):
+        magic, version, self.pageSize, self.termMinimumDegree, self.root, self.pageCount, self.__freeHead, \
+            storedKeyFormat = HEADER.unpack_from(self.__mmap, 0)
+        self.keyFormat = storedKeyFormat.rstrip(b'\x00').decode('ascii')
+
+        if magic != MAGIC:
+            raise ValueError("Not a paged B-Tree file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported paged B-Tree file version {version}")
+        if pageSize is not None and pageSize != self.pageSize:
+            raise ValueError(f"File was created with page size {self.pageSize}")
+        if keyFormat is not None and keyFormat != self.keyFormat:
+            raise ValueError(f"File was created with key format '{self.keyFormat}'")
+        if termMinimumDegree is not None and termMinimumDegree != self.termMinimumDegree:
+            raise ValueError(f"File was created with minimum degree {self.termMinimumDegree}")
+
+        self.__defineLayout()
+
+    def __writeHeader(self):
+        HEADER.pack_into(self.__mmap, 0, MAGIC, VERSION, self.pageSize, self.termMinimumDegree, self.root,
+                         self.pageCount, self.__freeHead, self.keyFormat.encode('ascii'))
+
+    # A key that does not pack would only fail once its page is written back, so it is rejected up front
+    def checkKey(self, key):
+        try:
+            self.__key.pack(key)
+        except struct.error as error:
+            raise ValueError(f"Key {key!r} does not fit the key format '{self.keyFormat}': {error}") from None
+
+    def read(self, page: int) -> PageNode:
+        node = self.__cache.get(page)
+        if node is not None:
+            self.__cache.move_to_end(page)
+            return node
+
+        node = self.__decode(page)
+        self.__cache[page] = node
+        return node
+
+    def allocate(self, isLeaf=False) -> PageNode:
+        if self.__freeHead != 0:
+            page = self.__freeHead
+            self.__freeHead = PAGE_NUMBER.unpack_from(self.__mmap, page * self.pageSize)[0]
+        else:
+            page = self.pageCount
+            self.pageCount += 1
+            if self.pageCount * self.pageSize > len(self.__mmap):
+                self.__grow()
+
+        node = PageNode(page, isLeaf)
+        self.__cache[page] = node
+        self.__dirty.add(page)
+        return node
+
+    def free(self, node: PageNode):
+        self.__cache.pop(node.page, None)
+        self.__dirty.discard(node.page)
+        PAGE_NUMBER.pack_into(self.__mmap, node.page * self.pageSize, self.__freeHead)
+        self.__freeHead = node.page
+
+    def markDirty(self, node: PageNode):
+        self.__dirty.add(node.page)
+
+    # Nodes are only evicted here, never in the middle of an operation,
+    # so the nodes a B-Tree operation is holding cannot be written back and reloaded under it.
+    def release(self):
+        while len(self.__cache) > self.cacheSize:
+            page, node = next(iter(self.__cache.items()))
+            if page in self.__dirty:
+                self.__encode(node)
+                self.__dirty.discard(page)
+            del self.__cache[page]
+
+    def flush(self):
+        for page in self.__dirty:
+            self.__encode(self.__cache[page])
+        self.__dirty.clear()
+        self.__writeHeader()
+        self.__mmap.flush()
+
+    def close(self):
+        if self.__file.closed:
+            return
+        self.flush()
+        self.__mmap.close()
+        self.__file.close()
+
+    def __grow(self):
+        size = max(2 * len(self.__mmap), self.pageCount * self.pageSize)
+        self.__mmap.close()
+        self.__file.truncate(size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+
+    def __decode(self, page: int) -> PageNode:
+        offset = page * self.pageSize
+        isLeaf, count = NODE_HEADER.unpack_from(self.__mmap, offset)
+        node = PageNode(page, bool(isLeaf))
+        offset += NODE_HEADER.size
+        node.keys = list(self.__keys.unpack_from(self.__mmap, offset)[:count])
+        if not node.isLeaf:
+            node.child = list(self.__children.unpack_from(self.__mmap, offset + self.__keys.size)[:count + 1])
+        return node
+
+    def __encode(self, node: PageNode):
+        offset = node.page * self.pageSize
+        maxKeys = 2 * self.termMinimumDegree - 1
+        NODE_HEADER.pack_into(self.__mmap, offset, node.isLeaf, len(node.keys))
+        offset += NODE_HEADER.size
+        self.__keys.pack_into(self.__mmap, offset, *node.keys, *[self.__keyFiller] * (maxKeys - len(node.keys)))
+        if not node.isLeaf:
+            self.__children.pack_into(self.__mmap, offset + self.__keys.size,
+                                      *node.child, *[0] * (maxKeys + 1 - len(node.child)))
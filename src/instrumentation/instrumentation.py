@@ -0,0 +1,426 @@
+import threading
+from bisect import bisect_left, bisect_right
+
+from src.b_tree.btree import BTree
+from src.b_tree.paged_btree import PagedBTree
+from src.kd_tree.kdtree import KDTree
+from src.min_max_heap.bounded_heap import BoundedMinMaxHeap
+from src.min_max_heap.heap import MinMaxHeap
+from src.red_black_tree.tree import RedBlackTree
+from src.skiplist.concurrent_skiplist import ConcurrentSkipList
+from src.skiplist.skiplist import SkipList
+
+
+# Opt-in counters for the internals of the structures.
+# 1. instrument(structure) switches the class of that one instance to a generated subclass
+#    which overrides the hot private methods (rotations, fixups, splits, searches, swaps) to count them.
+#    Instances that are not instrumented keep their original class, so they pay nothing at all.
+# 2. Key comparisons are counted by wrapping the key of a single-key operation in a CountingKey,
+#    every comparison against a different node key is also counted as a node visit.
+#    Batch operations (add_many, offer_many, ...), heaps, KD-trees and paged B-trees (whose keys are packed
+#    into pages) only report the structural counters.
+#    A key that gets stored by the operation is replaced by the plain key before the operation returns.
+# 3. structure.stats() returns a snapshot of the counters, the number of calls of every operation
+#    and gauges like the height. The optional callback is called after every top-level operation
+#    with its name and the counters it changed.
+# 4. uninstrument(structure) restores the original class.
+# 5. Operations of different threads are counted separately, but the counters are shared and not locked,
+#    so with concurrent writers (ConcurrentSkipList) they are approximate.
+
+
+class CountingKey:
+
+    __slots__ = ('key', 'counters', 'countVisits', 'lastCompared')
+
+    def __init__(self, key, counters: dict, countVisits: bool):
+        self.key = key
+        # None once the operation is over, comparisons are not counted anymore
+        self.counters = counters
+        self.countVisits = countVisits
+        self.lastCompared = self
+
+    def __count(self, other):
+        counters = self.counters
+        if counters is not None:
+            counters['comparisons'] += 1
+            if self.countVisits and other is not self.lastCompared:
+                counters['nodeVisits'] += 1
+                self.lastCompared = other
+
+    def __lt__(self, other):
+        self.__count(other)
+        return self.key < other
+
+    def __le__(self, other):
+        self.__count(other)
+        return self.key <= other
+
+    def __gt__(self, other):
+        self.__count(other)
+        return self.key > other
+
+    def __ge__(self, other):
+        self.__count(other)
+        return self.key >= other
+
+    def __eq__(self, other):
+        self.__count(other)
+        return self.key == other
+
+    def __ne__(self, other):
+        self.__count(other)
+        return self.key != other
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+def unwrap(key):
+    if isinstance(key, CountingKey):
+        return key.key
+    if isinstance(key, tuple):
+        return tuple(unwrap(part) for part in key)
+    return key
+
+
+class Instrumentation:
+
+    def __init__(self, counterNames: tuple, callback=None):
+        self.counters = {name: 0 for name in counterNames}
+        self.operations = {}
+        self.callback = callback
+        # depth > 0 while an operation of the thread runs, operations called from it are not counted separately
+        self.calls = threading.local()
+
+
+# Base of the per-structure mixins below.
+# keyOperations maps an operation taking a key as the first argument to whether it stores the key,
+# plainOperations are counted without wrapping their arguments.
+class InstrumentedStructure:
+
+    counterNames = ('comparisons', 'nodeVisits')
+    keyOperations = {}
+    plainOperations = ()
+    # whether the CountingKey counts node visits, structures with a hook per visited node count them there
+    keyCountsVisits = True
+
+    def stats(self) -> dict:
+        snapshot = dict(self.instrumentation.counters)
+        snapshot['operations'] = dict(self.instrumentation.operations)
+        snapshot.update(self.gauges())
+        return snapshot
+
+    def gauges(self) -> dict:
+        return {}
+
+    def initializeInstrumentation(self):
+        pass
+
+    def finishInstrumentation(self):
+        pass
+
+    def unwrapStoredKey(self, key: CountingKey):
+        pass
+
+
+class RedBlackTreeInstrumentation(InstrumentedStructure):
+
+    counterNames = ('comparisons', 'nodeVisits', 'rotations', 'fixupIterations')
+    keyOperations = {'insert': True, 'get': False, 'delete': False, 'rank': False, 'floor': False, 'ceiling': False}
+    plainOperations = ('select', 'min', 'max', 'join', 'split', 'union', 'intersection', 'difference')
+
+    def _RedBlackTree__rotateLeft(self, x):
+        self.instrumentation.counters['rotations'] += 1
+        super()._RedBlackTree__rotateLeft(x)
+
+    def _RedBlackTree__rotateRight(self, y):
+        self.instrumentation.counters['rotations'] += 1
+        super()._RedBlackTree__rotateRight(y)
+
+    # Both fixup loops check the colour of the uncle (insert) or sibling (delete) exactly once per iteration
+    def _RedBlackTree__isRed(self, node):
+        self.instrumentation.counters['fixupIterations'] += 1
+        return super()._RedBlackTree__isRed(node)
+
+    def gauges(self) -> dict:
+        return {'size': len(self)}
+
+
+class BTreeInstrumentation(InstrumentedStructure):
+
+    counterNames = ('comparisons', 'nodeVisits', 'splits')
+    keyOperations = {'insert': True, 'get': False, 'delete': False}
+    keyCountsVisits = False
+
+    def _BTree__splitChild(self, node, childIndex: int):
+        self.instrumentation.counters['splits'] += 1
+        super()._BTree__splitChild(node, childIndex)
+
+    # get, insert and delete recurse once per visited node
+    def _BTree__get(self, key, node):
+        self.instrumentation.counters['nodeVisits'] += 1
+        return super()._BTree__get(key, node)
+
+    def _BTree__insertToNode(self, node, key):
+        self.instrumentation.counters['nodeVisits'] += 1
+        super()._BTree__insertToNode(node, key)
+
+    def _BTree__deleteFromNode(self, node, key):
+        self.instrumentation.counters['nodeVisits'] += 1
+        super()._BTree__deleteFromNode(node, key)
+
+    def gauges(self) -> dict:
+        height = 1
+        node = self.root
+        while not node.isLeaf:
+            node = node.child[0]
+            height += 1
+        return {'height': height}
+
+    # Equal keys may sit on both sides of a separator, so every child that can hold the key is searched
+    def unwrapStoredKey(self, key: CountingKey):
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            for i in range(len(node.keys)):
+                if node.keys[i] is key:
+                    node.keys[i] = key.key
+                    return
+            if not node.isLeaf:
+                stack.extend(node.child[bisect_left(node.keys, key.key): bisect_right(node.keys, key.key) + 1])
+
+
+class SkipListInstrumentation(InstrumentedStructure):
+
+    counterNames = ('comparisons', 'nodeVisits', 'searchPathLength')
+    keyOperations = {'add': True, 'get': False, 'delete': False, 'rank': False}
+    plainOperations = ('add_many', 'delete_many', 'at', 'percentile', 'median')
+
+    def initializeInstrumentation(self):
+        self.instrumentation.levels = [0] * (self.maxLevel + 1)
+        node = self.head.firstLevel()
+        while node is not None:
+            self.instrumentation.levels[len(node.forward) - 1] += 1
+            node = node.firstLevel()
+
+    def _SkipList__tryFind(self, key, forUpdate=None, rankUpdate=None):
+        counters = self.instrumentation.counters
+        visits = counters['nodeVisits']
+        node = super()._SkipList__tryFind(key, forUpdate, rankUpdate)
+        counters['searchPathLength'] += counters['nodeVisits'] - visits
+        return node
+
+    def _SkipList__rearrangeReferencesAfterInsert(self, forUpdate, rankUpdate, node):
+        self.instrumentation.levels[len(node.forward) - 1] += 1
+        super()._SkipList__rearrangeReferencesAfterInsert(forUpdate, rankUpdate, node)
+
+    def _SkipList__rearrangeReferencesAfterDelete(self, forUpdate, item):
+        self.instrumentation.levels[len(item.forward) - 1] -= 1
+        super()._SkipList__rearrangeReferencesAfterDelete(forUpdate, item)
+
+    def gauges(self) -> dict:
+        return {'height': self.level + 1, 'levelDistribution': list(self.instrumentation.levels)}
+
+    # Keys are unique, so the first node not smaller than the key is the one holding it
+    def unwrapStoredKey(self, key: CountingKey):
+        node = SkipList._SkipList__tryFind(self, key.key)
+        if node is not None and node.key is key:
+            node.key = key.key
+
+
+class ConcurrentSkipListInstrumentation(InstrumentedStructure):
+
+    counterNames = ('comparisons', 'nodeVisits', 'searches', 'validationFailures')
+    keyOperations = {'add': True, 'get': False, 'delete': False}
+
+    # add and delete search again after every failed validation
+    def _ConcurrentSkipList__find(self, key, predecessors, successors):
+        self.instrumentation.counters['searches'] += 1
+        return super()._ConcurrentSkipList__find(key, predecessors, successors)
+
+    def _ConcurrentSkipList__lockPredecessors(self, predecessors, successors, topLevel, locked, victim=None):
+        valid = ConcurrentSkipList._ConcurrentSkipList__lockPredecessors(predecessors, successors, topLevel,
+                                                                          locked, victim)
+        if not valid:
+            self.instrumentation.counters['validationFailures'] += 1
+        return valid
+
+    def unwrapStoredKey(self, key: CountingKey):
+        node = ConcurrentSkipList._ConcurrentSkipList__findNode(self, key.key)
+        if node is not None and node.key is key:
+            node.key = key.key
+
+
+class PagedBTreeInstrumentation(InstrumentedStructure):
+
+    counterNames = ('pageReads', 'splits', 'merges')
+    plainOperations = ('insert', 'get', 'delete')
+
+    # every access to a child page goes through __child, whether the page is cached or not
+    def _PagedBTree__child(self, node, index: int):
+        self.instrumentation.counters['pageReads'] += 1
+        return super()._PagedBTree__child(node, index)
+
+    def _PagedBTree__splitChild(self, node, childIndex: int):
+        self.instrumentation.counters['splits'] += 1
+        super()._PagedBTree__splitChild(node, childIndex)
+
+    def _PagedBTree__mergeChildren(self, node, index: int):
+        self.instrumentation.counters['merges'] += 1
+        return super()._PagedBTree__mergeChildren(node, index)
+
+    def gauges(self) -> dict:
+        pager = self._PagedBTree__pager
+        height = 1
+        node = pager.read(pager.root)
+        while not node.isLeaf:
+            node = pager.read(node.child[0])
+            height += 1
+        pager.release()
+        return {'height': height, 'pageCount': pager.pageCount}
+
+
+class KDTreeInstrumentation(InstrumentedStructure):
+
+    counterNames = ('leafScans', 'pointsScanned', 'rebuilds')
+    plainOperations = ('nearest', 'within_radius', 'within_box', 'insert', 'delete', 'query_batch')
+
+    # nearest, within_radius and search_forest scan every leaf they reach here,
+    # query_batch only counts the queries it answers in this process
+    def _KDTree__scanLeaf(self, node: int, start: int, end: int, q):
+        counters = self.instrumentation.counters
+        counters['leafScans'] += 1
+        counters['pointsScanned'] += end - start
+        return super()._KDTree__scanLeaf(node, start, end, q)
+
+    def _KDTree__rebuild(self, node: int, extraPoint=None, extraId=None) -> int:
+        self.instrumentation.counters['rebuilds'] += 1
+        return super()._KDTree__rebuild(node, extraPoint, extraId)
+
+    def gauges(self) -> dict:
+        return {'size': len(self)}
+
+
+class MinMaxHeapInstrumentation(InstrumentedStructure):
+
+    counterNames = ('swaps',)
+    plainOperations = ('add', 'add_many', 'removeAt', 'pop_min', 'pop_max', 'pushpop', 'replace_min', 'replace_max',
+                       'update', 'remove')
+
+    def _MinMaxHeap__swap(self, i, j):
+        self.instrumentation.counters['swaps'] += 1
+        super()._MinMaxHeap__swap(i, j)
+
+    def gauges(self) -> dict:
+        return {'size': len(self)}
+
+
+class BoundedMinMaxHeapInstrumentation(InstrumentedStructure):
+
+    counterNames = ('swaps',)
+    plainOperations = ('offer', 'offer_many')
+
+    # The swaps happen in the private heap, which is instrumented with the same counters for the time being
+    def initializeInstrumentation(self):
+        heap = instrument(self._BoundedMinMaxHeap__heap)
+        heap.instrumentation.counters = self.instrumentation.counters
+
+    def finishInstrumentation(self):
+        uninstrument(self._BoundedMinMaxHeap__heap)
+
+    def gauges(self) -> dict:
+        return {'size': len(self)}
+
+
+FAMILIES = (
+    (RedBlackTree, RedBlackTreeInstrumentation),
+    (BTree, BTreeInstrumentation),
+    (SkipList, SkipListInstrumentation),
+    (MinMaxHeap, MinMaxHeapInstrumentation),
+    (BoundedMinMaxHeap, BoundedMinMaxHeapInstrumentation),
+    (ConcurrentSkipList, ConcurrentSkipListInstrumentation),
+    (PagedBTree, PagedBTreeInstrumentation),
+    (KDTree, KDTreeInstrumentation),
+)
+
+instrumentedClasses = {}
+
+
+def instrument(structure, callback=None):
+    if isinstance(structure, InstrumentedStructure):
+        raise ValueError("Structure is already instrumented")
+
+    instrumentedClass = instrumentedClassOf(type(structure))
+    structure.__class__ = instrumentedClass
+    structure.instrumentation = Instrumentation(instrumentedClass.counterNames, callback)
+    structure.initializeInstrumentation()
+    return structure
+
+
+def uninstrument(structure):
+    if not isinstance(structure, InstrumentedStructure):
+        raise ValueError("Structure is not instrumented")
+
+    structure.finishInstrumentation()
+    structure.__class__ = structure.instrumentedBase
+    del structure.instrumentation
+    return structure
+
+
+def instrumentedClassOf(cls):
+    instrumentedClass = instrumentedClasses.get(cls)
+    if instrumentedClass is not None:
+        return instrumentedClass
+
+    family = next((mixin for base, mixin in FAMILIES if issubclass(cls, base)), None)
+    if family is None:
+        raise ValueError(f"Instrumentation is not supported for {cls.__name__}")
+
+    namespace = {'instrumentedBase': cls}
+    for name, storesKey in family.keyOperations.items():
+        if hasattr(cls, name):
+            namespace[name] = countedOperation(name, getattr(cls, name), True, storesKey)
+    for name in family.plainOperations:
+        if hasattr(cls, name):
+            namespace[name] = countedOperation(name, getattr(cls, name), False, False)
+    if issubclass(cls, RedBlackTree):
+        # nodes are created with the plain key, so the CountingKey of an insert is never stored
+        namespace['nodeType'] = staticmethod(
+            lambda key, *args, nodeType=cls.nodeType, **kwargs: nodeType(unwrap(key), *args, **kwargs))
+
+    instrumentedClass = type('Instrumented' + cls.__name__, (family, cls), namespace)
+    instrumentedClasses[cls] = instrumentedClass
+    return instrumentedClass
+
+
+def countedOperation(name: str, method, wrapsKey: bool, storesKey: bool):
+    def operation(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        calls = instrumentation.calls
+        if getattr(calls, 'depth', 0) > 0:
+            return method(self, *args, **kwargs)
+
+        counters = instrumentation.counters
+        before = dict(counters) if instrumentation.callback is not None else None
+        key = None
+        if wrapsKey and len(args) > 0:
+            key = CountingKey(args[0], counters, self.keyCountsVisits)
+            args = (key,) + args[1:]
+
+        calls.depth = 1
+        try:
+            # some lookups return the key they were given, the caller must get the plain key back
+            return unwrap(method(self, *args, **kwargs))
+        finally:
+            calls.depth = 0
+            if key is not None:
+                key.counters = None
+                if storesKey:
+                    self.unwrapStoredKey(key)
+            instrumentation.operations[name] = instrumentation.operations.get(name, 0) + 1
+            if before is not None:
+                instrumentation.callback(name, {counter: value - before[counter]
+                                                for counter, value in counters.items() if value != before[counter]})
+
+    operation.__name__ = name
+    return operation
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.kd_tree.kdtree import KDTree
+
+
+# Forest of randomized KD-trees over the same points for approximate k-NN search (FLANN-style).
+# 1. Every tree splits on a random one of the `splitCandidates` dimensions with the widest spread,
+#    so a point close to a splitting plane in one tree is usually well inside a cell of another.
+# 2. nearest searches all trees best-bin-first with one shared heap and one budget of leaves,
+#    see KDTree.search_forest. Every tree keeps its own reordered copy of the points.
+# 3. Updates go to every tree, ids stay in step because all trees hand them out in the same order
+#    and a delete removes the same id from each of them.
+
+class KDForest:
+
+    def __init__(self, points, trees: int = 4, leafSize: int = 16, splitCandidates: int = 5, seed=None):
+        if trees < 1:
+            raise ValueError("Forest must contain at least one tree")
+
+        generator = np.random.default_rng(seed)
+        self.trees = [KDTree(points, leafSize, splitCandidates=splitCandidates, seed=generator.integers(2 ** 63))
+                      for _ in range(trees)]
+
+    def __len__(self):
+        return len(self.trees[0])
+
+    def nearest(self, q, k: int = 1, max_leaf_checks: int = None, epsilon: float = 0.0):
+        return KDTree.search_forest(self.trees, q, k, max_leaf_checks, epsilon)
+
+    def insert(self, point) -> int:
+        ids = [tree.insert(point) for tree in self.trees]
+        return ids[0]
+
+    # Equal points may sit in different trees in a different order, so the id is picked once and
+    # exactly that point is deleted from every tree. Nothing is deleted unless every tree holds it.
+    def delete(self, point) -> bool:
+        id = self.trees[0].find(point)
+        if id is None or any(tree.find(point, id) is None for tree in self.trees[1:]):
+            return False
+        for tree in self.trees:
+            tree.delete(point, id)
+        return True
@@ -1,3 +1,664 @@
+import os
+from heapq import heappop, heappush
+from itertools import count
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+# Properties of KD-Tree:
+# 1. Every node covers a contiguous slice of the point arrays; leaves hold at most `leafSize` points.
+# 2. An internal node splits its slice at the median of the dimension with the widest spread.
+#    Points of the left child are <= split value, points of the right child are >= split value.
+# 3. Nodes are not Python objects: they are rows of flat arrays indexed by node id, node 0 is the root.
+# 4. Points are stored reordered so that every leaf is a contiguous block,
+#    `ids` maps a stored row back to the row of the matrix the tree was built from.
+# 5. Building is O(n log n), a query descends towards the query point first
+#    and prunes every subtree whose cell is farther away than the current answer.
+# 6. insert appends to the leaf the point falls into. A leaf without free slots is moved to a new block
+#    of rows with room for `leafSize` points, or split when it holds more than that.
+#    delete only clears the `alive` flag of the point (a tombstone), queries skip such rows.
+#    A leaf holding more tombstones than points moves its alive rows to its front, which frees the rest for inserts.
+# 7. Every node counts the alive points and the tombstones below it. After an update, the highest node
+#    on the path whose bigger child holds more than `alpha` of its points, or which holds more tombstones
+#    than points, is rebuilt from its alive points alone (scapegoat-style), so the depth stays O(log n)
+#    and an update costs amortized O(log^2 n). A subtree left with at most `leafSize // 2` points becomes a leaf again.
+#    Every leaf of a rebuilt subtree gets a block of its own.
+# 8. The blocks of moved leaves and rebuilt subtrees go to a free list by size, new leaves take the smallest
+#    free block with room for their points and at most `leafSize` rows, the point arrays only grow if there is none.
+# 9. nearest with a max_leaf_checks budget or an epsilon runs best-bin-first: pending subtrees wait in a heap
+#    ordered by their distance bound, the search stops after max_leaf_checks leaves or once the closest
+#    pending cell is farther than the current k-th distance divided by (1 + epsilon).
+#    search_forest runs one such search over several trees with one heap and one budget,
+#    with splitCandidates > 1 every tree splits on a random one of the dimensions with the widest spread,
+#    so the trees of a forest cut the space differently (see src/kd_tree/kd_forest.py).
+# 10. query_batch copies the flat arrays of the tree, the queries and the result matrices into shared memory once.
+#     Worker processes attach to them by name in the pool initializer, so neither the tree nor the results
+#     are pickled, only the (start, end) row ranges of the queries each task answers.
+
 
 class KDTree:
-    pass
+
+    def __init__(self, points, leafSize: int = 16, alpha: float = 0.75, splitCandidates: int = 1, seed=None):
+        points = np.array(points, dtype=np.float64, ndmin=2)
+        if points.ndim != 2:
+            raise ValueError("Points must be a two-dimensional matrix")
+        if leafSize < 1:
+            raise ValueError("Leaf size must be positive")
+        if not 0.5 < alpha < 1:
+            raise ValueError("Alpha must be between 0.5 and 1")
+        if splitCandidates < 1:
+            raise ValueError("Number of split candidates must be positive")
+
+        self.leafSize = leafSize
+        self.alpha = alpha
+        self.splitCandidates = min(splitCandidates, max(1, points.shape[1]))
+        self.__generator = np.random.default_rng(seed)
+        self.dimensions = points.shape[1]
+        self.__data = points
+        self.__ids = np.arange(len(points), dtype=np.int64)
+        self.__alive = np.ones(len(points), dtype=bool)
+        # rows of the point arrays handed out to leaves so far, including the free blocks
+        self.__rowCount = len(points)
+        # size of a free block -> start rows of the free blocks of that size
+        self.__freeBlocks = {}
+        self.__nextId = len(points)
+
+        capacity = max(1, 2 * (len(points) // leafSize) + 1)
+        self.__splitDim = np.full(capacity, -1, dtype=np.int64)
+        self.__splitValue = np.zeros(capacity, dtype=np.float64)
+        self.__left = np.full(capacity, -1, dtype=np.int64)
+        self.__right = np.full(capacity, -1, dtype=np.int64)
+        self.__start = np.zeros(capacity, dtype=np.int64)
+        self.__end = np.zeros(capacity, dtype=np.int64)
+        # end of the slots of a leaf, rows in [end, limit) are free for inserts
+        self.__limit = np.zeros(capacity, dtype=np.int64)
+        self.__count = np.zeros(capacity, dtype=np.int64)
+        self.__deleted = np.zeros(capacity, dtype=np.int64)
+        self.__nodeCount = 0
+        self.__freeNodes = []
+
+        self.__build(self.__newNode(0, len(points)), self.__data, self.__ids, 0, len(points))
+
+    def __len__(self):
+        return int(self.__count[0])
+
+    # The arrays are trimmed to the rows and nodes in use, they grow again on the next update
+    def __getstate__(self) -> dict:
+        return {
+            'leafSize': self.leafSize, 'alpha': self.alpha, 'dimensions': self.dimensions,
+            'splitCandidates': self.splitCandidates, 'generator': self.__generator,
+            'rowCount': self.__rowCount, 'nextId': self.__nextId,
+            'freeBlocks': {size: list(starts) for size, starts in self.__freeBlocks.items()},
+            'nodeCount': self.__nodeCount, 'freeNodes': list(self.__freeNodes),
+            'data': self.__data[:self.__rowCount], 'ids': self.__ids[:self.__rowCount],
+            'alive': self.__alive[:self.__rowCount],
+            'splitDim': self.__splitDim[:self.__nodeCount], 'splitValue': self.__splitValue[:self.__nodeCount],
+            'left': self.__left[:self.__nodeCount], 'right': self.__right[:self.__nodeCount],
+            'start': self.__start[:self.__nodeCount], 'end': self.__end[:self.__nodeCount],
+            'limit': self.__limit[:self.__nodeCount], 'count': self.__count[:self.__nodeCount],
+            'deleted': self.__deleted[:self.__nodeCount],
+        }
+
+    def __setstate__(self, state: dict):
+        self.leafSize, self.alpha, self.dimensions = state['leafSize'], state['alpha'], state['dimensions']
+        self.splitCandidates, self.__generator = state['splitCandidates'], state['generator']
+        self.__rowCount, self.__nextId = state['rowCount'], state['nextId']
+        self.__freeBlocks = {size: list(starts) for size, starts in state['freeBlocks'].items()}
+        self.__nodeCount, self.__freeNodes = state['nodeCount'], list(state['freeNodes'])
+        self.__data, self.__ids, self.__alive = state['data'], state['ids'], state['alive']
+        self.__splitDim, self.__splitValue = state['splitDim'], state['splitValue']
+        self.__left, self.__right = state['left'], state['right']
+        self.__start, self.__end, self.__limit = state['start'], state['end'], state['limit']
+        self.__count, self.__deleted = state['count'], state['deleted']
+
+    # Builds the subtree of an existing node over the rows [start, end) of the given arrays,
+    # which are reordered in place. Returns the leaves, their start and end index into those arrays.
+    def __build(self, root: int, data: np.ndarray, ids: np.ndarray, start: int, end: int) -> list:
+        self.__resetNode(root, start, end)
+        stack = [(root, start, end)]
+        leaves = []
+
+        while len(stack) > 0:
+            node, start, end = stack.pop()
+            if end - start <= self.leafSize:
+                leaves.append(node)
+                continue
+
+            block = data[start:end]
+            spread = block.max(axis=0) - block.min(axis=0)
+            dim = int(np.argmax(spread))
+            if spread[dim] == 0:
+                leaves.append(node)
+                continue
+            if self.splitCandidates > 1:
+                candidates = np.argpartition(spread, -self.splitCandidates)[-self.splitCandidates:]
+                candidates = candidates[spread[candidates] > 0]
+                dim = int(self.__generator.choice(candidates))
+
+            middle = (end - start) // 2
+            order = np.argpartition(block[:, dim], middle)
+            data[start:end] = block[order]
+            ids[start:end] = ids[start:end][order]
+
+            self.__splitDim[node] = dim
+            self.__splitValue[node] = data[start + middle, dim]
+            self.__left[node] = self.__newNode(start, start + middle)
+            self.__right[node] = self.__newNode(start + middle, end)
+            stack.append((self.__right[node], start + middle, end))
+            stack.append((self.__left[node], start, start + middle))
+
+        return leaves
+
+    def __newNode(self, start: int, end: int) -> int:
+        if len(self.__freeNodes) > 0:
+            node = self.__freeNodes.pop()
+        else:
+            node = self.__nodeCount
+            if node == len(self.__splitDim):
+                self.__grow()
+            self.__nodeCount += 1
+        self.__resetNode(node, start, end)
+        return node
+
+    def __resetNode(self, node: int, start: int, end: int):
+        self.__splitDim[node] = -1
+        self.__left[node] = -1
+        self.__right[node] = -1
+        self.__start[node] = start
+        self.__end[node] = end
+        self.__limit[node] = end
+        self.__count[node] = end - start
+        self.__deleted[node] = 0
+
+    def __grow(self):
+        capacity = 2 * len(self.__splitDim)
+        self.__splitDim = self.__resized(self.__splitDim, capacity, -1)
+        self.__splitValue = self.__resized(self.__splitValue, capacity, 0)
+        self.__left = self.__resized(self.__left, capacity, -1)
+        self.__right = self.__resized(self.__right, capacity, -1)
+        self.__start = self.__resized(self.__start, capacity, 0)
+        self.__end = self.__resized(self.__end, capacity, 0)
+        self.__limit = self.__resized(self.__limit, capacity, 0)
+        self.__count = self.__resized(self.__count, capacity, 0)
+        self.__deleted = self.__resized(self.__deleted, capacity, 0)
+
+    @staticmethod
+    def __resized(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+        resized = np.full(capacity, fill, dtype=array.dtype)
+        resized[:len(array)] = array
+        return resized
+
+    # Start and size of the smallest free block with room for the rows, a new block at the end if there is none
+    def __allocateRows(self, rows: int):
+        for size in range(rows, max(rows, self.leafSize) + 1):
+            starts = self.__freeBlocks.get(size)
+            if starts:
+                start = starts.pop()
+                if len(starts) == 0:
+                    del self.__freeBlocks[size]
+                return start, size
+
+        size = max(rows, self.leafSize)
+        start = self.__rowCount
+        if start + size > len(self.__data):
+            capacity = max(start + size, 2 * len(self.__data))
+            data = np.empty((capacity, self.dimensions), dtype=np.float64)
+            data[:start] = self.__data[:start]
+            self.__data = data
+            self.__ids = self.__resized(self.__ids, capacity, -1)
+            self.__alive = self.__resized(self.__alive, capacity, False)
+        self.__rowCount = start + size
+        return start, size
+
+    def __freeRows(self, start: int, size: int):
+        if size > 0:
+            self.__freeBlocks.setdefault(size, []).append(start)
+
+    # Alive rows below the node, the nodes of its subtree and the (start, size) blocks of its leaves
+    def __collect(self, node: int):
+        rows, nodes, blocks = [], [], []
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            nodes.append(node)
+            if self.__splitDim[node] >= 0:
+                stack.append(self.__left[node])
+                stack.append(self.__right[node])
+                continue
+            start, end = int(self.__start[node]), int(self.__end[node])
+            rows.append(start + np.flatnonzero(self.__alive[start:end]))
+            blocks.append((start, int(self.__limit[node]) - start))
+        return np.concatenate(rows), nodes, blocks
+
+    # Rebuilds the subtree of the node from its alive points and the extra point, if any,
+    # and moves every new leaf to a block of its own. Returns the number of tombstones dropped.
+    def __rebuild(self, node: int, extraPoint: np.ndarray = None, extraId: int = None) -> int:
+        rows, nodes, blocks = self.__collect(node)
+        points, ids = self.__data[rows], self.__ids[rows]
+        if extraPoint is not None:
+            points = np.vstack((points, extraPoint))
+            ids = np.append(ids, extraId)
+
+        dropped = int(self.__deleted[node])
+        self.__freeNodes.extend(n for n in nodes if n != node)
+        for start, size in blocks:
+            self.__freeRows(start, size)
+
+        for leaf in self.__build(node, points, ids, 0, len(points)):
+            first, last = int(self.__start[leaf]), int(self.__end[leaf])
+            start, size = self.__allocateRows(last - first)
+            end = start + last - first
+            self.__data[start:end] = points[first:last]
+            self.__ids[start:end] = ids[first:last]
+            self.__alive[start:end] = True
+            self.__start[leaf], self.__end[leaf], self.__limit[leaf] = start, end, start + size
+        return dropped
+
+    # Moves the alive rows of a leaf to its front, the rows behind them become free slots again
+    def __purgeLeaf(self, leaf: int, path: list):
+        start, end = int(self.__start[leaf]), int(self.__end[leaf])
+        alive = self.__alive[start:end]
+        keptCount = int(np.count_nonzero(alive))
+        self.__data[start:start + keptCount] = self.__data[start:end][alive]
+        self.__ids[start:start + keptCount] = self.__ids[start:end][alive]
+        self.__alive[start:start + keptCount] = True
+        self.__alive[start + keptCount:end] = False
+        self.__end[leaf] = start + keptCount
+
+        dropped = int(self.__deleted[leaf])
+        for node in path:
+            self.__deleted[node] -= dropped
+
+    # Rebuilds the highest node of the path which is out of balance or mostly tombstones,
+    # or turns it back into a leaf once it holds at most half a leaf of points, so deletes do not leave sparse leaves
+    def __rebalance(self, path: list):
+        splitDim, _, left, right, _, _ = self.__nodeViews()
+        count, deleted = memoryview(self.__count), memoryview(self.__deleted)
+        for i, node in enumerate(path):
+            if splitDim[node] < 0:
+                break
+            size = count[node]
+            if max(count[left[node]], count[right[node]]) > self.alpha * size + self.leafSize \
+                    or deleted[node] > size + self.leafSize or size <= self.leafSize // 2:
+                dropped = self.__rebuild(node)
+                for ancestor in path[:i]:
+                    self.__deleted[ancestor] -= dropped
+                break
+
+    # Returns the id of the point, ids continue after the rows of the matrix the tree was built from
+    def insert(self, point) -> int:
+        point = self.__query(point)
+        id = self.__nextId
+        self.__nextId += 1
+
+        coordinates = point.tolist()
+        splitDim, splitValue, left, right, _, end = self.__nodeViews()
+        count = memoryview(self.__count)
+        path = []
+        node = 0
+        while splitDim[node] >= 0:
+            path.append(node)
+            count[node] += 1
+            if coordinates[splitDim[node]] < splitValue[node]:
+                node = left[node]
+            else:
+                node = right[node]
+
+        row = end[node]
+        if row < self.__limit[node]:
+            self.__data[row] = point
+            self.__ids[row] = id
+            self.__alive[row] = True
+            self.__end[node] = row + 1
+            self.__count[node] += 1
+        else:
+            dropped = self.__rebuild(node, point, id)
+            for ancestor in path:
+                self.__deleted[ancestor] -= dropped
+
+        self.__rebalance(path)
+        return id
+
+    # Path to the leaf and the row of an alive point equal to the given one, with the given id if any
+    def __locate(self, point: np.ndarray, id: int = None):
+        # points equal to a split value may sit on either side of it
+        stack = [(0, [])]
+        while len(stack) > 0:
+            node, path = stack.pop()
+            path = path + [node]
+
+            dim = self.__splitDim[node]
+            if dim >= 0:
+                if point[dim] >= self.__splitValue[node]:
+                    stack.append((int(self.__right[node]), path))
+                if point[dim] <= self.__splitValue[node]:
+                    stack.append((int(self.__left[node]), path))
+                continue
+
+            start, end = int(self.__start[node]), int(self.__end[node])
+            matches = self.__alive[start:end] & np.all(self.__data[start:end] == point, axis=1)
+            if id is not None:
+                matches &= self.__ids[start:end] == id
+            matches = np.flatnonzero(matches)
+            if len(matches) > 0:
+                return path, start + int(matches[0])
+
+        return None
+
+    # Id of a stored point equal to the given one (and having the given id, if any), None if there is none
+    def find(self, point, id: int = None):
+        location = self.__locate(self.__query(point), id)
+        return int(self.__ids[location[1]]) if location is not None else None
+
+    # Removes one stored point equal to the given one, or exactly the point with the given id,
+    # returns whether there was such a point
+    def delete(self, point, id: int = None) -> bool:
+        location = self.__locate(self.__query(point), id)
+        if location is None:
+            return False
+
+        path, row = location
+        leaf = path[-1]
+        self.__alive[row] = False
+        for node in path:
+            self.__count[node] -= 1
+            self.__deleted[node] += 1
+        if self.__deleted[leaf] > self.__count[leaf]:
+            self.__purgeLeaf(leaf, path)
+        self.__rebalance(path)
+        return True
+
+    def __query(self, q) -> np.ndarray:
+        q = np.asarray(q, dtype=np.float64)
+        if q.shape != (self.dimensions,):
+            raise ValueError(f"Query must be a point with {self.dimensions} coordinates")
+        return q
+
+    # Memoryviews index straight into the node arrays and return plain Python numbers,
+    # which keeps the per-node work of a traversal free of NumPy scalar overhead.
+    def __nodeViews(self):
+        return (memoryview(self.__splitDim), memoryview(self.__splitValue),
+                memoryview(self.__left), memoryview(self.__right),
+                memoryview(self.__start), memoryview(self.__end))
+
+    def __scanLeaf(self, node: int, start: int, end: int, q: np.ndarray):
+        diff = self.__data[start:end] - q
+        distances, ids = np.einsum('ij,ij->i', diff, diff), self.__ids[start:end]
+        if self.__deleted[node] > 0:
+            alive = self.__alive[start:end]
+            return distances[alive], ids[alive]
+        return distances, ids
+
+    # Keeps the k closest of the best points so far and the leaf points, returns them and the k-th distance.
+    # With several trees a leaf may hold points found before, a point scanned before and not kept
+    # was farther than the k-th distance then, so only the points among the best can come twice.
+    @staticmethod
+    def __merge(bestDistances: np.ndarray, bestIds: np.ndarray, distances: np.ndarray, ids: np.ndarray,
+                k: int, worst: float, deduplicate: bool = False):
+        closer = distances <= worst
+        if not closer.any():
+            return bestDistances, bestIds, worst
+        if deduplicate:
+            best = set(bestIds.tolist())
+            closer[closer] = [id not in best for id in ids[closer].tolist()]
+        bestDistances = np.concatenate((bestDistances, distances[closer]))
+        bestIds = np.concatenate((bestIds, ids[closer]))
+        if len(bestDistances) > k:
+            kept = np.argpartition(bestDistances, k - 1)[:k]
+            bestDistances, bestIds = bestDistances[kept], bestIds[kept]
+        if len(bestDistances) == k:
+            worst = float(bestDistances.max())
+        return bestDistances, bestIds, worst
+
+    # Exact unless max_leaf_checks or epsilon is given, then the search is best-bin-first, see search_forest
+    def nearest(self, q, k: int = 1, max_leaf_checks: int = None, epsilon: float = 0.0):
+        if max_leaf_checks is not None or epsilon != 0:
+            return KDTree.search_forest([self], q, k, max_leaf_checks, epsilon)
+
+        q = self.__query(q)
+        if k < 1:
+            raise ValueError("k must be positive")
+
+        point = q.tolist()
+        splitDim, splitValue, left, right, start, end = self.__nodeViews()
+        bestDistances = np.empty(0, dtype=np.float64)
+        bestIds = np.empty(0, dtype=np.int64)
+        worst = float("inf")
+
+        # Every entry carries the squared distance from q to the node cell
+        # and the per-dimension offsets that distance was made of.
+        stack = [(0, 0.0, [0.0] * self.dimensions)]
+        while len(stack) > 0:
+            node, bound, offsets = stack.pop()
+            if bound > worst:
+                continue
+
+            dim = splitDim[node]
+            if dim < 0:
+                distances, ids = self.__scanLeaf(node, start[node], end[node], q)
+                bestDistances, bestIds, worst = self.__merge(bestDistances, bestIds, distances, ids, k, worst)
+                continue
+
+            offset = point[dim] - splitValue[node]
+            if offset < 0:
+                near, far = left[node], right[node]
+            else:
+                near, far = right[node], left[node]
+
+            farBound = bound - offsets[dim] * offsets[dim] + offset * offset
+            if farBound <= worst:
+                farOffsets = offsets.copy()
+                farOffsets[dim] = offset
+                stack.append((far, farBound, farOffsets))
+            stack.append((near, bound, offsets))
+
+        order = np.lexsort((bestIds, bestDistances))
+        return np.sqrt(bestDistances[order]), bestIds[order]
+
+    # Best-bin-first k-NN search over trees of the same points, with one heap and one budget of leaves for all of them.
+    # Every returned distance is at most (1 + epsilon) times the true distance of that rank
+    # unless the budget ran out first.
+    @staticmethod
+    def search_forest(trees: list, q, k: int = 1, max_leaf_checks: int = None, epsilon: float = 0.0):
+        if len(trees) == 0:
+            raise ValueError("Forest must contain at least one tree")
+        if any(tree.dimensions != trees[0].dimensions for tree in trees):
+            raise ValueError("Trees of a forest must have the same number of dimensions")
+        q = trees[0].__query(q)
+        if k < 1:
+            raise ValueError("k must be positive")
+        if max_leaf_checks is not None and max_leaf_checks < 1:
+            raise ValueError("max_leaf_checks must be positive")
+        if epsilon < 0:
+            raise ValueError("epsilon must not be negative")
+
+        point = q.tolist()
+        views = [tree.__nodeViews() for tree in trees]
+        scale = (1 + epsilon) * (1 + epsilon)
+        bestDistances = np.empty(0, dtype=np.float64)
+        bestIds = np.empty(0, dtype=np.int64)
+        worst = float("inf")
+        leafChecks = 0
+
+        # the counter breaks ties between equal bounds, so offsets lists are never compared
+        tie = count()
+        pending = [(0.0, next(tie), i, 0, [0.0] * trees[0].dimensions) for i in range(len(trees))]
+        while len(pending) > 0:
+            bound, _, i, node, offsets = heappop(pending)
+            if bound * scale > worst:
+                break
+
+            splitDim, splitValue, left, right, start, end = views[i]
+            dim = splitDim[node]
+            while dim >= 0:
+                offset = point[dim] - splitValue[node]
+                if offset < 0:
+                    near, far = left[node], right[node]
+                else:
+                    near, far = right[node], left[node]
+
+                farBound = bound - offsets[dim] * offsets[dim] + offset * offset
+                if farBound * scale <= worst:
+                    farOffsets = offsets.copy()
+                    farOffsets[dim] = offset
+                    heappush(pending, (farBound, next(tie), i, far, farOffsets))
+                node = near
+                dim = splitDim[node]
+
+            distances, ids = trees[i].__scanLeaf(node, start[node], end[node], q)
+            bestDistances, bestIds, worst = KDTree.__merge(bestDistances, bestIds, distances, ids, k, worst,
+                                                           len(trees) > 1)
+
+            leafChecks += 1
+            if max_leaf_checks is not None and leafChecks >= max_leaf_checks:
+                break
+
+        order = np.lexsort((bestIds, bestDistances))
+        return np.sqrt(bestDistances[order]), bestIds[order]
+
+    def within_radius(self, q, r: float) -> np.ndarray:
+        q = self.__query(q)
+        point = q.tolist()
+        splitDim, splitValue, left, right, start, end = self.__nodeViews()
+        radius = r * r
+        found = []
+
+        stack = [(0, 0.0, [0.0] * self.dimensions)]
+        while len(stack) > 0:
+            node, bound, offsets = stack.pop()
+
+            dim = splitDim[node]
+            if dim < 0:
+                distances, ids = self.__scanLeaf(node, start[node], end[node], q)
+                found.append(ids[distances <= radius])
+                continue
+
+            offset = point[dim] - splitValue[node]
+            if offset < 0:
+                near, far = left[node], right[node]
+            else:
+                near, far = right[node], left[node]
+
+            farBound = bound - offsets[dim] * offsets[dim] + offset * offset
+            if farBound <= radius:
+                farOffsets = offsets.copy()
+                farOffsets[dim] = offset
+                stack.append((far, farBound, farOffsets))
+            stack.append((near, bound, offsets))
+
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def within_box(self, lower, upper) -> np.ndarray:
+        lower = self.__query(lower)
+        upper = self.__query(upper)
+        lowerPoint, upperPoint = lower.tolist(), upper.tolist()
+        splitDim, splitValue, left, right, start, end = self.__nodeViews()
+        found = []
+
+        stack = [0]
+        while len(stack) > 0:
+            node = stack.pop()
+
+            dim = splitDim[node]
+            if dim < 0:
+                block = self.__data[start[node]:end[node]]
+                inside = np.all((block >= lower) & (block <= upper), axis=1)
+                if self.__deleted[node] > 0:
+                    inside &= self.__alive[start[node]:end[node]]
+                found.append(self.__ids[start[node]:end[node]][inside])
+                continue
+
+            split = splitValue[node]
+            if upperPoint[dim] >= split:
+                stack.append(right[node])
+            if lowerPoint[dim] <= split:
+                stack.append(left[node])
+
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    # Returns (distances, ids) matrices with a row per query, sorted by distance.
+    # Rows of a tree with fewer than k points are padded with inf distances and -1 ids.
+    def query_batch(self, points, k: int = 1, workers: int = None):
+        queries = np.array(points, dtype=np.float64, ndmin=2)
+        if queries.ndim != 2 or queries.shape[1] != self.dimensions:
+            raise ValueError(f"Queries must be a matrix of points with {self.dimensions} coordinates")
+        if k < 1:
+            raise ValueError("k must be positive")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Number of workers must be positive")
+
+        if workers == 1 or len(queries) < 2 * workers:
+            distances = np.full((len(queries), k), np.inf)
+            ids = np.full((len(queries), k), -1, dtype=np.int64)
+            nearestRows(self, queries, distances, ids, 0, len(queries), k)
+            return distances, ids
+
+        blocks, shared = [], {}
+        try:
+            state = self.__getstate__()
+            arrays = {name: value for name, value in state.items() if isinstance(value, np.ndarray)}
+            arrays['queries'] = queries
+            arrays['distances'] = np.full((len(queries), k), np.inf)
+            arrays['resultIds'] = np.full((len(queries), k), -1, dtype=np.int64)
+
+            layout = {name: value for name, value in state.items() if name not in arrays}
+            for name, array in arrays.items():
+                block = SharedMemory(create=True, size=max(1, array.nbytes))
+                blocks.append(block)
+                shared[name] = sharedArray(block, array.shape, array.dtype.str)
+                shared[name][...] = array
+                layout[name] = (block.name, array.shape, array.dtype.str)
+
+            # a few tasks per worker even out the queries that prune badly
+            step = -(-len(queries) // (4 * workers))
+            tasks = [(start, min(start + step, len(queries)), k) for start in range(0, len(queries), step)]
+            with Pool(workers, initializer=attachWorker, initargs=(layout,)) as pool:
+                pool.starmap(answerQueries, tasks)
+
+            return shared['distances'].copy(), shared['resultIds'].copy()
+        finally:
+            # the views have to go before their blocks can be closed
+            shared.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+
+def sharedArray(block: SharedMemory, shape: tuple, dtype: str) -> np.ndarray:
+    return np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def nearestRows(tree: KDTree, queries: np.ndarray, distances: np.ndarray, ids: np.ndarray,
+                start: int, end: int, k: int):
+    for row in range(start, end):
+        rowDistances, rowIds = tree.nearest(queries[row], k)
+        distances[row, :len(rowDistances)] = rowDistances
+        ids[row, :len(rowIds)] = rowIds
+
+
+# State of a query_batch worker process: the tree and the shared query and result matrices
+worker = {}
+
+
+def attachWorker(layout: dict):
+    state, blocks = {}, []
+    for name, value in layout.items():
+        if isinstance(value, tuple):
+            block = SharedMemory(name=value[0])
+            blocks.append(block)
+            state[name] = sharedArray(block, *value[1:])
+        else:
+            state[name] = value
+
+    tree = KDTree.__new__(KDTree)
+    tree.__setstate__(state)
+    worker.update(tree=tree, queries=state['queries'], distances=state['distances'], ids=state['resultIds'],
+                  blocks=blocks)
+
+
+def answerQueries(start: int, end: int, k: int):
+    nearestRows(worker['tree'], worker['queries'], worker['distances'], worker['ids'], start, end, k)
@@ -0,0 +1,108 @@
+import json
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+
+# Binary snapshot of the sorted keys of a structure, used by BTree and SkipList dump/load:
+# 1. Header: magic, format version, key encoding, key count and the length of the parameters block.
+# 2. Parameters block: JSON with the structure name and its construction parameters (e.g. the minimum degree).
+# 3. Keys block: its length (8 bytes) followed by the keys, starting at an 8-byte aligned offset.
+#    Fixed-width numeric keys are stored as one column: INT64 or FLOAT64 values back to back.
+#    Any other keys are PICKLE records: a 4-byte length followed by the pickled key.
+#    Pickled keys are only loaded from trusted files, unpickling can run arbitrary code.
+# 4. All numbers are little-endian. Columnar keys are read through mmap and memoryview.cast without copying,
+#    so loading is a single pass over the mapped file feeding a bottom-up build.
+
+MAGIC = b'PYKEYS\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHBxQI')
+BLOCK_LENGTH = struct.Struct('<Q')
+RECORD_LENGTH = struct.Struct('<I')
+
+INT64 = 1
+FLOAT64 = 2
+PICKLE = 3
+
+TYPECODES = {INT64: 'q', FLOAT64: 'd'}
+
+
+def keyEncoding(keys: list) -> int:
+    if all(type(key) is int and -2 ** 63 <= key < 2 ** 63 for key in keys):
+        return INT64
+    if all(type(key) is float for key in keys):
+        return FLOAT64
+    return PICKLE
+
+
+def dumpKeys(path, structure: str, parameters: dict, keys: list):
+    encoding = keyEncoding(keys)
+    parametersBlock = json.dumps(dict(parameters, structure=structure)).encode('utf-8')
+
+    if encoding == PICKLE:
+        records = [pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL) for key in keys]
+        keysBlock = b''.join(RECORD_LENGTH.pack(len(record)) + record for record in records)
+    else:
+        column = array(TYPECODES[encoding], keys)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        keysBlock = column.tobytes()
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, encoding, len(keys), len(parametersBlock)))
+        file.write(parametersBlock)
+        file.write(bytes(padding(HEADER.size + len(parametersBlock))))
+        file.write(BLOCK_LENGTH.pack(len(keysBlock)))
+        file.write(keysBlock)
+
+
+# Yields (parameters, keys) while the file is mapped, keys is a sequence in the dumped order.
+# It must not be used after the `with` block, the mapping is closed then.
+@contextmanager
+def loadKeys(path, structure: str):
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < HEADER.size:
+            raise ValueError("Not a key snapshot file")
+        magic, version, encoding, count, parametersLength = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a key snapshot file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported key snapshot version {version}")
+
+        offset = HEADER.size
+        parameters = json.loads(bytes(data[offset: offset + parametersLength]).decode('utf-8'))
+        if parameters.pop('structure') != structure:
+            raise ValueError(f"Key snapshot was not dumped from a {structure}")
+        offset += parametersLength
+        offset += padding(offset)
+        keysLength = BLOCK_LENGTH.unpack_from(data, offset)[0]
+        offset += BLOCK_LENGTH.size
+        if offset + keysLength > len(data):
+            raise ValueError("Key snapshot is truncated")
+
+        if encoding == PICKLE:
+            yield parameters, unpickleRecords(data, offset, count)
+        elif encoding in TYPECODES and sys.byteorder == 'little':
+            with memoryview(data) as buffer, buffer[offset: offset + keysLength] as block, \
+                    block.cast(TYPECODES[encoding]) as keys:
+                yield parameters, keys
+        elif encoding in TYPECODES:
+            keys = array(TYPECODES[encoding], data[offset: offset + keysLength])
+            keys.byteswap()
+            yield parameters, keys
+        else:
+            raise ValueError(f"Unknown key encoding {encoding}")
+
+
+def unpickleRecords(data, offset: int, count: int):
+    for _ in range(count):
+        length = RECORD_LENGTH.unpack_from(data, offset)[0]
+        offset += RECORD_LENGTH.size
+        yield pickle.loads(data[offset: offset + length])
+        offset += length
+
+
+def padding(offset: int) -> int:
+    return -offset % 8
@@ -0,0 +1,77 @@
+from src.min_max_heap.heap import MinMaxHeap
+
+
+# Min-max heap that retains at most `capacity` elements of a stream:
+# the largest ones (top-K) or the smallest ones (bottom-K).
+# 1. While the heap is not full every offered element is added.
+# 2. Once it is full, an element beyond the retained extreme replaces the opposite extreme,
+#    i.e. the minimum when keeping the largest elements and the maximum when keeping the smallest,
+#    anything else is rejected with a single comparison and no sift.
+# 3. Memory is O(capacity) however long the stream is, offer is O(log capacity).
+# 4. The elements live in a private MinMaxHeap and only enter it through offer and offer_many,
+#    so none of the unbounded operations of MinMaxHeap can grow it past the capacity.
+
+class BoundedMinMaxHeap:
+
+    def __init__(self, capacity: int, keep: str = 'largest'):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        if keep not in ('largest', 'smallest'):
+            raise ValueError("Keep must be either 'largest' or 'smallest'")
+
+        self.__heap = MinMaxHeap()
+        self.capacity = capacity
+        self.keepLargest = keep == 'largest'
+
+    def __len__(self):
+        return len(self.__heap)
+
+    # Elements in heap (array) order, not sorted
+    def __iter__(self):
+        return iter(self.__heap)
+
+    def min(self):
+        return self.__heap.min()
+
+    def max(self):
+        return self.__heap.max()
+
+    # Returns True if the element was retained
+    def offer(self, element) -> bool:
+        if len(self.__heap) < self.capacity:
+            self.__heap.add(element)
+            return True
+
+        if self.keepLargest:
+            if not self.__heap.min() < element:
+                return False
+            self.__heap.replace_min(element)
+        else:
+            if not element < self.__heap.max():
+                return False
+            self.__heap.replace_max(element)
+        return True
+
+    # Returns the number of retained elements.
+    # The bound is cached between evictions so rejected elements cost one comparison each.
+    def offer_many(self, iterable) -> int:
+        retained = 0
+        bound = None
+
+        for element in iterable:
+            if bound is not None:
+                if self.keepLargest and not bound < element:
+                    continue
+                if not self.keepLargest and not element < bound:
+                    continue
+
+            if self.offer(element):
+                retained += 1
+                if len(self.__heap) == self.capacity:
+                    bound = self.__heap.min() if self.keepLargest else self.__heap.max()
+
+        return retained
+
+    # Retained elements in increasing order
+    def snapshot(self) -> list:
+        return sorted(self.__heap)
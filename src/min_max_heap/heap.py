@@ -17,25 +17,170 @@
 #
 # A max-min heap is defined analogously;
 # in such a heap, the maximum value is stored at the root, and the smallest value is stored at one of its children
-import math
-import sys
+from array import array as typedArray
+from typing import Optional
 
 
+# Position of an element in an indexed heap, see MinMaxHeap
+class HeapHandle:
+
+    __slots__ = ('priority', 'item', 'index')
+
+    def __init__(self, priority, item, index: int):
+        self.priority = priority
+        self.item = item
+        # -1 once the element is no longer in the heap
+        self.index = index
+
+
+# All sift loops are iterative. The level of index i is (i + 1).bit_length() - 1,
+# children of i are 2i + 1 and 2i + 2 and its grandchildren are the contiguous indices 4i + 3 .. 4i + 6.
+# Every move of an element goes through __swap.
+#
+# In indexed mode a handle is kept for every element in a list parallel to the array and __swap moves it
+# together with the element, so each handle always knows the current index of its element.
+# add returns the handle, which allows update, remove and contains in O(log n) without searching.
+# add_many returns the handles of its elements, pushpop, replace_min and replace_max return (removed, handle)
+# and handles() returns the handles of all elements, e.g. of those the heap was created with.
+#
+# Storage is a Python list by default. With a typecode ('d' for floats, 'q' for int64, ...) it is an array.array,
+# which keeps 8 bytes per element instead of a pointer plus a boxed number.
+# from_buffer heapifies an existing buffer in place through a memoryview without copying it,
+# the view shrinks by reslicing on removal and is copied into an array.array only when the heap grows.
+# The given list, array or buffer is heapified in place with a single bottom-up (Floyd) pass in O(n).
 class MinMaxHeap:
 
-    def __init__(self, array=None):
+    def __init__(self, array=None, indexed=False, typecode=None):
+        if typecode is not None:
+            array = typedArray(typecode, array if array is not None else ())
         self.__array = array if array is not None else []
-        for i in range(len(self.__array) // 2 + 1, -1, -1):
+        self.__handles = [HeapHandle(x, None, i) for i, x in enumerate(self.__array)] if indexed else None
+        self.__heapify()
+
+    @classmethod
+    def from_buffer(cls, buffer, typecode: str, indexed=False):
+        view = memoryview(buffer)
+        if view.format != typecode:
+            view = view.cast('B').cast(typecode)
+        if view.readonly:
+            raise ValueError("Buffer must be writable")
+        return cls(view, indexed)
+
+    def __heapify(self):
+        for i in range(len(self.__array) // 2 - 1, -1, -1):
             self.__pushDown(i)
-        for i in range(1, len(self.__array)):
-            self.__pushUp(i)
 
+    # A memoryview over a foreign buffer cannot grow, it is copied into an array.array on the first addition
+    def __ensureGrowable(self):
+        if isinstance(self.__array, memoryview):
+            self.__array = typedArray(self.__array.format, self.__array.tobytes())
+
+    # Adds all elements in one batch. A batch at least as large as the heap is heapified together with it in O(n),
+    # a smaller one is sifted up element by element in O(k log n).
+    # Returns the handles of the added elements in indexed mode and None otherwise.
+    def add_many(self, elements) -> Optional[list]:
+        self.__ensureGrowable()
+        start = len(self.__array)
+        self.__array.extend(elements)
+        size = len(self.__array)
+
+        handles = None
+        if self.__handles is not None:
+            handles = [HeapHandle(self.__array[i], None, i) for i in range(start, size)]
+            self.__handles.extend(handles)
+
+        if size - start >= start:
+            self.__heapify()
+        else:
+            for i in range(start, size):
+                self.__pushUp(i)
+        return handles
+
+    def __len__(self):
+        return len(self.__array)
+
+    # Handles of all elements in heap (array) order
+    def handles(self) -> list:
+        self.__checkIndexed()
+        return list(self.__handles)
+
+    # Elements in heap (array) order, not sorted
+    def __iter__(self):
+        return iter(self.__array)
+
+    # Removes and returns the element at the index, the last element takes its place
+    # and is sifted up or down, whichever direction restores the heap.
     def removeAt(self, index: int):
-        if index == len(self.__array) - 1:
-            self.__array.pop()
+        if not 0 <= index < len(self.__array):
+            raise IndexError("Min-max heap index out of range")
+
+        last = len(self.__array) - 1
+        if index != last:
+            self.__swap(index, last)
+        removed = self.__array[last]
+        if isinstance(self.__array, memoryview):
+            self.__array = self.__array[:last]
         else:
-            self.__swap(index, len(self.__array) - 1)
-            self.__pushDown(index)
+            self.__array.pop()
+        if self.__handles is not None:
+            self.__handles.pop().index = -1
+        if index < last:
+            self.__restore(index)
+        return removed
+
+    def pop_min(self):
+        if not self.__array:
+            raise AssertionError("Tried to call pop_min on an empty min-max heap")
+        return self.removeAt(0)
+
+    def pop_max(self):
+        if not self.__array:
+            raise AssertionError("Tried to call pop_max on an empty min-max heap")
+        return self.removeAt(self.__maxIndex())
+
+    # Adds the element and removes the minimum in one sift, like heapq.heappushpop.
+    # In indexed mode returns (removed, handle of the element), the handle is None if the element itself was removed.
+    def pushpop(self, element, item=None):
+        if not self.__array or not self.__array[0] < element:
+            return (element, None) if self.__handles is not None else element
+        return self.__replaceAt(0, element, item)
+
+    # Removes the minimum and adds the element in one sift, like heapq.heapreplace.
+    # In indexed mode returns (removed, handle of the element).
+    def replace_min(self, element, item=None):
+        if not self.__array:
+            raise AssertionError("Tried to call replace_min on an empty min-max heap")
+        return self.__replaceAt(0, element, item)
+
+    def replace_max(self, element, item=None):
+        if not self.__array:
+            raise AssertionError("Tried to call replace_max on an empty min-max heap")
+        return self.__replaceAt(self.__maxIndex(), element, item)
+
+    def __replaceAt(self, index: int, element, item):
+        replaced = self.__array[index]
+        self.__array[index] = element
+        if self.__handles is None:
+            self.__restore(index)
+            return replaced
+
+        self.__handles[index].index = -1
+        handle = HeapHandle(element, item, index)
+        self.__handles[index] = handle
+        self.__restore(index)
+        return replaced, handle
+
+    # The element at the index may violate the heap in either direction.
+    # If it moves up, the ancestor swapped into the index is pushed down,
+    # otherwise the element itself is within the bounds of its ancestors and is pushed down.
+    def __restore(self, index: int):
+        self.__pushUp(index)
+        self.__pushDown(index)
+
+    def __maxIndex(self) -> int:
+        if len(self.__array) < 3:
+            return len(self.__array) - 1
+        return 1 if not self.__array[1] < self.__array[2] else 2
 
     def __pushDown(self, i: int):
         if self.__isOnMinLevel(i):
@@ -44,104 +189,154 @@ class MinMaxHeap:
             self.__pushDownMax(i)
 
     def __pushDownMin(self, i: int):
-        if not self.__hasChildren(i):
-            return
-        smallestChildOrGrandChild = self.__findSmallestChildOrGrandChild(i)
-        if self.__areParentAndChild(i, smallestChildOrGrandChild):
-            if self.__array[smallestChildOrGrandChild] < self.__array[i]:
-                self.__swap(i, smallestChildOrGrandChild)
-        else:
-            if self.__array[smallestChildOrGrandChild] < self.__array[i]:
-                self.__swap(i, smallestChildOrGrandChild)
-                smallestGrandchildParent = self.__parent(smallestChildOrGrandChild)
-                if self.__array[smallestChildOrGrandChild] > self.__array[smallestGrandchildParent]:
-                    self.__swap(smallestChildOrGrandChild, smallestGrandchildParent)
-        self.__pushDown(smallestChildOrGrandChild)
+        array = self.__array
+        size = len(array)
+
+        while True:
+            firstChild = 2 * i + 1
+            if firstChild >= size:
+                return
+
+            smallest = firstChild
+            if firstChild + 1 < size and array[firstChild + 1] < array[smallest]:
+                smallest = firstChild + 1
+            for grandChild in range(2 * firstChild + 1, min(2 * firstChild + 5, size)):
+                if array[grandChild] < array[smallest]:
+                    smallest = grandChild
+
+            if not array[smallest] < array[i]:
+                return
+            self.__swap(i, smallest)
+            if smallest <= firstChild + 1:
+                return
+
+            smallestGrandChildParent = (smallest - 1) >> 1
+            if array[smallestGrandChildParent] < array[smallest]:
+                self.__swap(smallest, smallestGrandChildParent)
+            i = smallest
 
     def __pushDownMax(self, i: int):
-        if not self.__hasChildren(i):
-            return
-        smallestChildOrGrandChild = self.__findSmallestChildOrGrandChild(i)
-        if self.__areParentAndChild(i, smallestChildOrGrandChild):
-            if self.__array[smallestChildOrGrandChild] > self.__array[i]:
-                self.__swap(smallestChildOrGrandChild, i)
-        else:
-            if self.__array[smallestChildOrGrandChild] > self.__array[i]:
-                self.__swap(smallestChildOrGrandChild, i)
-                smallestGrandChildParent = self.__parent(smallestChildOrGrandChild)
-                if self.__array[smallestChildOrGrandChild] < self.__array[smallestGrandChildParent]:
-                    self.__swap(smallestChildOrGrandChild, smallestGrandChildParent)
-        self.__pushDown(smallestChildOrGrandChild)
-
-    def __hasChildren(self, i):
-        return self.__firstChild(i) < len(self.__array)
-
-    def __findSmallestChildOrGrandChild(self, i):
-        return min(self.__firstChild(i),
-                   self.__secondChild(i),
-                   self.__firstChild(self.__firstChild(i)),
-                   self.__secondChild(self.__firstChild(i)),
-                   self.__firstChild(self.__secondChild(i)),
-                   self.__secondChild(self.__secondChild(i)),
-                   key=lambda x: self.__array[x] if x < len(self.__array) else sys.maxsize)
+        array = self.__array
+        size = len(array)
 
-    @staticmethod
-    def __firstChild(i: int) -> int:
-        return 2*i + 1
+        while True:
+            firstChild = 2 * i + 1
+            if firstChild >= size:
+                return
 
-    @staticmethod
-    def __secondChild(i: int):
-        return 2*i + 2
+            largest = firstChild
+            if firstChild + 1 < size and array[largest] < array[firstChild + 1]:
+                largest = firstChild + 1
+            for grandChild in range(2 * firstChild + 1, min(2 * firstChild + 5, size)):
+                if array[largest] < array[grandChild]:
+                    largest = grandChild
 
-    def __areParentAndChild(self, parent, child):
-        return self.__parent(child) == parent
+            if not array[i] < array[largest]:
+                return
+            self.__swap(i, largest)
+            if largest <= firstChild + 1:
+                return
 
-    def add(self, element: int):
+            largestGrandChildParent = (largest - 1) >> 1
+            if array[largest] < array[largestGrandChildParent]:
+                self.__swap(largest, largestGrandChildParent)
+            i = largest
+
+    # Returns the handle of the element in indexed mode and None otherwise
+    def add(self, element: int, item=None) -> Optional[HeapHandle]:
+        self.__ensureGrowable()
         self.__array.append(element)
+        handle = None
+        if self.__handles is not None:
+            handle = HeapHandle(element, item, len(self.__array) - 1)
+            self.__handles.append(handle)
         self.__pushUp(len(self.__array) - 1)
+        return handle
+
+    def contains(self, handle: HeapHandle) -> bool:
+        return self.__handles is not None and 0 <= handle.index < len(self.__handles) \
+            and self.__handles[handle.index] is handle
+
+    # Changes the priority of the element, it may move in either direction
+    def update(self, handle: HeapHandle, priority):
+        self.__checkHandle(handle)
+        self.__array[handle.index] = priority
+        handle.priority = priority
+        self.__restore(handle.index)
+
+    def remove(self, handle: HeapHandle):
+        self.__checkHandle(handle)
+        return self.removeAt(handle.index)
+
+    def min_handle(self) -> HeapHandle:
+        self.__checkIndexed()
+        if not self.__array:
+            raise AssertionError("Tried to call min_handle on an empty min-max heap")
+        return self.__handles[0]
+
+    def max_handle(self) -> HeapHandle:
+        self.__checkIndexed()
+        if not self.__array:
+            raise AssertionError("Tried to call max_handle on an empty min-max heap")
+        return self.__handles[self.__maxIndex()]
+
+    def __checkIndexed(self):
+        if self.__handles is None:
+            raise ValueError("Handles are only available on an indexed min-max heap")
+
+    def __checkHandle(self, handle: HeapHandle):
+        self.__checkIndexed()
+        if not self.contains(handle):
+            raise ValueError("Handle does not belong to an element of this min-max heap")
 
     def __pushUp(self, i):
         if i == 0:
             return
 
-        parent = self.__parent(i)
+        array = self.__array
+        parent = (i - 1) >> 1
         if self.__isOnMinLevel(i):
-            if self.__array[i] > self.__array[parent]:
+            if array[parent] < array[i]:
                 self.__swap(parent, i)
                 self.__pushUpMax(parent)
             else:
                 self.__pushUpMin(i)
         else:
-            if self.__array[i] < self.__array[parent]:
+            if array[i] < array[parent]:
                 self.__swap(parent, i)
                 self.__pushUpMin(parent)
             else:
                 self.__pushUpMax(i)
 
     @staticmethod
-    def __isOnMinLevel(i: int) -> int:
-        if i == 0:
-            return True
-        return int(math.log2(i + 1)) % 2 == 0
+    def __isOnMinLevel(i: int) -> bool:
+        return (i + 1).bit_length() & 1 == 1
 
     def __pushUpMax(self, i: int):
-        grandParent = self.__parent(self.__parent(i))
-        if grandParent >= 0 and self.__array[i] > self.__array[grandParent]:
+        array = self.__array
+        while i > 2:
+            grandParent = (i - 3) >> 2
+            if not array[grandParent] < array[i]:
+                return
             self.__swap(grandParent, i)
-            self.__pushUpMax(grandParent)
+            i = grandParent
 
     def __pushUpMin(self, i: int):
-        grandParent = self.__parent(self.__parent(i))
-        if grandParent >= 0 and self.__array[i] < self.__array[grandParent]:
+        array = self.__array
+        while i > 2:
+            grandParent = (i - 3) >> 2
+            if not array[i] < array[grandParent]:
+                return
             self.__swap(grandParent, i)
-            self.__pushUpMin(grandParent)
-
-    @staticmethod
-    def __parent(i: int) -> int:
-        return (i + 1) // 2 - 1
+            i = grandParent
 
-    def __swap(self, i, smallestChildOrGrandChild):
-        self.__array[smallestChildOrGrandChild], self.__array[i] = self.__array[i], self.__array[smallestChildOrGrandChild]
+    def __swap(self, i, j):
+        self.__array[j], self.__array[i] = self.__array[i], self.__array[j]
+        handles = self.__handles
+        if handles is not None:
+            handles[j], handles[i] = handles[i], handles[j]
+            handles[i].index = i
+            handles[j].index = j
 
     def min(self):
         if not self.__array:
@@ -151,8 +346,4 @@ class MinMaxHeap:
     def max(self):
         if not self.__array:
             raise AssertionError("Tried to call max on an empty min-max heap")
-        if len(self.__array) == 1:
-            return self.__array[0]
-        if len(self.__array) == 2:
-            return self.__array[1]
-        return max(self.__array[1], self.__array[2])
+        return self.__array[self.__maxIndex()]
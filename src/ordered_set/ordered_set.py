@@ -0,0 +1,72 @@
+from src.b_tree.btree import BTree
+from src.red_black_tree.tree import RedBlackTree
+from src.skiplist.skiplist import SkipList
+
+
+# Common ordered-set interface over BTree, SkipList and RedBlackTree:
+# 1. add, discard and `in` have set semantics, a key is stored at most once.
+#    add and discard return whether the set changed.
+# 2. range(lo, hi) yields keys in [lo, hi) in increasing order, a missing bound means the range is open on that side.
+# 3. The adapters only translate method names and enforce uniqueness with a lookup before each change,
+#    so every backend does the same work per operation and can be compared on the same trace.
+
+class OrderedSet:
+
+    def __init__(self, structure, insert):
+        self.structure = structure
+        self.__insert = insert
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key) -> bool:
+        return self.structure.get(key) is not None
+
+    def add(self, key) -> bool:
+        if self.structure.get(key) is not None:
+            return False
+        self.__insert(key)
+        self.size += 1
+        return True
+
+    def discard(self, key) -> bool:
+        if self.structure.get(key) is None:
+            return False
+        self.structure.delete(key)
+        self.size -= 1
+        return True
+
+    def range(self, lo=None, hi=None):
+        return self.structure.range(lo, hi)
+
+    def __iter__(self):
+        return self.range()
+
+
+class BTreeSet(OrderedSet):
+
+    def __init__(self, termMinimumDegree: int = 32):
+        tree = BTree(termMinimumDegree)
+        super().__init__(tree, tree.insert)
+
+
+class SkipListSet(OrderedSet):
+
+    def __init__(self, maxLevel: int = 24, fractionOfLevelReferencingNextLevel: float = 0.5):
+        skipList = SkipList(maxLevel, fractionOfLevelReferencingNextLevel)
+        super().__init__(skipList, skipList.add)
+
+
+class RedBlackTreeSet(OrderedSet):
+
+    def __init__(self):
+        tree = RedBlackTree()
+        super().__init__(tree, tree.insert)
+
+
+BACKENDS = {
+    'btree': BTreeSet,
+    'skiplist': SkipListSet,
+    'red_black_tree': RedBlackTreeSet,
+}
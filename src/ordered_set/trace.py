@@ -0,0 +1,119 @@
+import mmap
+import struct
+
+# Binary log of ordered-set operations:
+# 1. The file starts with a header: magic, format version and the `struct` format of the keys, e.g. 'q' or 'd'.
+# 2. Every record is an op code (1 byte) followed by the op's keys packed with the key format.
+#    ADD, DISCARD and CONTAINS carry one key. RANGE carries a flags byte and two keys,
+#    a bound whose flag is not set is open and its slot holds zero.
+# 3. All numbers are little-endian, records are appended as operations happen
+#    and the file is read back through mmap.
+
+MAGIC = b'PYTRACE\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sH8s')
+
+ADD = 1
+DISCARD = 2
+CONTAINS = 3
+RANGE = 4
+
+OPERATION_NAMES = {ADD: 'add', DISCARD: 'discard', CONTAINS: 'contains', RANGE: 'range'}
+
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TraceWriter:
+
+    def __init__(self, path, keyFormat: str = 'q'):
+        self.keyFormat = keyFormat
+        self.__key = struct.Struct('<B' + keyFormat)
+        self.__range = struct.Struct('<BB' + keyFormat * 2)
+        self.__filler = struct.unpack('<' + keyFormat, bytes(struct.calcsize('<' + keyFormat)))[0]
+        self.__file = open(path, 'wb')
+        self.__file.write(HEADER.pack(MAGIC, VERSION, keyFormat.encode('ascii')))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def write(self, operation: int, key):
+        self.__file.write(self.__key.pack(operation, key))
+
+    def writeRange(self, lo, hi):
+        flags = (LOWER_BOUND if lo is not None else 0) | (UPPER_BOUND if hi is not None else 0)
+        self.__file.write(self.__range.pack(RANGE, flags,
+                                            lo if lo is not None else self.__filler,
+                                            hi if hi is not None else self.__filler))
+
+    def close(self):
+        self.__file.close()
+
+
+# Yields (op code, key) records, for RANGE the key is a (lo, hi) pair with None for an open bound
+def readTrace(path):
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version, keyFormat = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an ordered-set trace file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trace file version {version}")
+
+        keyFormat = keyFormat.rstrip(b'\x00').decode('ascii')
+        key = struct.Struct('<' + keyFormat)
+        bounds = struct.Struct('<B' + keyFormat * 2)
+        offset = HEADER.size
+
+        while offset < len(data):
+            operation = data[offset]
+            offset += 1
+            if operation == RANGE:
+                flags, lo, hi = bounds.unpack_from(data, offset)
+                offset += bounds.size
+                yield operation, (lo if flags & LOWER_BOUND else None, hi if flags & UPPER_BOUND else None)
+            elif operation in OPERATION_NAMES:
+                yield operation, key.unpack_from(data, offset)[0]
+                offset += key.size
+            else:
+                raise ValueError(f"Unknown operation {operation} at offset {offset - 1}")
+
+
+# Wraps an ordered set and logs every operation to the writer before running it
+class RecordingOrderedSet:
+
+    def __init__(self, orderedSet, writer: TraceWriter):
+        self.orderedSet = orderedSet
+        self.writer = writer
+
+    def __len__(self):
+        return len(self.orderedSet)
+
+    def __contains__(self, key) -> bool:
+        self.writer.write(CONTAINS, key)
+        return key in self.orderedSet
+
+    def add(self, key) -> bool:
+        self.writer.write(ADD, key)
+        return self.orderedSet.add(key)
+
+    def discard(self, key) -> bool:
+        self.writer.write(DISCARD, key)
+        return self.orderedSet.discard(key)
+
+    def range(self, lo=None, hi=None):
+        self.writer.writeRange(lo, hi)
+        return self.orderedSet.range(lo, hi)
+
+
+# Runs a single record against an ordered set and returns its result, ranges are materialized
+def apply(orderedSet, operation: int, key):
+    if operation == ADD:
+        return orderedSet.add(key)
+    if operation == DISCARD:
+        return orderedSet.discard(key)
+    if operation == CONTAINS:
+        return key in orderedSet
+    return list(orderedSet.range(key[0], key[1]))
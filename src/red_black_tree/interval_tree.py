@@ -0,0 +1,76 @@
+from typing import Optional
+
+from src.red_black_tree.color import Color
+from src.red_black_tree.node import TreeNode
+from src.red_black_tree.tree import RedBlackTree
+
+
+# Interval tree on top of the red-black tree:
+# 1. Intervals are closed [low, high] and are ordered by the (low, high) pair, which is the node key.
+# 2. Every node also stores maxHigh, the largest high endpoint in its subtree.
+#    It is an augmented field like the subtree size, so refresh() keeps it correct
+#    through insert, delete (including __transplant) and rotations.
+# 3. An overlap query walks the tree in order with an O(height) stack, skips every subtree whose maxHigh
+#    is below the query start and stops at the first interval starting after the query end.
+#    Every visited node either overlaps the query or lies on a boundary path, so it is O(log n + k)
+#    for k reported intervals when they do not nest deeply, and O(min(n, k log n)) in the worst case.
+
+class IntervalNode(TreeNode):
+
+    __slots__ = ('maxHigh',)
+
+    def __init__(self,
+                 key,
+                 color: Color,
+                 parent: Optional['IntervalNode'] = None,
+                 left: Optional['IntervalNode'] = None,
+                 right: Optional['IntervalNode'] = None,
+                 size: int = 1):
+        super().__init__(key, color, parent, left, right, size)
+        self.maxHigh = key[1]
+
+    def refresh(self):
+        super().refresh()
+        maxHigh = self.key[1]
+        if self.left is not None and self.left.maxHigh > maxHigh:
+            maxHigh = self.left.maxHigh
+        if self.right is not None and self.right.maxHigh > maxHigh:
+            maxHigh = self.right.maxHigh
+        self.maxHigh = maxHigh
+
+
+class IntervalTree(RedBlackTree):
+
+    nodeType = IntervalNode
+
+    def insert(self, low, high):
+        if high < low:
+            raise ValueError("Interval end must not be smaller than its start")
+        super().insert((low, high))
+
+    def delete(self, low, high):
+        super().delete((low, high))
+
+    # Yields (low, high) of every interval intersecting [lo, hi] ordered by start
+    def overlapping(self, lo, hi):
+        stack = []
+        self.__pushLeftPath(stack, self.root, lo)
+
+        while len(stack) > 0:
+            node = stack.pop()
+            low, high = node.key
+            if hi < low:
+                return
+            if not high < lo:
+                yield node.key
+            self.__pushLeftPath(stack, node.right, lo)
+
+    # Intervals containing the point
+    def stab(self, point):
+        return self.overlapping(point, point)
+
+    @staticmethod
+    def __pushLeftPath(stack: list, node: Optional[IntervalNode], lo):
+        while node is not None and not node.maxHigh < lo:
+            stack.append(node)
+            node = node.left
@@ -3,19 +3,40 @@ from typing import Optional
 from src.red_black_tree.color import Color
 
 
+# Nodes use __slots__ instead of a per-instance __dict__, and the colour is kept as a single `red` flag.
+# `color` stays available as a Color property for callers, the tree itself only reads and writes `red`.
 class TreeNode:
 
+    __slots__ = ('key', 'red', 'left', 'right', 'parent', 'size')
+
     def __init__(self,
                  key,
                  color: Color,
                  parent: Optional['TreeNode'] = None,
                  left: Optional['TreeNode'] = None,
-                 right: Optional['TreeNode'] = None):
-        self.color = color
+                 right: Optional['TreeNode'] = None,
+                 size: int = 1):
+        self.red = color is Color.RED
         self.key = key
         self.left = left
         self.right = right
         self.parent = parent
+        # number of nodes in the subtree rooted at this node
+        self.size = size
+
+    @property
+    def color(self) -> Color:
+        return Color.RED if self.red else Color.BLACK
+
+    @color.setter
+    def color(self, color: Color):
+        self.red = color is Color.RED
+
+    # Recomputes the augmented fields of this node from its children.
+    # The tree calls it bottom-up on every node whose subtree changed.
+    def refresh(self):
+        self.size = 1 + (self.left.size if self.left is not None else 0) \
+                      + (self.right.size if self.right is not None else 0)
 
     def __str__(self):
-        return f"{self.key} - {self.color}"
\ No newline at end of file
+        return f"{self.key} - {self.color}"
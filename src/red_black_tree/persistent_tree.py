@@ -0,0 +1,222 @@
+from typing import Optional
+
+
+# Persistent red-black tree with the same properties as RedBlackTree, see src/red_black_tree/tree.py.
+# 1. Nodes are never changed once created and have no parent pointers,
+#    insert and delete copy only the O(log n) nodes on the search path and share every other subtree.
+#    Insert rebalances with Okasaki's balance cases, delete follows Kahrs' functional deletion.
+# 2. A version is just a root reference, snapshot() copies that reference in O(1).
+#    A writer publishes a new version by a single assignment of the root, so readers of a snapshot
+#    (or of an iterator, which captures the root when it starts) never block and never see a partial update.
+# 3. A snapshot is itself a persistent tree, writing to it forks a new version and leaves the original untouched.
+
+class PersistentNode:
+
+    __slots__ = ('key', 'red', 'left', 'right', 'size')
+
+    def __init__(self, key, red: bool, left: Optional['PersistentNode'], right: Optional['PersistentNode']):
+        self.key = key
+        self.red = red
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+
+class PersistentRedBlackTree:
+
+    def __init__(self):
+        self.root = None
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def snapshot(self) -> 'PersistentRedBlackTree':
+        version = type(self)()
+        version.root = self.root
+        return version
+
+    def insert(self, key):
+        self.root = self.__blacken(self.__insert(self.root, key))
+
+    def __insert(self, node: Optional[PersistentNode], key) -> PersistentNode:
+        if node is None:
+            return PersistentNode(key, True, None, None)
+
+        if key < node.key:
+            if node.red:
+                return PersistentNode(node.key, True, self.__insert(node.left, key), node.right)
+            return self.__balance(self.__insert(node.left, key), node.key, node.right)
+        if node.red:
+            return PersistentNode(node.key, True, node.left, self.__insert(node.right, key))
+        return self.__balance(node.left, node.key, self.__insert(node.right, key))
+
+    # Deleting a missing key would break the balance of the path, so it is looked up first
+    def delete(self, key):
+        if self.get(key) is None:
+            return
+        self.root = self.__blacken(self.__delete(self.root, key))
+
+    def __delete(self, node: Optional[PersistentNode], key) -> Optional[PersistentNode]:
+        if node is None:
+            return None
+
+        if key < node.key:
+            if node.left is not None and not node.left.red:
+                return self.__balanceLeft(self.__delete(node.left, key), node.key, node.right)
+            return PersistentNode(node.key, True, self.__delete(node.left, key), node.right)
+        if node.key < key:
+            if node.right is not None and not node.right.red:
+                return self.__balanceRight(node.left, node.key, self.__delete(node.right, key))
+            return PersistentNode(node.key, True, node.left, self.__delete(node.right, key))
+        return self.__append(node.left, node.right)
+
+    # Rebuilds a black node whose children may form a red-red violation on one side,
+    # the result is red with two black children or the unchanged black node.
+    def __balance(self, left: Optional[PersistentNode], key, right: Optional[PersistentNode]) -> PersistentNode:
+        if self.__isRed(left) and self.__isRed(right):
+            return PersistentNode(key, True, self.__blacken(left), self.__blacken(right))
+        if self.__isRed(left):
+            if self.__isRed(left.left):
+                return PersistentNode(left.key, True, self.__blacken(left.left),
+                                      PersistentNode(key, False, left.right, right))
+            if self.__isRed(left.right):
+                return PersistentNode(left.right.key, True,
+                                      PersistentNode(left.key, False, left.left, left.right.left),
+                                      PersistentNode(key, False, left.right.right, right))
+        if self.__isRed(right):
+            if self.__isRed(right.right):
+                return PersistentNode(right.key, True, PersistentNode(key, False, left, right.left),
+                                      self.__blacken(right.right))
+            if self.__isRed(right.left):
+                return PersistentNode(right.left.key, True,
+                                      PersistentNode(key, False, left, right.left.left),
+                                      PersistentNode(right.key, False, right.left.right, right.right))
+        return PersistentNode(key, False, left, right)
+
+    # The left subtree lost one black level
+    def __balanceLeft(self, left: Optional[PersistentNode], key, right: PersistentNode) -> PersistentNode:
+        if self.__isRed(left):
+            return PersistentNode(key, True, self.__blacken(left), right)
+        if not right.red:
+            return self.__balance(left, key, self.__redden(right))
+        return PersistentNode(right.left.key, True,
+                              PersistentNode(key, False, left, right.left.left),
+                              self.__balance(right.left.right, right.key, self.__redden(right.right)))
+
+    # The right subtree lost one black level
+    def __balanceRight(self, left: PersistentNode, key, right: Optional[PersistentNode]) -> PersistentNode:
+        if self.__isRed(right):
+            return PersistentNode(key, True, left, self.__blacken(right))
+        if not left.red:
+            return self.__balance(self.__redden(left), key, right)
+        return PersistentNode(left.right.key, True,
+                              self.__balance(self.__redden(left.left), left.key, left.right.left),
+                              PersistentNode(key, False, left.right.right, right))
+
+    # Joins the two subtrees of a deleted node, all keys of the left one are not greater than the right one
+    def __append(self, left: Optional[PersistentNode], right: Optional[PersistentNode]) -> Optional[PersistentNode]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.red and right.red:
+            middle = self.__append(left.right, right.left)
+            if self.__isRed(middle):
+                return PersistentNode(middle.key, True,
+                                      PersistentNode(left.key, True, left.left, middle.left),
+                                      PersistentNode(right.key, True, middle.right, right.right))
+            return PersistentNode(left.key, True, left.left, PersistentNode(right.key, True, middle, right.right))
+        if not left.red and not right.red:
+            middle = self.__append(left.right, right.left)
+            if self.__isRed(middle):
+                return PersistentNode(middle.key, True,
+                                      PersistentNode(left.key, False, left.left, middle.left),
+                                      PersistentNode(right.key, False, middle.right, right.right))
+            return self.__balanceLeft(left.left, left.key, PersistentNode(right.key, False, middle, right.right))
+        if right.red:
+            return PersistentNode(right.key, True, self.__append(left, right.left), right.right)
+        return PersistentNode(left.key, True, left.left, self.__append(left.right, right))
+
+    @staticmethod
+    def __isRed(node: Optional[PersistentNode]) -> bool:
+        return node is not None and node.red
+
+    @staticmethod
+    def __blacken(node: Optional[PersistentNode]) -> Optional[PersistentNode]:
+        if node is None or not node.red:
+            return node
+        return PersistentNode(node.key, False, node.left, node.right)
+
+    @staticmethod
+    def __redden(node: PersistentNode) -> PersistentNode:
+        return PersistentNode(node.key, True, node.left, node.right)
+
+    def get(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node.key
+        return None
+
+    # Key with the given 0-based position in sorted order
+    def select(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Red-black tree index out of range")
+
+        node = self.root
+        while True:
+            leftSize = node.left.size if node.left is not None else 0
+            if index < leftSize:
+                node = node.left
+            elif index == leftSize:
+                return node.key
+            else:
+                index -= leftSize + 1
+                node = node.right
+
+    # Number of keys strictly smaller than the given key
+    def rank(self, key) -> int:
+        rank = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                rank += (node.left.size if node.left is not None else 0) + 1
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def __iter__(self):
+        return self.range()
+
+    # Yields keys in [lo, hi) of the version that was current when the iteration started
+    def range(self, lo=None, hi=None):
+        stack = []
+        node = self.root
+        while node is not None:
+            if lo is not None and node.key < lo:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+
+        while len(stack) > 0:
+            node = stack.pop()
+            if hi is not None and not node.key < hi:
+                return
+            yield node.key
+
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def linearize(self) -> list:
+        return list(self)
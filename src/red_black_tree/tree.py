@@ -13,14 +13,60 @@ from src.red_black_tree.node import TreeNode
 #
 # Definitions:
 # Black height - number of black nodes from node X (not included) to a leaf
+#
+# Every node also stores the size of its subtree (see TreeNode.refresh).
+# Sizes are refreshed along the changed path after insert and delete and on both nodes of every rotation,
+# which gives rank and select queries in O(log n).
+#
+# Bulk operations are built on join(L, k, R), which links two trees around a pivot key in O(|bh(L) - bh(R)| + 1):
+# the taller tree is descended along its inner spine to a black node of the other tree's black height,
+# the pivot is linked there as a red node and the usual insert fixup repairs the rest.
+# split(key) cuts the tree along a search path and joins the pieces back, which is O(log n) in total,
+# union, intersection and difference split one tree by the root of the other and recurse,
+# which is O(m log(n/m + 1)) for trees of sizes m <= n. Set operations expect every key at most once per tree.
 
 class RedBlackTree:
 
+    nodeType = TreeNode
+
     def __init__(self):
         self.root = None
 
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    # Builds a balanced tree from keys in increasing order in O(n).
+    # The middle key becomes the root, so subtree sizes differ by at most one and all empty children
+    # are on the two deepest levels: nodes on the deepest level are red, all others are black.
+    @classmethod
+    def from_sorted(cls, iterable):
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Keys must be sorted in non-decreasing order")
+
+        tree = cls()
+        redDepth = len(keys).bit_length() - 1
+        tree.root = tree.__buildBalanced(keys, 0, len(keys), 0, redDepth if redDepth > 0 else -1)
+        return tree
+
+    def __buildBalanced(self, keys: list, lo: int, hi: int, depth: int, redDepth: int) -> Optional[TreeNode]:
+        if lo >= hi:
+            return None
+
+        middle = (lo + hi) // 2
+        node = self.nodeType(keys[middle], Color.RED if depth == redDepth else Color.BLACK)
+        node.left = self.__buildBalanced(keys, lo, middle, depth + 1, redDepth)
+        node.right = self.__buildBalanced(keys, middle + 1, hi, depth + 1, redDepth)
+        if node.left is not None:
+            node.left.parent = node
+        if node.right is not None:
+            node.right.parent = node
+        node.refresh()
+        return node
+
     def insert(self, key):
-        toInsert = TreeNode(key, Color.RED)
+        toInsert = self.nodeType(key, Color.RED)
 
         lastNodeBeforeInsert = None
         currentNode = self.root
@@ -41,40 +87,50 @@ class RedBlackTree:
         else:
             lastNodeBeforeInsert.right = toInsert
 
+        self.__refreshUpwards(lastNodeBeforeInsert)
         self.__insertFixup(toInsert)
 
-    def __insertFixup(self, node: TreeNode):
-        while node != self.root and node.parent.color == Color.RED:
-            if node.parent.parent.left == node.parent:
+    @staticmethod
+    def __refreshUpwards(node: Optional[TreeNode]):
+        while node is not None:
+            node.refresh()
+            node = node.parent
+
+    def __insertFixup(self, node: TreeNode) -> bool:
+        while node is not self.root and node.parent.red:
+            if node.parent.parent.left is node.parent:
                 uncle = node.parent.parent.right
                 if self.__isRed(uncle):
-                    node.parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
+                    node.parent.red = False
+                    uncle.red = False
+                    node.parent.parent.red = True
                     node = node.parent.parent
                 else:
-                    if node == node.parent.right:
+                    if node is node.parent.right:
                         node = node.parent
                         self.__rotateLeft(node)
-                    node.parent.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
+                    node.parent.red = False
+                    node.parent.parent.red = True
                     self.__rotateRight(node.parent.parent)
             else:
                 uncle = node.parent.parent.left
                 if self.__isRed(uncle):
-                    node.parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
+                    node.parent.red = False
+                    uncle.red = False
+                    node.parent.parent.red = True
                     node = node.parent.parent
                 else:
-                    if node == node.parent.left:
+                    if node is node.parent.left:
                         node = node.parent
                         self.__rotateRight(node)
-                    node.parent.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
+                    node.parent.red = False
+                    node.parent.parent.red = True
                     self.__rotateLeft(node.parent.parent)
 
-        self.root.color = Color.BLACK
+        # a red root means the red violation was pushed all the way up, blackening it adds a black level
+        grew = self.root.red
+        self.root.red = False
+        return grew
 
     def delete(self, key: int):
         node = self.__get(key)
@@ -103,36 +159,40 @@ class RedBlackTree:
             return
 
         replacingNode = node
-        replacingNodeOriginalColor = replacingNode.color
+        replacingNodeWasRed = replacingNode.red
 
         if node.left is None:
             nodeWithPotentialRedBlackTreeViolations = node.right
+            violationParent = node.parent
             self.__transplant(node, node.right)
         elif node.right is None:
             nodeWithPotentialRedBlackTreeViolations = node.left
+            violationParent = node.parent
             self.__transplant(node, node.left)
         else:
             replacingNode = self.__minimum(node.right)
-            replacingNodeOriginalColor = replacingNode.color
+            replacingNodeWasRed = replacingNode.red
             nodeWithPotentialRedBlackTreeViolations = replacingNode.right
-            if replacingNode.parent == node:
-                if nodeWithPotentialRedBlackTreeViolations is not None:
-                    nodeWithPotentialRedBlackTreeViolations.parent = replacingNode
+            if replacingNode.parent is node:
+                violationParent = replacingNode
             else:
+                violationParent = replacingNode.parent
                 self.__transplant(replacingNode, replacingNode.right)
                 replacingNode.right = node.right
                 replacingNode.right.parent = replacingNode
             self.__transplant(node, replacingNode)
             replacingNode.left = node.left
             replacingNode.left.parent = replacingNode
-            replacingNode.color = node.color
-        if replacingNodeOriginalColor == Color.BLACK:
-            self.__deleteFixup(nodeWithPotentialRedBlackTreeViolations)
+            replacingNode.red = node.red
+
+        self.__refreshUpwards(violationParent)
+        if not replacingNodeWasRed:
+            self.__deleteFixup(nodeWithPotentialRedBlackTreeViolations, violationParent)
 
     def __transplant(self, higherNode: TreeNode, lowerNode: TreeNode):
         if higherNode.parent is None:
             self.root = lowerNode
-        elif higherNode == higherNode.parent.left:
+        elif higherNode is higherNode.parent.left:
             higherNode.parent.left = lowerNode
         else:
             higherNode.parent.right = lowerNode
@@ -146,61 +206,64 @@ class RedBlackTree:
             node = node.left
         return node
 
-    def __deleteFixup(self, x: TreeNode):
-        if x is None:
-            return
-
-        while x != self.root and x.color == Color.BLACK:
-            if x == x.parent.left:
-                w = x.parent.right
+    # x may be None (a black leaf), so its parent is tracked separately
+    def __deleteFixup(self, x: Optional[TreeNode], parent: Optional[TreeNode]):
+        while x is not self.root and self.__isBlack(x):
+            if x is parent.left:
+                w = parent.right
                 if self.__isRed(w):
-                    w.color = Color.BLACK
-                    x.parent.color = Color.RED
-                    self.__rotateLeft(x.parent)
-                    w = x.parent.right
+                    w.red = False
+                    parent.red = True
+                    self.__rotateLeft(parent)
+                    w = parent.right
                 if self.__isBlack(w.left) and self.__isBlack(w.right):
-                    w.color = Color.RED
-                    x = x.parent
-                elif self.__isBlack(w.right):
-                    w.left.color = Color.BLACK
-                    w.color = Color.RED
-                    self.__rotateRight(w)
-                    w = x.parent.right
-                w.color = x.parent.color
-                x.parent.color = Color.BLACK
-                w.right.color = Color.BLACK
-                self.__rotateLeft(x.parent)
+                    w.red = True
+                    x = parent
+                    parent = x.parent
+                else:
+                    if self.__isBlack(w.right):
+                        w.left.red = False
+                        w.red = True
+                        self.__rotateRight(w)
+                        w = parent.right
+                    w.red = parent.red
+                    parent.red = False
+                    w.right.red = False
+                    self.__rotateLeft(parent)
+                    x = self.root
             else:
-                w = x.parent.left
+                w = parent.left
                 if self.__isRed(w):
-                    w.color = Color.BLACK
-                    x.parent.color = Color.RED
-                    self.__rotateRight(x.parent)
-                    w = x.parent.left
+                    w.red = False
+                    parent.red = True
+                    self.__rotateRight(parent)
+                    w = parent.left
                 if self.__isBlack(w.left) and self.__isBlack(w.right):
-                    w.color = Color.RED
-                    x = x.parent
-                elif self.__isBlack(w.left):
-                    w.right.color = Color.BLACK
-                    w.color = Color.RED
-                    self.__rotateLeft(w)
-                    w = x.parent.left
-                w.color = x.parent.color
-                x.parent.color = Color.BLACK
-                w.left.color = Color.BLACK
-                self.__rotateRight(x.parent)
-
-            x = self.root
-
-        x.color = Color.BLACK
+                    w.red = True
+                    x = parent
+                    parent = x.parent
+                else:
+                    if self.__isBlack(w.left):
+                        w.right.red = False
+                        w.red = True
+                        self.__rotateLeft(w)
+                        w = parent.left
+                    w.red = parent.red
+                    parent.red = False
+                    w.left.red = False
+                    self.__rotateRight(parent)
+                    x = self.root
+
+        if x is not None:
+            x.red = False
 
     @staticmethod
     def __isRed(node: TreeNode):
-        return node is not None and node.color == Color.RED
+        return node is not None and node.red
 
     @staticmethod
     def __isBlack(node: TreeNode):
-        return node is None or node.color == Color.BLACK
+        return node is None or not node.red
 
     def __rotateLeft(self, x: TreeNode):
         y = x.right
@@ -215,7 +278,7 @@ class RedBlackTree:
         y.parent = x.parent
         if x.parent is None:
             self.root = y
-        elif x == x.parent.left:
+        elif x is x.parent.left:
             x.parent.left = y
         else:
             x.parent.right = y
@@ -223,6 +286,9 @@ class RedBlackTree:
         y.left = x
         x.parent = y
 
+        x.refresh()
+        y.refresh()
+
     def __rotateRight(self, y: TreeNode):
         x = y.left
 
@@ -236,7 +302,7 @@ class RedBlackTree:
         x.parent = y.parent
         if y.parent is None:
             self.root = x
-        elif y == y.parent.left:
+        elif y is y.parent.left:
             y.parent.left = x
         else:
             y.parent.right = x
@@ -244,24 +310,341 @@ class RedBlackTree:
         x.right = y
         y.parent = x
 
+        y.refresh()
+        x.refresh()
+
     def linearize(self) -> list:
-        if self.root is None:
-            return []
+        return list(self)
+
+    def __iter__(self):
+        return self.range()
+
+    def __reversed__(self):
+        return self.range(reverse=True)
 
-        stack = [self.root]
-        linear_view = []
+    # Yields keys in [lo, hi) lazily, a missing bound means the range is open on that side.
+    # The stack holds only the ancestors whose keys are still to be yielded, so it never exceeds the height.
+    def range(self, lo=None, hi=None, reverse=False):
+        if reverse:
+            return self.__reversedRange(lo, hi)
+        return self.__forwardRange(lo, hi)
+
+    def __forwardRange(self, lo, hi):
+        stack = []
+        node = self.root
+        while node is not None:
+            if lo is not None and node.key < lo:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
 
         while len(stack) > 0:
-            element = stack.pop()
-            if isinstance(element, TreeNode):
-                if element.right is not None:
-                    stack.append(element.right)
-                if element.left is not None:
-                    stack.append(element.key)
-                    stack.append(element.left)
-                else:
-                    linear_view.append(element.key)
+            node = stack.pop()
+            if hi is not None and not node.key < hi:
+                return
+            yield node.key
+
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def __reversedRange(self, lo, hi):
+        stack = []
+        node = self.root
+        while node is not None:
+            if hi is not None and not node.key < hi:
+                node = node.left
+            else:
+                stack.append(node)
+                node = node.right
+
+        while len(stack) > 0:
+            node = stack.pop()
+            if lo is not None and node.key < lo:
+                return
+            yield node.key
+
+            node = node.left
+            while node is not None:
+                stack.append(node)
+                node = node.right
+
+    # Largest key that is not greater than the given one or None
+    def floor(self, key):
+        result = None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                result = node.key
+                node = node.right
+        return result
+
+    # Smallest key that is not smaller than the given one or None
+    def ceiling(self, key):
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                node = node.right
             else:
-                linear_view.append(element)
+                result = node.key
+                node = node.left
+        return result
+
+    def min(self):
+        if self.root is None:
+            raise AssertionError("Tried to call min on an empty red-black tree")
+        return self.__minimum(self.root).key
+
+    def max(self):
+        if self.root is None:
+            raise AssertionError("Tried to call max on an empty red-black tree")
+        return self.__maximum(self.root).key
+
+    # Key with the given 0-based position in sorted order
+    def select(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Red-black tree index out of range")
+
+        node = self.root
+        while True:
+            leftSize = self.__size(node.left)
+            if index < leftSize:
+                node = node.left
+            elif index == leftSize:
+                return node.key
+            else:
+                index -= leftSize + 1
+                node = node.right
+
+    # Number of keys strictly smaller than the given key
+    def rank(self, key) -> int:
+        rank = 0
+        node = self.root
+
+        while node is not None:
+            if node.key < key:
+                rank += self.__size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+
+        return rank
 
-        return linear_view
+    # Number of keys in [lo, hi)
+    def count_range(self, lo, hi) -> int:
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    @staticmethod
+    def __size(node: Optional[TreeNode]) -> int:
+        return node.size if node is not None else 0
+
+    # Appends all keys of the other tree, which must not be smaller than any key of this one.
+    # The other tree is left empty.
+    def join(self, other: 'RedBlackTree'):
+        if other is self:
+            raise ValueError("Cannot join a tree with itself")
+        if other.root is None:
+            return
+        if self.root is not None and other.__minimum(other.root).key < self.__maximum(self.root).key:
+            raise ValueError("Keys of the joined tree must not be smaller than the keys of this tree")
+
+        self.root, _ = self.__join2(self.root, self.__blackHeight(self.root),
+                                    other.root, other.__blackHeight(other.root))
+        other.root = None
+
+    # Keeps the keys smaller than the given key and moves the rest to the returned tree
+    def split(self, key) -> 'RedBlackTree':
+        left, _, right, rightHeight, found = self.__split(self.root, self.__blackHeight(self.root), key)
+        if found is not None:
+            right, _ = self.__join(None, 0, found, right, rightHeight)
+
+        self.root = left
+        result = type(self)()
+        result.root = right
+        return result
+
+    # Set operations keep the result in this tree and leave the other tree empty.
+    # With the tree itself as the other tree, union and intersection keep it as it is and difference empties it.
+    def union(self, other: 'RedBlackTree'):
+        if other is self:
+            return
+        self.root, _ = self.__union(self.root, self.__blackHeight(self.root),
+                                    other.root, other.__blackHeight(other.root))
+        other.root = None
+
+    def intersection(self, other: 'RedBlackTree'):
+        if other is self:
+            return
+        self.root, _ = self.__intersection(self.root, self.__blackHeight(self.root),
+                                           other.root, other.__blackHeight(other.root))
+        other.root = None
+
+    def difference(self, other: 'RedBlackTree'):
+        if other is self:
+            self.root = None
+            return
+        self.root, _ = self.__difference(self.root, self.__blackHeight(self.root),
+                                         other.root, other.__blackHeight(other.root))
+        other.root = None
+
+    # Subtrees below are passed around detached (parent is None) with a black root,
+    # together with their black height, the number of black nodes on a path from the root to a leaf.
+
+    @staticmethod
+    def __blackHeight(node: Optional[TreeNode]) -> int:
+        height = 0
+        while node is not None:
+            if not node.red:
+                height += 1
+            node = node.left
+        return height
+
+    @staticmethod
+    def __maximum(node: TreeNode) -> TreeNode:
+        while node.right is not None:
+            node = node.right
+        return node
+
+    # Detaches the children of a node, a red child becomes black and so one level higher.
+    @staticmethod
+    def __expose(node: TreeNode, height: int):
+        childHeight = height - 1
+        left, right = node.left, node.right
+        leftHeight = rightHeight = childHeight
+
+        if left is not None:
+            left.parent = None
+            if left.red:
+                left.red = False
+                leftHeight += 1
+        if right is not None:
+            right.parent = None
+            if right.red:
+                right.red = False
+                rightHeight += 1
+
+        return left, leftHeight, right, rightHeight
+
+    def __join(self, left: Optional[TreeNode], leftHeight: int, pivot: TreeNode,
+               right: Optional[TreeNode], rightHeight: int):
+        if leftHeight == rightHeight:
+            pivot.red = False
+            pivot.parent = None
+            pivot.left, pivot.right = left, right
+            if left is not None:
+                left.parent = pivot
+            if right is not None:
+                right.parent = pivot
+            pivot.refresh()
+            return pivot, leftHeight + 1
+
+        pivot.red = True
+        if leftHeight > rightHeight:
+            parent, node, height = None, left, leftHeight
+            while node is not None and (node.red or height > rightHeight):
+                if not node.red:
+                    height -= 1
+                parent, node = node, node.right
+            pivot.left, pivot.right = node, right
+            parent.right = pivot
+            self.root, rootHeight = left, leftHeight
+        else:
+            parent, node, height = None, right, rightHeight
+            while node is not None and (node.red or height > leftHeight):
+                if not node.red:
+                    height -= 1
+                parent, node = node, node.left
+            pivot.left, pivot.right = left, node
+            parent.left = pivot
+            self.root, rootHeight = right, rightHeight
+
+        pivot.parent = parent
+        if pivot.left is not None:
+            pivot.left.parent = pivot
+        if pivot.right is not None:
+            pivot.right.parent = pivot
+        pivot.refresh()
+        self.__refreshUpwards(parent)
+
+        # self.root is only a working register here, callers store the joined tree where it belongs
+        if self.__insertFixup(pivot):
+            rootHeight += 1
+        return self.root, rootHeight
+
+    # Joins two trees without a pivot by taking the maximum of the left one as the pivot
+    def __join2(self, left: Optional[TreeNode], leftHeight: int, right: Optional[TreeNode], rightHeight: int):
+        if left is None:
+            return right, rightHeight
+        if right is None:
+            return left, leftHeight
+
+        left, leftHeight, pivot = self.__splitLast(left, leftHeight)
+        return self.__join(left, leftHeight, pivot, right, rightHeight)
+
+    def __splitLast(self, node: TreeNode, height: int):
+        left, leftHeight, right, rightHeight = self.__expose(node, height)
+        if right is None:
+            return left, leftHeight, node
+
+        right, rightHeight, last = self.__splitLast(right, rightHeight)
+        joined, joinedHeight = self.__join(left, leftHeight, node, right, rightHeight)
+        return joined, joinedHeight, last
+
+    # Splits into keys smaller and greater than the given key, a node holding the key is returned separately
+    def __split(self, node: Optional[TreeNode], height: int, key):
+        if node is None:
+            return None, 0, None, 0, None
+
+        left, leftHeight, right, rightHeight = self.__expose(node, height)
+        if key == node.key:
+            return left, leftHeight, right, rightHeight, node
+        if key < node.key:
+            lessTree, lessHeight, greaterTree, greaterHeight, found = self.__split(left, leftHeight, key)
+            greaterTree, greaterHeight = self.__join(greaterTree, greaterHeight, node, right, rightHeight)
+        else:
+            lessTree, lessHeight, greaterTree, greaterHeight, found = self.__split(right, rightHeight, key)
+            lessTree, lessHeight = self.__join(left, leftHeight, node, lessTree, lessHeight)
+        return lessTree, lessHeight, greaterTree, greaterHeight, found
+
+    def __union(self, first: Optional[TreeNode], firstHeight: int, second: Optional[TreeNode], secondHeight: int):
+        if first is None:
+            return second, secondHeight
+        if second is None:
+            return first, firstHeight
+
+        left, leftHeight, right, rightHeight = self.__expose(second, secondHeight)
+        lessTree, lessHeight, greaterTree, greaterHeight, _ = self.__split(first, firstHeight, second.key)
+        lessTree, lessHeight = self.__union(lessTree, lessHeight, left, leftHeight)
+        greaterTree, greaterHeight = self.__union(greaterTree, greaterHeight, right, rightHeight)
+        return self.__join(lessTree, lessHeight, second, greaterTree, greaterHeight)
+
+    def __intersection(self, first: Optional[TreeNode], firstHeight: int,
+                       second: Optional[TreeNode], secondHeight: int):
+        if first is None or second is None:
+            return None, 0
+
+        left, leftHeight, right, rightHeight = self.__expose(second, secondHeight)
+        lessTree, lessHeight, greaterTree, greaterHeight, found = self.__split(first, firstHeight, second.key)
+        lessTree, lessHeight = self.__intersection(lessTree, lessHeight, left, leftHeight)
+        greaterTree, greaterHeight = self.__intersection(greaterTree, greaterHeight, right, rightHeight)
+        if found is not None:
+            return self.__join(lessTree, lessHeight, found, greaterTree, greaterHeight)
+        return self.__join2(lessTree, lessHeight, greaterTree, greaterHeight)
+
+    def __difference(self, first: Optional[TreeNode], firstHeight: int,
+                     second: Optional[TreeNode], secondHeight: int):
+        if first is None or second is None:
+            return first, firstHeight
+
+        left, leftHeight, right, rightHeight = self.__expose(second, secondHeight)
+        lessTree, lessHeight, greaterTree, greaterHeight, _ = self.__split(first, firstHeight, second.key)
+        lessTree, lessHeight = self.__difference(lessTree, lessHeight, left, leftHeight)
+        greaterTree, greaterHeight = self.__difference(greaterTree, greaterHeight, right, rightHeight)
+        return self.__join2(lessTree, lessHeight, greaterTree, greaterHeight)
@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+from typing import Optional
+
+from src.skiplist.node import Node
+
+
+# Lazy concurrent skip list (Herlihy, Lev, Luchangco, Shavit), built on the same forward arrays as SkipList.
+# 1. Readers never lock: get, range and linearize just follow forward references.
+#    A node is logically present once it is fully linked and not yet marked as deleted.
+# 2. A writer searches without locks, then locks only the predecessors it is going to relink
+#    and validates that they are still unmarked and still point to the expected successors.
+#    If validation fails the operation retries from the search.
+# 3. Insertion links a node bottom-up and publishes it by setting `fullyLinked`,
+#    deletion first marks the node (logical delete) and then unlinks it top-down (physical delete).
+# Keys are unique, the structure does not keep span widths, so positional queries are not supported.
+
+
+class ConcurrentNode(Node):
+
+    def __init__(self, key, level):
+        super().__init__(key, level)
+        self.lock = threading.Lock()
+        self.marked = False
+        self.fullyLinked = False
+
+
+class ConcurrentSkipList:
+
+    def __init__(self, maxLevel: int, fractionOfLevelReferencingNextLevel: float):
+        self.maxLevel = maxLevel
+        self.fractionOfLevelReferencingNextLevel = fractionOfLevelReferencingNextLevel
+        self.head = ConcurrentNode(-1, self.maxLevel)
+        self.head.fullyLinked = True
+
+    def __randomLevel(self) -> int:
+        lvl = 0
+        while random.random() < self.fractionOfLevelReferencingNextLevel and lvl < self.maxLevel:
+            lvl += 1
+        return lvl
+
+    # Fills predecessors and successors of the key on every level,
+    # returns the highest level on which a node with the key was found or -1.
+    def __find(self, key, predecessors: [ConcurrentNode], successors: [ConcurrentNode]) -> int:
+        foundLevel = -1
+        predecessor = self.head
+
+        for i in range(self.maxLevel, -1, -1):
+            current = predecessor.forward[i]
+            while current is not None and current.key < key:
+                predecessor = current
+                current = predecessor.forward[i]
+            if foundLevel == -1 and current is not None and current.key == key:
+                foundLevel = i
+            predecessors[i] = predecessor
+            successors[i] = current
+
+        return foundLevel
+
+    def add(self, key) -> bool:
+        topLevel = self.__randomLevel()
+        predecessors = [None] * (self.maxLevel + 1)
+        successors = [None] * (self.maxLevel + 1)
+
+        while True:
+            foundLevel = self.__find(key, predecessors, successors)
+            if foundLevel != -1:
+                found = successors[foundLevel]
+                if not found.marked:
+                    while not found.fullyLinked:
+                        time.sleep(0)
+                    return False
+                continue
+
+            locked = []
+            try:
+                if not self.__lockPredecessors(predecessors, successors, topLevel, locked):
+                    continue
+
+                node = ConcurrentNode(key, topLevel)
+                for i in range(topLevel + 1):
+                    node.forward[i] = successors[i]
+                for i in range(topLevel + 1):
+                    predecessors[i].forward[i] = node
+                node.fullyLinked = True
+                return True
+            finally:
+                self.__unlock(locked)
+
+    def delete(self, key) -> bool:
+        predecessors = [None] * (self.maxLevel + 1)
+        successors = [None] * (self.maxLevel + 1)
+        victim = None
+
+        while True:
+            foundLevel = self.__find(key, predecessors, successors)
+
+            if victim is None:
+                if foundLevel == -1:
+                    return False
+                candidate = successors[foundLevel]
+                if not candidate.fullyLinked or candidate.marked or len(candidate.forward) - 1 != foundLevel:
+                    return False
+                with candidate.lock:
+                    if candidate.marked:
+                        return False
+                    candidate.marked = True
+                victim = candidate
+
+            topLevel = len(victim.forward) - 1
+            locked = []
+            try:
+                if not self.__lockPredecessors(predecessors, successors, topLevel, locked, victim):
+                    continue
+
+                for i in range(topLevel, -1, -1):
+                    predecessors[i].forward[i] = victim.forward[i]
+                return True
+            finally:
+                self.__unlock(locked)
+
+    # Locks every distinct predecessor up to `topLevel` (a node can be the predecessor on several levels)
+    # and checks that each of them is alive and still points to the expected node.
+    @staticmethod
+    def __lockPredecessors(predecessors, successors, topLevel: int, locked: list, victim=None) -> bool:
+        for i in range(topLevel + 1):
+            predecessor = predecessors[i]
+            if len(locked) == 0 or locked[-1] is not predecessor:
+                predecessor.lock.acquire()
+                locked.append(predecessor)
+
+            expected = victim if victim is not None else successors[i]
+            if predecessor.marked or predecessor.forward[i] is not expected:
+                return False
+            if victim is None and expected is not None and expected.marked:
+                return False
+        return True
+
+    @staticmethod
+    def __unlock(locked: list):
+        for node in locked:
+            node.lock.release()
+
+    def get(self, key):
+        node = self.__findNode(key)
+        return node.key if node is not None else None
+
+    def __findNode(self, key) -> Optional[ConcurrentNode]:
+        predecessor = self.head
+        for i in range(self.maxLevel, -1, -1):
+            current = predecessor.forward[i]
+            while current is not None and current.key < key:
+                predecessor = current
+                current = predecessor.forward[i]
+            if current is not None and current.key == key:
+                return current if current.fullyLinked and not current.marked else None
+        return None
+
+    # Yields keys in [lo, hi) without locking, keys inserted or deleted during the scan may or may not be seen.
+    def range(self, lo=None, hi=None):
+        node = self.head
+        if lo is not None:
+            for i in range(self.maxLevel, -1, -1):
+                while node.forward[i] is not None and node.forward[i].key < lo:
+                    node = node.forward[i]
+        node = node.forward[0]
+
+        while node is not None and (hi is None or node.key < hi):
+            if node.fullyLinked and not node.marked:
+                yield node.key
+            node = node.forward[0]
+
+    def linearize(self) -> list:
+        return list(self.range())
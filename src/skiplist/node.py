@@ -3,6 +3,8 @@ class Node:
     def __init__(self, key, level):
         self.key = key
         self.forward = [None] * (level + 1)
+        # width[i] is the number of level 0 steps forward[i] jumps over
+        self.width = [1] * (level + 1)
 
     def firstLevel(self):
         return self.forward[0]
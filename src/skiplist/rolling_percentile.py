@@ -0,0 +1,41 @@
+from collections import deque
+
+from src.skiplist.skiplist import SkipList
+
+
+# Percentiles over the last `windowSize` values of a stream.
+# Values are kept in an indexable SkipList, so adding a value, evicting the oldest one
+# and reading any percentile are all O(log windowSize) instead of sorting the window.
+# Each value is stored together with its sequence number, which keeps equal values apart.
+
+
+class RollingPercentile:
+
+    def __init__(self, windowSize: int, maxLevel: int = 16, fractionOfLevelReferencingNextLevel: float = 0.5):
+        if windowSize < 1:
+            raise ValueError("Window size must be positive")
+
+        self.windowSize = windowSize
+        self.__skipList = SkipList(maxLevel, fractionOfLevelReferencingNextLevel)
+        self.__window = deque()
+        self.__sequence = 0
+
+    def __len__(self):
+        return len(self.__window)
+
+    def add(self, value):
+        key = (value, self.__sequence)
+        self.__sequence += 1
+        self.__skipList.add(key)
+        self.__window.append(key)
+
+        if len(self.__window) > self.windowSize:
+            self.__skipList.delete(self.__window.popleft())
+
+    def percentile(self, percent: float):
+        if len(self.__window) == 0:
+            raise AssertionError("Tried to call percentile on an empty rolling window")
+        return self.__skipList.percentile(percent)[0]
+
+    def median(self):
+        return self.percentile(50)
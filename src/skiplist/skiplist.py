@@ -1,9 +1,17 @@
+import math
 import random
 from typing import Optional
 
+from src.key_file.key_file import dumpKeys, loadKeys
 from src.skiplist.node import Node
 
 
+# Every forward link also stores its width: the number of level 0 steps it jumps over.
+# A link to None jumps to a virtual position right after the last node.
+# Summing widths along a search path gives the position of a node, which makes
+# positional access, rank and percentile queries O(log n) like a regular search.
+
+
 class SkipList:
 
     def __init__(self, maxLevel: int, fractionOfLevelReferencingNextLevel: float):
@@ -11,22 +19,110 @@ class SkipList:
         self.fractionOfLevelReferencingNextLevel = fractionOfLevelReferencingNextLevel
         self.head = Node(-1, self.maxLevel)
         self.level = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # Builds the list from keys in ascending order in O(n) without any search:
+    # the last node of every level is kept as its tail, a new node is appended after the tails of its levels
+    # and the widths of those links are the distances between positions. Repeated keys are skipped.
+    # Nodes only link forward, so a caller building a very large list may pause the cyclic garbage collector
+    # around the call; the list does not do it itself since gc.disable() affects the whole process.
+    @classmethod
+    def from_sorted(cls, iterable, maxLevel: int, fractionOfLevelReferencingNextLevel: float):
+        skipList = cls(maxLevel, fractionOfLevelReferencingNextLevel)
+        tails = [skipList.head] * (maxLevel + 1)
+        tailPositions = [0] * (maxLevel + 1)
+        position = 0
+        previous = None
+
+        for key in iterable:
+            if position > 0:
+                if key < previous:
+                    raise ValueError("Keys must be sorted in ascending order")
+                if key == previous:
+                    continue
+            previous = key
+            position += 1
+
+            level = skipList.__randomLevel()
+            node = Node(key, level)
+            for i in range(level + 1):
+                tails[i].forward[i] = node
+                tails[i].width[i] = position - tailPositions[i]
+                tails[i] = node
+                tailPositions[i] = position
+            if level > skipList.level:
+                skipList.level = level
+
+        skipList.size = position
+        for i in range(skipList.level + 1):
+            tails[i].width[i] = position + 1 - tailPositions[i]
+        return skipList
+
+    # Writes the keys in order to a binary snapshot, see src/key_file/key_file.py
+    def dump(self, path):
+        dumpKeys(path, 'SkipList', {'maxLevel': self.maxLevel,
+                                    'fraction': self.fractionOfLevelReferencingNextLevel}, self.linearize())
+
+    # Rebuilds the towers from the memory-mapped snapshot with from_sorted, the levels are drawn anew
+    @classmethod
+    def load(cls, path):
+        with loadKeys(path, 'SkipList') as (parameters, keys):
+            return cls.from_sorted(keys, parameters['maxLevel'], parameters['fraction'])
 
     def add(self, key):
         forUpdate = [None] * (self.maxLevel + 1)
-        item = self.__tryFind(key, forUpdate)
+        rankUpdate = [0] * (self.maxLevel + 1)
+        self.__tryFind(key, forUpdate, rankUpdate)
+        self.__insertAfter(key, forUpdate, rankUpdate)
 
-        if item is None or item.key != key:
-            randomLevel = self.__chooseLevel(forUpdate)
-            node = Node(key, randomLevel)
-            self.__rearrangeReferencesAfterInsert(forUpdate, node)
+    # Adds keys given in ascending order. The update vector of the previous key is kept as a finger:
+    # the next search climbs from it only as high as the predecessors actually change and descends from there,
+    # so a batch of close keys costs much less than searching each of them from the head.
+    def add_many(self, sortedKeys):
+        forUpdate = [self.head] * (self.maxLevel + 1)
+        rankUpdate = [0] * (self.maxLevel + 1)
+        previous = None
+        isFirst = True
+
+        for key in sortedKeys:
+            if not isFirst:
+                # the finger may be the node of the previous key, which the search never compares with
+                if key == previous:
+                    continue
+                if key < previous:
+                    self.__resetFinger(forUpdate, rankUpdate)
+            previous = key
+            isFirst = False
 
-    def __chooseLevel(self, forUpdate):
+            self.__fingerFind(key, forUpdate, rankUpdate)
+            node = self.__insertAfter(key, forUpdate, rankUpdate)
+            if node is not None:
+                position = rankUpdate[0] + 1
+                for i in range(len(node.forward)):
+                    forUpdate[i] = node
+                    rankUpdate[i] = position
+
+    def __insertAfter(self, key, forUpdate: [Node], rankUpdate: [int]) -> Optional[Node]:
+        item = forUpdate[0].firstLevel()
+        if item is not None and item.key == key:
+            return None
+
+        randomLevel = self.__chooseLevel(forUpdate, rankUpdate)
+        node = Node(key, randomLevel)
+        self.__rearrangeReferencesAfterInsert(forUpdate, rankUpdate, node)
+        return node
+
+    def __chooseLevel(self, forUpdate, rankUpdate):
         randomLevel = self.__randomLevel()
 
         if randomLevel > self.level:
             for i in range(self.level + 1, randomLevel + 1):
                 forUpdate[i] = self.head
+                rankUpdate[i] = 0
+                self.head.width[i] = self.size + 1
             self.level = randomLevel
 
         return randomLevel
@@ -37,11 +133,16 @@ class SkipList:
             lvl += 1
         return lvl
 
-    @staticmethod
-    def __rearrangeReferencesAfterInsert(forUpdate: [Node], node: Node):
+    def __rearrangeReferencesAfterInsert(self, forUpdate: [Node], rankUpdate: [int], node: Node):
+        position = rankUpdate[0] + 1
         for i in range(len(node.forward)):
             node.forward[i] = forUpdate[i].forward[i]
             forUpdate[i].forward[i] = node
+            node.width[i] = rankUpdate[i] + forUpdate[i].width[i] - rankUpdate[0]
+            forUpdate[i].width[i] = position - rankUpdate[i]
+        for i in range(len(node.forward), self.level + 1):
+            forUpdate[i].width[i] += 1
+        self.size += 1
 
     def get(self, key):
         item = self.__tryFind(key)
@@ -50,30 +151,83 @@ class SkipList:
 
     def delete(self, key):
         forUpdate = [None] * (self.maxLevel + 1)
-        item = self.__tryFind(key, forUpdate)
+        self.__tryFind(key, forUpdate)
+        self.__deleteAfter(key, forUpdate)
+
+    # Deletes keys given in ascending order, searching from a finger like add_many.
+    def delete_many(self, sortedKeys):
+        forUpdate = [self.head] * (self.maxLevel + 1)
+        rankUpdate = [0] * (self.maxLevel + 1)
+        previous = None
+        isFirst = True
+
+        for key in sortedKeys:
+            if not isFirst:
+                # the finger may be the node of the previous key, which the search never compares with
+                if key == previous:
+                    continue
+                if key < previous:
+                    self.__resetFinger(forUpdate, rankUpdate)
+            previous = key
+            isFirst = False
+
+            self.__fingerFind(key, forUpdate, rankUpdate)
+            self.__deleteAfter(key, forUpdate)
 
+    def __deleteAfter(self, key, forUpdate: [Node]):
+        item = forUpdate[0].firstLevel()
         if item is None or item.key != key:
             return
 
         self.__rearrangeReferencesAfterDelete(forUpdate, item)
         self.__fixLevel()
 
-    def __tryFind(self, key, forUpdate=None) -> Optional[Node]:
+    def __resetFinger(self, forUpdate: [Node], rankUpdate: [int]):
+        for i in range(len(forUpdate)):
+            forUpdate[i] = self.head
+            rankUpdate[i] = 0
+
+    def __fingerFind(self, key, forUpdate: [Node], rankUpdate: [int]):
+        top = -1
+        while top < self.level and forUpdate[top + 1].forward[top + 1] \
+                and forUpdate[top + 1].forward[top + 1].key < key:
+            top += 1
+
+        if top < 0:
+            return
+
+        current = forUpdate[top]
+        rank = rankUpdate[top]
+        for i in range(top, -1, -1):
+            while current.forward[i] and current.forward[i].key < key:
+                rank += current.width[i]
+                current = current.forward[i]
+            forUpdate[i] = current
+            rankUpdate[i] = rank
+
+    def __tryFind(self, key, forUpdate=None, rankUpdate=None) -> Optional[Node]:
         current = self.head
+        rank = 0
 
         for i in range(self.level, -1, -1):
             while current.forward[i] and current.forward[i].key < key:
+                rank += current.width[i]
                 current = current.forward[i]
             if forUpdate:
                 forUpdate[i] = current
+            if rankUpdate:
+                rankUpdate[i] = rank
 
         return current.firstLevel()
 
     def __rearrangeReferencesAfterDelete(self, forUpdate: [Node], item: Node):
         for i in range(self.level + 1):
-            if forUpdate[i].forward[i] != item:
-                break
-            forUpdate[i].forward[i] = item.forward[i]
+            if forUpdate[i].forward[i] == item:
+                forUpdate[i].width[i] += item.width[i] - 1
+                forUpdate[i].forward[i] = item.forward[i]
+            else:
+                forUpdate[i].width[i] -= 1
+        self.size -= 1
 
     def __fixLevel(self):
         while self.level > 0 and self.head.forward[self.level] is None:
@@ -86,3 +240,53 @@ class SkipList:
             result.append(node.key)
             node = node.forward[0]
         return result
+
+    # Yields keys in [lo, hi) walking level 0, a missing bound means the range is open on that side.
+    def range(self, lo=None, hi=None):
+        node = self.__tryFind(lo) if lo is not None else self.head.firstLevel()
+        while node is not None and (hi is None or node.key < hi):
+            yield node.key
+            node = node.forward[0]
+
+    def at(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Skip list index out of range")
+
+        current = self.head
+        position = 0
+        for i in range(self.level, -1, -1):
+            while current.forward[i] and position + current.width[i] <= index + 1:
+                position += current.width[i]
+                current = current.forward[i]
+
+        return current.key
+
+    # Number of keys strictly smaller than the given key
+    def rank(self, key) -> int:
+        current = self.head
+        rank = 0
+
+        for i in range(self.level, -1, -1):
+            while current.forward[i] and current.forward[i].key < key:
+                rank += current.width[i]
+                current = current.forward[i]
+
+        return rank
+
+    # Number of keys in [lo, hi)
+    def count_between(self, lo, hi) -> int:
+        return max(0, self.rank(hi) - self.rank(lo))
+
+    # Nearest-rank percentile: the smallest key that at least `percent` percent of the keys are less than or equal to
+    def percentile(self, percent: float):
+        if self.size == 0:
+            raise AssertionError("Tried to call percentile on an empty skip list")
+        if not 0 <= percent <= 100:
+            raise ValueError("Percent must be in [0, 100]")
+
+        return self.at(max(0, math.ceil(percent / 100 * self.size) - 1))
+
+    def median(self):
+        return self.percentile(50)
@@ -1,7 +1,10 @@
+import os
 import random
+import tempfile
 import unittest
 
 from src.b_tree.btree import BTree
+from src.skiplist.skiplist import SkipList
 
 
 class BTreeTest(unittest.TestCase):
@@ -25,3 +28,155 @@ class BTreeTest(unittest.TestCase):
         self.assertEqual(999, tree.get(999))
 
         self.assertIsNone(tree.get(1259))
+
+    def test_delete(self):
+        array = [x for x in range(1000)]
+        sortedArray = array.copy()
+        random.shuffle(array)
+        start = random.randint(0, 999)
+        forDeletionArray = array[start: random.randint(start, 1000)]
+
+        tree = BTree(3)
+        for x in array:
+            tree.insert(x)
+
+        for x in forDeletionArray:
+            tree.delete(x)
+            sortedArray.remove(x)
+
+        self.assertListEqual(sortedArray, list(tree))
+        self.__assertInvariants(tree, tree.root, isRoot=True)
+        for x in forDeletionArray:
+            self.assertIsNone(tree.get(x))
+
+    def test_delete_all_shouldShrinkTree(self):
+        array = [x for x in range(1000)]
+        random.shuffle(array)
+
+        tree = BTree(2)
+        for x in array:
+            tree.insert(x)
+        for x in array:
+            tree.delete(x)
+
+        self.assertTrue(tree.root.isLeaf)
+        self.assertListEqual([], list(tree))
+
+    def test_delete_whenNotExist_shouldDoNothing(self):
+        tree = BTree.from_sorted(range(100), 3)
+
+        tree.delete(500)
+
+        self.assertListEqual([x for x in range(100)], list(tree))
+
+    def test_iter(self):
+        array = [x for x in range(1000)]
+        random.shuffle(array)
+
+        tree = BTree(3)
+        for x in array:
+            tree.insert(x)
+
+        self.assertListEqual([x for x in range(1000)], list(tree))
+        self.__assertInvariants(tree, tree.root, isRoot=True)
+
+    def test_range(self):
+        array = [x for x in range(0, 1000, 2)]
+        random.shuffle(array)
+
+        tree = BTree(2)
+        for x in array:
+            tree.insert(x)
+
+        self.assertListEqual([x for x in range(100, 200, 2)], list(tree.range(100, 200)))
+        self.assertListEqual([x for x in range(102, 200, 2)], list(tree.range(101, 199)))
+        self.assertListEqual([x for x in range(0, 10, 2)], list(tree.range(hi=10)))
+        self.assertListEqual([x for x in range(990, 1000, 2)], list(tree.range(989)))
+        self.assertListEqual([], list(tree.range(500, 500)))
+        self.assertListEqual([], list(tree.range(2000)))
+
+    def test_range_reverse(self):
+        array = [x for x in range(0, 1000, 2)]
+        random.shuffle(array)
+
+        tree = BTree(2)
+        for x in array:
+            tree.insert(x)
+
+        self.assertListEqual([x for x in range(198, 99, -2)], list(tree.range(100, 200, reverse=True)))
+        self.assertListEqual([x for x in range(198, 101, -2)], list(tree.range(101, 199, reverse=True)))
+        self.assertListEqual([x for x in range(998, -1, -2)], list(tree.range(reverse=True)))
+        self.assertListEqual([], list(tree.range(hi=0, reverse=True)))
+
+    def test_range_isLazy(self):
+        tree = BTree.from_sorted(range(100000), 8)
+
+        scan = tree.range(50000)
+
+        self.assertEqual(50000, next(scan))
+        self.assertEqual(50001, next(scan))
+
+    def test_from_sorted(self):
+        for size in [0, 1, 6, 7, 8, 100, 1000]:
+            for fillFactor in [0.5, 0.75, 1.0]:
+                tree = BTree.from_sorted(iter(range(size)), 4, fill_factor=fillFactor)
+
+                self.assertListEqual([x for x in range(size)], self.__collectKeys(tree.root))
+                self.__assertInvariants(tree, tree.root, isRoot=True)
+                for x in range(size):
+                    self.assertEqual(x, tree.get(x))
+
+    def test_from_sorted_thenInsert(self):
+        tree = BTree.from_sorted(range(0, 1000, 2), 3, fill_factor=0.5)
+
+        for x in range(1, 1000, 2):
+            tree.insert(x)
+
+        self.assertEqual(501, tree.get(501))
+        self.assertEqual(998, tree.get(998))
+        self.assertIsNone(tree.get(1000))
+
+    def test_dumpAndLoad(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'keys.snapshot')
+            for keys in ([x for x in range(-2000, 2000, 3)], [(x, str(x)) for x in range(500)]):
+                tree = BTree(4)
+                for key in random.sample(keys, len(keys)):
+                    tree.insert(key)
+
+                tree.dump(path)
+                loaded = BTree.load(path)
+
+                self.assertEqual(4, loaded.termMinimumDegree)
+                self.assertListEqual(sorted(keys), list(loaded))
+                self.assertEqual(keys[7], loaded.get(keys[7]))
+
+            with self.assertRaises(ValueError):
+                SkipList.load(path)
+
+    def test_from_sorted_whenNotSorted_shouldRaise(self):
+        with self.assertRaises(ValueError):
+            BTree.from_sorted([1, 3, 2], 3)
+
+    def __collectKeys(self, node):
+        if node.isLeaf:
+            return list(node.keys)
+        keys = []
+        for i, child in enumerate(node.child):
+            keys.extend(self.__collectKeys(child))
+            if i < len(node.keys):
+                keys.append(node.keys[i])
+        return keys
+
+    def __assertInvariants(self, tree, node, isRoot=False) -> int:
+        t = tree.termMinimumDegree
+        self.assertLessEqual(len(node.keys), 2 * t - 1)
+        if not isRoot:
+            self.assertGreaterEqual(len(node.keys), t - 1)
+        if node.isLeaf:
+            self.assertListEqual([], node.child)
+            return 0
+        self.assertEqual(len(node.keys) + 1, len(node.child))
+        depths = {self.__assertInvariants(tree, child) for child in node.child}
+        self.assertEqual(1, len(depths))
+        return depths.pop() + 1
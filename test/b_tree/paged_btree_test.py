@@ -0,0 +1,100 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.b_tree.paged_btree import PagedBTree
+
+
+class PagedBTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'index.btree')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get(self):
+        array = [x for x in range(5000)]
+        random.shuffle(array)
+
+        with PagedBTree(self.path, pageSize=256, cacheSize=8) as tree:
+            for x in array:
+                tree.insert(x)
+
+            self.assertEqual(1, tree.get(1))
+            self.assertEqual(369, tree.get(369))
+            self.assertEqual(4999, tree.get(4999))
+            self.assertIsNone(tree.get(5000))
+            self.assertListEqual([x for x in range(5000)], list(tree))
+
+    def test_reopen(self):
+        array = [x for x in range(5000)]
+        random.shuffle(array)
+
+        with PagedBTree(self.path, pageSize=256, cacheSize=8) as tree:
+            for x in array:
+                tree.insert(x)
+
+        with PagedBTree(self.path, cacheSize=8) as tree:
+            self.assertEqual(8, tree.termMinimumDegree)
+            self.assertEqual(2500, tree.get(2500))
+            self.assertListEqual([x for x in range(100, 200)], list(tree.range(100, 200)))
+
+    def test_delete(self):
+        array = [x for x in range(3000)]
+        sortedArray = array.copy()
+        random.shuffle(array)
+        forDeletionArray = array[:2000]
+
+        with PagedBTree(self.path, pageSize=256, cacheSize=4) as tree:
+            for x in array:
+                tree.insert(x)
+            for x in forDeletionArray:
+                tree.delete(x)
+                sortedArray.remove(x)
+
+        with PagedBTree(self.path) as tree:
+            self.assertListEqual(sortedArray, list(tree))
+            for x in forDeletionArray[:100]:
+                self.assertIsNone(tree.get(x))
+
+    def test_delete_shouldReuseFreedPages(self):
+        with PagedBTree(self.path, pageSize=256, cacheSize=4) as tree:
+            for x in range(3000):
+                tree.insert(x)
+            for x in range(3000):
+                tree.delete(x)
+            size = os.path.getsize(self.path)
+            for x in range(3000):
+                tree.insert(x)
+
+        self.assertEqual(size, os.path.getsize(self.path))
+
+    def test_floatKeys(self):
+        with PagedBTree(self.path, keyFormat='d', termMinimumDegree=3) as tree:
+            for x in [2.5, -1.0, 3.25, 0.5]:
+                tree.insert(x)
+
+            self.assertListEqual([-1.0, 0.5, 2.5, 3.25], list(tree))
+
+    def test_reopen_withDifferentPageSize_shouldRaise(self):
+        PagedBTree(self.path, pageSize=512).close()
+
+        with self.assertRaises(ValueError):
+            PagedBTree(self.path, pageSize=1024)
+
+    def test_insert_whenKeyDoesNotFitFormat_shouldRaiseAndKeepFile(self):
+        with PagedBTree(self.path, pageSize=256, cacheSize=4) as tree:
+            for x in range(200):
+                tree.insert(x)
+            with self.assertRaises(ValueError):
+                tree.insert(1.5)
+            with self.assertRaises(ValueError):
+                tree.insert(2 ** 64)
+            for x in range(200, 400):
+                tree.insert(x)
+
+        with PagedBTree(self.path, cacheSize=4) as tree:
+            self.assertListEqual([x for x in range(400)], list(tree))
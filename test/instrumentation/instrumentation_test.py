@@ -0,0 +1,180 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from src.b_tree.btree import BTree
+from src.b_tree.paged_btree import PagedBTree
+from src.instrumentation.instrumentation import CountingKey, instrument, uninstrument
+from src.kd_tree.kdtree import KDTree
+from src.min_max_heap.bounded_heap import BoundedMinMaxHeap
+from src.min_max_heap.heap import MinMaxHeap
+from src.red_black_tree.interval_tree import IntervalTree
+from src.red_black_tree.tree import RedBlackTree
+from src.skiplist.concurrent_skiplist import ConcurrentSkipList
+from src.skiplist.skiplist import SkipList
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_redBlackTree(self):
+        events = []
+        tree = instrument(RedBlackTree(), lambda operation, delta: events.append((operation, delta)))
+        for x in range(1000):
+            tree.insert(x)
+        for x in range(0, 1000, 2):
+            tree.delete(x)
+        self.assertEqual(501, tree.get(501))
+
+        stats = tree.stats()
+        self.assertEqual({'insert': 1000, 'delete': 500, 'get': 1}, stats['operations'])
+        self.assertGreater(stats['rotations'], 900)
+        self.assertGreater(stats['fixupIterations'], 0)
+        self.assertGreaterEqual(stats['comparisons'], stats['nodeVisits'])
+        self.assertEqual(500, stats['size'])
+        self.assertEqual(1501, len(events))
+        self.assertEqual('get', events[-1][0])
+        self.assertLessEqual(events[-1][1]['nodeVisits'], 20)
+        self.__assertNoCountingKeys(tree.linearize())
+
+    def test_intervalTree(self):
+        tree = instrument(IntervalTree())
+        for x in range(100):
+            tree.insert(x, x + 5)
+
+        self.assertListEqual([(48, 53), (49, 54), (50, 55)], list(tree.stab(50))[-3:])
+        self.assertEqual(100, tree.stats()['operations']['insert'])
+        self.__assertNoCountingKeys([low for low, _ in tree.linearize()])
+
+    def test_btree(self):
+        tree = instrument(BTree(3))
+        keys = [x for x in range(500)] + [7, 7, 7]
+        random.shuffle(keys)
+        for x in keys:
+            tree.insert(x)
+        # the delete may take a level off the tree, no operation visited more nodes than the height before it
+        height = tree.stats()['height']
+        tree.delete(250)
+
+        stats = tree.stats()
+        self.assertGreater(stats['splits'], 0)
+        self.assertGreater(stats['height'], 1)
+        self.assertGreater(stats['comparisons'], 0)
+        self.assertLessEqual(stats['nodeVisits'], 504 * height)
+        self.__assertNoCountingKeys(list(tree))
+        self.assertEqual(502, len(list(tree)))
+        self.assertIs(int, type(tree.get(5)))
+        self.assertIsNone(tree.get(250))
+
+    def test_lookups_shouldReturnPlainKeys(self):
+        structures = [instrument(BTree(3)), instrument(RedBlackTree()), instrument(SkipList(8, 0.5)),
+                      instrument(ConcurrentSkipList(8, 0.5))]
+        for structure in structures:
+            insert = structure.insert if hasattr(structure, 'insert') else structure.add
+            for x in range(100):
+                insert(x)
+
+            self.assertIs(int, type(structure.get(42)), type(structure).__name__)
+            self.assertEqual('42', json.dumps(structure.get(42)))
+
+    def test_skipList(self):
+        skipList = SkipList(16, 0.5)
+        for x in range(0, 200, 2):
+            skipList.add(x)
+        instrument(skipList)
+        for x in range(1, 200, 2):
+            skipList.add(x)
+        skipList.delete(0)
+        skipList.add_many([300, 301])
+
+        stats = skipList.stats()
+        self.assertEqual(201, sum(stats['levelDistribution']))
+        self.assertEqual(stats['height'], max(i for i, count in enumerate(stats['levelDistribution']) if count) + 1)
+        self.assertGreater(stats['searchPathLength'], 0)
+        self.assertEqual({'add': 100, 'delete': 1, 'add_many': 1}, stats['operations'])
+        self.__assertNoCountingKeys(skipList.linearize())
+
+    def test_minMaxHeap(self):
+        heap = instrument(BoundedMinMaxHeap(10))
+        heap.offer_many(range(1000))
+        heap.offer(5000)
+
+        stats = heap.stats()
+        self.assertGreater(stats['swaps'], 0)
+        self.assertEqual({'offer_many': 1, 'offer': 1}, stats['operations'])
+
+        uninstrument(heap)
+        heap.offer(6000)
+        self.assertIs(BoundedMinMaxHeap, type(heap))
+        self.assertEqual(6000, heap.max())
+
+    def test_concurrentSkipList(self):
+        skipList = instrument(ConcurrentSkipList(16, 0.5))
+
+        def worker(keys):
+            for x in keys:
+                skipList.add(x)
+
+        threads = [threading.Thread(target=worker, args=(range(i, 400, 4),)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        skipList.delete(7)
+
+        stats = skipList.stats()
+        self.assertEqual({'add': 400, 'delete': 1}, stats['operations'])
+        self.assertGreaterEqual(stats['searches'], 401)
+        self.assertGreater(stats['comparisons'], 0)
+        self.assertEqual(399, len(skipList.linearize()))
+        self.__assertNoCountingKeys(skipList.linearize())
+
+    def test_pagedBTree(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with PagedBTree(os.path.join(directory, 'index.btree'), pageSize=256, cacheSize=8) as tree:
+                instrument(tree)
+                for x in range(2000):
+                    tree.insert(x)
+                for x in range(0, 2000, 2):
+                    tree.delete(x)
+
+                stats = tree.stats()
+                self.assertGreater(stats['splits'], 0)
+                self.assertGreater(stats['merges'], 0)
+                self.assertGreater(stats['pageReads'], 0)
+                self.assertGreater(stats['height'], 1)
+                self.assertEqual({'insert': 2000, 'delete': 1000}, stats['operations'])
+                self.assertListEqual([x for x in range(1, 2000, 2)], list(tree))
+
+    def test_kdTree(self):
+        tree = instrument(KDTree(np.random.rand(1000, 2), leafSize=8))
+        tree.nearest([0.5, 0.5], 5)
+        for x in range(200):
+            tree.insert([2 + x, 2 + x])
+
+        stats = tree.stats()
+        self.assertGreater(stats['leafScans'], 0)
+        self.assertGreaterEqual(stats['pointsScanned'], 5)
+        self.assertGreater(stats['rebuilds'], 0)
+        self.assertEqual({'nearest': 1, 'insert': 200}, stats['operations'])
+        self.assertEqual(1200, stats['size'])
+
+    def test_uninstrument(self):
+        heap = instrument(MinMaxHeap([3, 1, 2]))
+        heap.pop_min()
+        uninstrument(heap)
+
+        self.assertIs(MinMaxHeap, type(heap))
+        self.assertEqual(2, heap.pop_min())
+        with self.assertRaises(ValueError):
+            uninstrument(heap)
+        with self.assertRaises(ValueError):
+            instrument(instrument(MinMaxHeap()))
+
+    def __assertNoCountingKeys(self, keys: list):
+        for key in keys:
+            self.assertNotIsInstance(key, CountingKey)
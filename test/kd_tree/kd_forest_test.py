@@ -0,0 +1,72 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.kd_tree.kd_forest import KDForest
+from src.kd_tree.kdtree import KDTree
+
+
+class KDForestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.points = np.array([[random.gauss(0, 10) for _ in range(8)] for _ in range(3000)])
+        self.forest = KDForest(self.points, trees=4, leafSize=8, seed=1)
+
+    def test_nearest_withoutBudget_shouldBeExact(self):
+        for _ in range(20):
+            query = np.array([random.gauss(0, 10) for _ in range(8)])
+            expectedDistances = np.sort(np.linalg.norm(self.points - query, axis=1))[:10]
+
+            distances, ids = self.forest.nearest(query, 10)
+
+            np.testing.assert_allclose(expectedDistances, distances)
+            self.assertEqual(10, len(set(ids.tolist())))
+
+    def test_nearest_withLeafBudget_shouldReturnDistinctPoints(self):
+        for _ in range(20):
+            query = np.array([random.gauss(0, 10) for _ in range(8)])
+
+            distances, ids = self.forest.nearest(query, 10, max_leaf_checks=16)
+
+            self.assertEqual(10, len(set(ids.tolist())))
+            np.testing.assert_allclose(distances, np.linalg.norm(self.points[ids] - query, axis=1))
+
+    def test_nearest_withLargerBudget_shouldNotLoseRecall(self):
+        queries = [np.array([random.gauss(0, 10) for _ in range(8)]) for _ in range(50)]
+        truth = [set(np.argsort(np.linalg.norm(self.points - query, axis=1))[:10].tolist()) for query in queries]
+
+        def recall(checks):
+            return sum(len(expected & set(self.forest.nearest(query, 10, max_leaf_checks=checks)[1].tolist()))
+                       for query, expected in zip(queries, truth))
+
+        self.assertLessEqual(recall(2), recall(64))
+        self.assertEqual(500, recall(len(self.points)))
+
+    def test_insertAndDelete_shouldUpdateEveryTree(self):
+        id = self.forest.insert([100] * 8)
+
+        self.assertEqual(len(self.points), id)
+        self.assertEqual(id, self.forest.nearest([99] * 8)[1][0])
+        self.assertTrue(self.forest.delete([100] * 8))
+        self.assertNotEqual(id, self.forest.nearest([99] * 8)[1][0])
+        self.assertEqual(len(self.points), len(self.forest))
+
+    def test_search_forest_whenDimensionsDiffer_shouldRaise(self):
+        with self.assertRaises(ValueError):
+            KDTree.search_forest([self.forest.trees[0], KDTree([[1, 2]])], [0] * 8)
+
+    def test_delete_withDuplicatePoints_shouldDeleteSameIdInEveryTree(self):
+        points = np.vstack((np.tile([0.5, 0.5], (40, 1)), np.random.rand(200, 2)))
+        forest = KDForest(points, trees=4, leafSize=4, seed=3)
+
+        for _ in range(20):
+            self.assertTrue(forest.delete([0.5, 0.5]))
+
+        distances, ids = forest.nearest([0.5, 0.5], 60)
+        self.assertEqual(20, int(np.count_nonzero(distances == 0)))
+        self.assertEqual(60, len(set(ids.tolist())))
+        for tree in forest.trees:
+            self.assertEqual(220, len(tree))
+            self.assertListEqual(sorted(ids[distances == 0].tolist()),
+                                 sorted(tree.within_radius([0.5, 0.5], 0).tolist()))
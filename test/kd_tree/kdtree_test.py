@@ -1,8 +1,220 @@
+import pickle
 import random
 import unittest
 
+import numpy as np
+
+from src.kd_tree.kdtree import KDTree
+
 
 class KDTreeTest(unittest.TestCase):
 
-    def test_get(self):
-        pass
+    def setUp(self):
+        self.points = np.array([[random.uniform(-100, 100) for _ in range(3)] for _ in range(2000)])
+        self.tree = KDTree(self.points, leafSize=8)
+
+    def test_nearest(self):
+        for _ in range(50):
+            query = np.array([random.uniform(-120, 120) for _ in range(3)])
+            expectedDistances = np.sort(np.linalg.norm(self.points - query, axis=1))[:5]
+
+            distances, ids = self.tree.nearest(query, 5)
+
+            np.testing.assert_allclose(expectedDistances, distances)
+            np.testing.assert_allclose(distances, np.linalg.norm(self.points[ids] - query, axis=1))
+
+    def test_nearest_whenPointIsInTree_shouldReturnIt(self):
+        distances, ids = self.tree.nearest(self.points[369])
+
+        self.assertEqual(0, distances[0])
+        self.assertEqual(369, ids[0])
+
+    def test_nearest_whenKIsLargerThanTree_shouldReturnAllPoints(self):
+        tree = KDTree([[1, 1], [2, 2], [3, 3]])
+
+        distances, ids = tree.nearest([0, 0], 10)
+
+        self.assertListEqual([0, 1, 2], ids.tolist())
+
+    def test_nearest_withDuplicatePoints(self):
+        tree = KDTree([[5, 5]] * 100 + [[1, 1]], leafSize=4)
+
+        distances, ids = tree.nearest([0, 0], 2)
+
+        self.assertEqual(100, ids[0])
+        self.assertAlmostEqual(np.hypot(5, 5), distances[1])
+
+    def test_within_radius(self):
+        for _ in range(50):
+            query = np.array([random.uniform(-100, 100) for _ in range(3)])
+            radius = random.uniform(0, 50)
+            expected = np.flatnonzero(np.linalg.norm(self.points - query, axis=1) <= radius)
+
+            self.assertListEqual(expected.tolist(), sorted(self.tree.within_radius(query, radius).tolist()))
+
+    def test_within_box(self):
+        for _ in range(50):
+            lower = np.array([random.uniform(-100, 50) for _ in range(3)])
+            upper = lower + np.array([random.uniform(0, 100) for _ in range(3)])
+            expected = np.flatnonzero(np.all((self.points >= lower) & (self.points <= upper), axis=1))
+
+            self.assertListEqual(expected.tolist(), sorted(self.tree.within_box(lower, upper).tolist()))
+
+    def test_emptyTree(self):
+        tree = KDTree(np.empty((0, 2)))
+
+        distances, ids = tree.nearest([0, 0])
+
+        self.assertEqual(0, len(tree))
+        self.assertEqual(0, len(ids))
+        self.assertEqual(0, len(tree.within_radius([0, 0], 10)))
+
+    def test_insert_shouldReturnNewIdAndBeFound(self):
+        point = np.array([500.0, 500.0, 500.0])
+
+        id = self.tree.insert(point)
+        distances, ids = self.tree.nearest([501, 500, 500])
+
+        self.assertEqual(len(self.points), id)
+        self.assertEqual(len(self.points) + 1, len(self.tree))
+        self.assertEqual(id, ids[0])
+        self.assertEqual(1, distances[0])
+
+    def test_insert_whenTreeIsEmpty(self):
+        tree = KDTree(np.empty((0, 2)), leafSize=4)
+
+        for i in range(1000):
+            tree.insert([i, -i])
+
+        distances, ids = tree.nearest([500.2, -500], 2)
+        self.assertEqual(1000, len(tree))
+        self.assertListEqual([500, 501], ids.tolist())
+        self.assertListEqual(list(range(10, 21)), sorted(tree.within_box([10, -20], [20, -10]).tolist()))
+
+    def test_delete_shouldSkipDeletedPoints(self):
+        self.assertTrue(self.tree.delete(self.points[369]))
+
+        distances, ids = self.tree.nearest(self.points[369])
+
+        self.assertEqual(len(self.points) - 1, len(self.tree))
+        self.assertNotEqual(369, ids[0])
+        self.assertNotIn(369, self.tree.within_radius(self.points[369], 1).tolist())
+
+    def test_delete_whenPointIsMissing_shouldReturnFalse(self):
+        self.assertFalse(self.tree.delete([500, 500, 500]))
+        self.assertEqual(len(self.points), len(self.tree))
+
+    def test_delete_withDuplicatePoints_shouldDeleteOneAtATime(self):
+        tree = KDTree([[5, 5]] * 100 + [[1, 1]], leafSize=4)
+
+        for _ in range(100):
+            self.assertTrue(tree.delete([5, 5]))
+
+        self.assertFalse(tree.delete([5, 5]))
+        self.assertListEqual([100], tree.within_radius([5, 5], 10).tolist())
+
+    def test_insertAndDelete_shouldMatchBruteForce(self):
+        alive = {i: point for i, point in enumerate(self.points)}
+
+        for step in range(6000):
+            if step % 3 == 0:
+                id = random.choice(list(alive))
+                self.assertTrue(self.tree.delete(alive.pop(id)))
+            else:
+                # the inserted points drift away from the others, which unbalances the tree
+                point = np.array([step / 10, random.uniform(-100, 100), random.uniform(-100, 100)])
+                alive[self.tree.insert(point)] = point
+
+        ids = np.array(list(alive))
+        points = np.array([alive[id] for id in ids])
+        self.assertEqual(len(alive), len(self.tree))
+        for _ in range(20):
+            query = np.array([random.uniform(-120, 620) for _ in range(3)])
+            distances = np.linalg.norm(points - query, axis=1)
+
+            np.testing.assert_allclose(np.sort(distances)[:5], self.tree.nearest(query, 5)[0])
+            self.assertListEqual(sorted(ids[distances <= 50].tolist()),
+                                 sorted(self.tree.within_radius(query, 50).tolist()))
+
+    def test_insertAndDelete_shouldReuseFreedRows(self):
+        ids = list(range(len(self.points)))
+        points = dict(enumerate(self.points))
+
+        rowCounts = []
+        for _ in range(6):
+            for _ in range(2000):
+                index = random.randrange(len(ids))
+                ids[index], ids[-1] = ids[-1], ids[index]
+                self.assertTrue(self.tree.delete(points.pop(ids.pop())))
+                point = np.array([random.uniform(-100, 100) for _ in range(3)])
+                id = self.tree.insert(point)
+                points[id] = point
+                ids.append(id)
+            rowCounts.append(self.tree.__getstate__()['rowCount'])
+
+        self.assertEqual(len(self.points), len(self.tree))
+        self.assertLessEqual(rowCounts[-1], 1.2 * rowCounts[2])
+        self.assertLess(rowCounts[-1], 2.5 * len(self.points))
+
+    def test_query_batch_shouldMatchNearest(self):
+        self.tree.delete(self.points[0])
+        self.tree.insert([500, 500, 500])
+        queries = np.array([[random.uniform(-120, 120) for _ in range(3)] for _ in range(100)])
+
+        distances, ids = self.tree.query_batch(queries, 4, workers=2)
+
+        self.assertEqual((100, 4), distances.shape)
+        for row, query in enumerate(queries):
+            expectedDistances, expectedIds = self.tree.nearest(query, 4)
+            np.testing.assert_allclose(expectedDistances, distances[row])
+            self.assertListEqual(expectedIds.tolist(), ids[row].tolist())
+
+    def test_query_batch_whenKIsLargerThanTree_shouldPadRows(self):
+        tree = KDTree([[1, 1], [2, 2]])
+
+        distances, ids = tree.query_batch([[0, 0]] * 10, 3, workers=2)
+
+        self.assertListEqual([[0, 1, -1]] * 10, ids.tolist())
+        self.assertTrue(np.all(np.isinf(distances[:, 2])))
+
+    def test_pickle_shouldKeepPointsAndUpdates(self):
+        self.tree.delete(self.points[369])
+
+        tree = pickle.loads(pickle.dumps(self.tree))
+        id = tree.insert([500, 500, 500])
+
+        self.assertEqual(len(self.points), len(tree))
+        self.assertEqual(len(self.points), id)
+        self.assertNotEqual(369, tree.nearest(self.points[369])[1][0])
+
+    def test_nearest_withEpsilon_shouldBeWithinFactorOfExact(self):
+        for _ in range(50):
+            query = np.array([random.uniform(-120, 120) for _ in range(3)])
+            expectedDistances = np.sort(np.linalg.norm(self.points - query, axis=1))[:5]
+
+            distances, ids = self.tree.nearest(query, 5, epsilon=0.5)
+
+            self.assertEqual(5, len(set(ids.tolist())))
+            self.assertTrue(np.all(distances <= expectedDistances * 1.5 + 1e-9))
+            np.testing.assert_allclose(distances, np.linalg.norm(self.points[ids] - query, axis=1))
+
+    def test_nearest_withLeafBudget_shouldScanAtMostThatManyLeaves(self):
+        distances, ids = self.tree.nearest(self.points[369], 20, max_leaf_checks=1)
+
+        self.assertEqual(369, ids[0])
+        self.assertLessEqual(len(ids), 8)
+
+    def test_nearest_withLargeLeafBudget_shouldBeExact(self):
+        query = np.array([3.0, -7.0, 11.0])
+
+        distances, ids = self.tree.nearest(query, 5, max_leaf_checks=len(self.points))
+
+        np.testing.assert_allclose(np.sort(np.linalg.norm(self.points - query, axis=1))[:5], distances)
+
+    def test_splitCandidates_shouldKeepQueriesExact(self):
+        tree = KDTree(self.points, leafSize=8, splitCandidates=3, seed=7)
+        query = np.array([3.0, -7.0, 11.0])
+
+        distances, ids = tree.nearest(query, 5)
+
+        np.testing.assert_allclose(np.sort(np.linalg.norm(self.points - query, axis=1))[:5], distances)
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from src.key_file.key_file import FLOAT64, HEADER, INT64, PICKLE, dumpKeys, keyEncoding, loadKeys
+
+
+class KeyFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'keys.snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_keyEncoding(self):
+        self.assertEqual(INT64, keyEncoding([1, -2 ** 63, 2 ** 63 - 1]))
+        self.assertEqual(PICKLE, keyEncoding([1, 2 ** 63]))
+        self.assertEqual(FLOAT64, keyEncoding([0.5, -1.0]))
+        self.assertEqual(PICKLE, keyEncoding([1, 0.5]))
+        self.assertEqual(PICKLE, keyEncoding([True]))
+
+    def test_loadKeys(self):
+        dumpKeys(self.path, 'BTree', {'termMinimumDegree': 3}, [-5, 0, 2 ** 40])
+
+        with loadKeys(self.path, 'BTree') as (parameters, keys):
+            self.assertEqual({'termMinimumDegree': 3}, parameters)
+            self.assertListEqual([-5, 0, 2 ** 40], list(keys))
+
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        self.assertEqual(0, (len(content) - 3 * 8) % 8)
+
+    def test_loadKeys_withOtherStructure_shouldRaise(self):
+        dumpKeys(self.path, 'BTree', {}, [1])
+
+        with self.assertRaises(ValueError):
+            with loadKeys(self.path, 'SkipList'):
+                pass
+
+    def test_loadKeys_withCorruptedFile_shouldRaise(self):
+        dumpKeys(self.path, 'BTree', {}, [x for x in range(100)])
+        with open(self.path, 'r+b') as file:
+            file.truncate(HEADER.size + 40)
+
+        with self.assertRaises(ValueError):
+            with loadKeys(self.path, 'BTree'):
+                pass
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot file at all')
+        with self.assertRaises(ValueError):
+            with loadKeys(self.path, 'BTree'):
+                pass
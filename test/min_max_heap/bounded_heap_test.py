@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from src.min_max_heap.bounded_heap import BoundedMinMaxHeap
+
+
+class BoundedMinMaxHeapTest(unittest.TestCase):
+
+    def test_offer_keepLargest(self):
+        stream = [random.randint(0, 10000) for _ in range(5000)]
+        heap = BoundedMinMaxHeap(10)
+
+        for x in stream:
+            heap.offer(x)
+
+        self.assertEqual(10, len(heap))
+        self.assertListEqual(sorted(stream)[-10:], heap.snapshot())
+
+    def test_offer_keepSmallest(self):
+        stream = [random.randint(0, 10000) for _ in range(5000)]
+        heap = BoundedMinMaxHeap(10, keep='smallest')
+
+        for x in stream:
+            heap.offer(x)
+
+        self.assertListEqual(sorted(stream)[:10], heap.snapshot())
+
+    def test_offer_shouldRejectOutOfBounds(self):
+        heap = BoundedMinMaxHeap(3)
+
+        self.assertTrue(heap.offer(5))
+        self.assertTrue(heap.offer(1))
+        self.assertTrue(heap.offer(3))
+        self.assertFalse(heap.offer(1))
+        self.assertTrue(heap.offer(4))
+        self.assertListEqual([3, 4, 5], heap.snapshot())
+
+    def test_offerMany(self):
+        for keep in ('largest', 'smallest'):
+            stream = [random.random() for _ in range(10000)]
+            heap = BoundedMinMaxHeap(50, keep)
+
+            heap.offer_many(stream[:3])
+            retained = heap.offer_many(iter(stream[3:]))
+
+            expected = sorted(stream)[-50:] if keep == 'largest' else sorted(stream)[:50]
+            self.assertListEqual(expected, heap.snapshot())
+            self.assertLess(retained, 10000)
+
+    def test_init_withInvalidArguments_shouldRaise(self):
+        with self.assertRaises(ValueError):
+            BoundedMinMaxHeap(0)
+        with self.assertRaises(ValueError):
+            BoundedMinMaxHeap(5, keep='middle')
+
+    def test_minAndMax(self):
+        heap = BoundedMinMaxHeap(3, keep='smallest')
+        heap.offer_many([7, 2, 9, 4, 1])
+
+        self.assertEqual(1, heap.min())
+        self.assertEqual(4, heap.max())
+        self.assertListEqual([1, 2, 4], sorted(heap))
+        self.assertEqual(3, len(heap))
+
+    def test_unboundedOperations_shouldNotBeExposed(self):
+        heap = BoundedMinMaxHeap(3)
+
+        for name in ('add', 'add_many', 'pushpop', 'replace_min', 'replace_max', 'removeAt', 'from_buffer'):
+            self.assertFalse(hasattr(heap, name), name)
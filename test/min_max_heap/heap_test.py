@@ -1,4 +1,6 @@
+import random
 import unittest
+from array import array
 
 from src.min_max_heap.heap import MinMaxHeap
 
@@ -27,3 +29,182 @@ class MinMaxHeapTest(unittest.TestCase):
 
         self.assertEqual(0, heap.min())
         self.assertEqual(100, heap.max())
+
+    def test_popMinAndPopMax(self):
+        array = [random.randint(0, 500) for _ in range(1000)]
+        heap = MinMaxHeap(array.copy())
+        expected = sorted(array)
+
+        while len(expected) > 0:
+            self.assertEqual(len(expected), len(heap))
+            if random.random() < 0.5:
+                self.assertEqual(expected.pop(0), heap.pop_min())
+            else:
+                self.assertEqual(expected.pop(), heap.pop_max())
+
+        with self.assertRaises(AssertionError):
+            heap.pop_min()
+        with self.assertRaises(AssertionError):
+            heap.pop_max()
+
+    def test_removeAt(self):
+        heap = MinMaxHeap()
+        expected = []
+        for _ in range(500):
+            x = random.randint(0, 1000)
+            heap.add(x)
+            expected.append(x)
+
+        for _ in range(300):
+            expected.remove(heap.removeAt(random.randrange(len(heap))))
+            self.assertEqual(min(expected), heap.min())
+            self.assertEqual(max(expected), heap.max())
+
+        with self.assertRaises(IndexError):
+            heap.removeAt(len(heap))
+
+    def test_pushpopAndReplace(self):
+        heap = MinMaxHeap([5, 1, 9, 3])
+
+        self.assertEqual(0, heap.pushpop(0))
+        self.assertEqual(1, heap.pushpop(4))
+        self.assertEqual(3, heap.replace_min(10))
+        self.assertEqual(10, heap.replace_max(2))
+        self.assertListEqual([2, 4, 5, 9], [heap.pop_min() for _ in range(4)])
+        self.assertEqual(7, heap.pushpop(7))
+
+        with self.assertRaises(AssertionError):
+            heap.replace_min(1)
+        with self.assertRaises(AssertionError):
+            heap.replace_max(1)
+
+    def test_replace_randomized(self):
+        array = [random.randint(0, 1000) for _ in range(300)]
+        heap = MinMaxHeap(array.copy())
+
+        for _ in range(1000):
+            x = random.randint(0, 1000)
+            operation = random.randrange(3)
+            if operation == 0:
+                expected = min(array + [x])
+                self.assertEqual(expected, heap.pushpop(x))
+            elif operation == 1:
+                expected = min(array)
+                self.assertEqual(expected, heap.replace_min(x))
+            else:
+                expected = max(array)
+                self.assertEqual(expected, heap.replace_max(x))
+            array.append(x)
+            array.remove(expected)
+            self.assertEqual(min(array), heap.min())
+            self.assertEqual(max(array), heap.max())
+
+    def test_indexed_updateAndRemove(self):
+        heap = MinMaxHeap(indexed=True)
+        priorities = {}
+        handles = []
+        for name in range(500):
+            priority = random.randint(0, 1000)
+            handles.append(heap.add(priority, name))
+            priorities[name] = priority
+
+        for _ in range(1000):
+            handle = random.choice(handles)
+            if random.random() < 0.3:
+                if heap.contains(handle):
+                    self.assertEqual(priorities.pop(handle.item), heap.remove(handle))
+                    self.assertFalse(heap.contains(handle))
+            elif heap.contains(handle):
+                priority = random.randint(0, 1000)
+                heap.update(handle, priority)
+                priorities[handle.item] = priority
+
+            for h in handles:
+                if heap.contains(h):
+                    self.assertEqual(priorities[h.item], h.priority)
+            self.assertEqual(min(priorities.values()), heap.min_handle().priority)
+            self.assertEqual(max(priorities.values()), heap.max_handle().priority)
+
+        while len(heap) > 0:
+            handle = heap.min_handle()
+            self.assertEqual(min(priorities.values()), priorities.pop(handle.item))
+            heap.pop_min()
+            self.assertEqual(-1, handle.index)
+
+    def test_indexed_withForeignHandle_shouldRaise(self):
+        heap = MinMaxHeap(indexed=True)
+        handle = MinMaxHeap(indexed=True).add(1, 'a')
+        heap.add(2, 'b')
+
+        with self.assertRaises(ValueError):
+            heap.update(handle, 0)
+        with self.assertRaises(ValueError):
+            heap.remove(handle)
+        with self.assertRaises(ValueError):
+            MinMaxHeap().min_handle()
+        self.assertIsNone(MinMaxHeap().add(1))
+
+    def test_indexed_replaceAndInitialElements_shouldReturnUsableHandles(self):
+        heap = MinMaxHeap([5, 1, 9, 3], indexed=True)
+        initial = {handle.priority: handle for handle in heap.handles()}
+
+        heap.update(initial[9], 0)
+        removed, replacing = heap.replace_min(7, 'x')
+        self.assertEqual(0, removed)
+        self.assertEqual('x', replacing.item)
+        removed, pushed = heap.pushpop(4, 'y')
+        self.assertEqual(1, removed)
+        self.assertTupleEqual((0, None), heap.pushpop(0))
+        removed, replacingMax = heap.replace_max(2)
+        self.assertEqual(7, removed)
+        self.assertFalse(heap.contains(replacing))
+        handles = heap.add_many([8, 6])
+
+        heap.update(pushed, 10)
+        heap.remove(handles[1])
+        heap.remove(initial[3])
+        self.assertListEqual([2, 5, 8, 10], [heap.pop_min() for _ in range(4)])
+        self.assertEqual(-1, replacingMax.index)
+
+    def test_typed(self):
+        array = [random.random() for _ in range(1000)]
+        heap = MinMaxHeap(array, typecode='d')
+        expected = sorted(array)
+
+        self.assertEqual(expected[0], heap.pop_min())
+        self.assertEqual(expected[-1], heap.pop_max())
+        heap.add(2.0)
+        self.assertEqual(2.0, heap.max())
+        self.assertEqual(999, len(heap))
+
+    def test_fromBuffer_shouldHeapifyInPlace(self):
+        buffer = array('q', [random.randint(-10 ** 12, 10 ** 12) for _ in range(1000)])
+        expected = sorted(buffer)
+        heap = MinMaxHeap.from_buffer(buffer, 'q')
+
+        self.assertEqual(expected[0], buffer[0])
+        self.assertEqual(expected[0], heap.pop_min())
+        self.assertEqual(expected[-1], heap.pop_max())
+        heap.add_many([10 ** 13, -10 ** 13])
+        self.assertEqual(10 ** 13, heap.pop_max())
+        self.assertEqual(-10 ** 13, heap.pop_min())
+        self.assertListEqual(expected[1:-1], [heap.pop_min() for _ in range(998)])
+
+        with self.assertRaises(ValueError):
+            MinMaxHeap.from_buffer(bytes(16), 'q')
+
+    def test_addMany(self):
+        heap = MinMaxHeap(indexed=True)
+        expected = []
+        for size in [1, 3, 100, 10, 1000, 5]:
+            batch = [random.randint(0, 10000) for _ in range(size)]
+            handles = heap.add_many(batch)
+            expected.extend(batch)
+
+            self.assertListEqual(batch, [h.priority for h in handles])
+            for h in handles:
+                self.assertTrue(heap.contains(h))
+            self.assertEqual(min(expected), heap.min())
+            self.assertEqual(max(expected), heap.max())
+
+        self.assertListEqual(sorted(expected), [heap.pop_min() for _ in range(len(expected))])
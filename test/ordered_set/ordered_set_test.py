@@ -0,0 +1,26 @@
+import random
+import unittest
+
+from src.ordered_set.ordered_set import BACKENDS
+
+
+class OrderedSetTest(unittest.TestCase):
+
+    def test_backendsShouldAgree(self):
+        for name, backend in BACKENDS.items():
+            orderedSet = backend()
+            expected = set()
+
+            for _ in range(3000):
+                key = random.randint(0, 500)
+                if random.random() < 0.6:
+                    self.assertEqual(key not in expected, orderedSet.add(key), name)
+                    expected.add(key)
+                else:
+                    self.assertEqual(key in expected, orderedSet.discard(key), name)
+                    expected.discard(key)
+
+            self.assertEqual(len(expected), len(orderedSet), name)
+            self.assertListEqual(sorted(expected), list(orderedSet), name)
+            self.assertListEqual(sorted(x for x in expected if 100 <= x < 200), list(orderedSet.range(100, 200)))
+            self.assertEqual(250 in expected, 250 in orderedSet)
@@ -0,0 +1,65 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.ordered_set.ordered_set import BTreeSet, RedBlackTreeSet, SkipListSet
+from src.ordered_set.trace import ADD, CONTAINS, DISCARD, RANGE, RecordingOrderedSet, TraceWriter, apply, readTrace
+
+
+class TraceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ops.trace')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_readTrace(self):
+        with TraceWriter(self.path) as writer:
+            writer.write(ADD, 5)
+            writer.write(ADD, -(2 ** 40))
+            writer.write(CONTAINS, 5)
+            writer.writeRange(None, 10)
+            writer.write(DISCARD, 5)
+            writer.writeRange(-1, None)
+
+        self.assertListEqual([(ADD, 5), (ADD, -(2 ** 40)), (CONTAINS, 5), (RANGE, (None, 10)),
+                              (DISCARD, 5), (RANGE, (-1, None))],
+                             list(readTrace(self.path)))
+
+    def test_readTrace_withFloatKeys(self):
+        with TraceWriter(self.path, 'd') as writer:
+            writer.write(ADD, 0.25)
+            writer.writeRange(0.5, 1.5)
+
+        self.assertListEqual([(ADD, 0.25), (RANGE, (0.5, 1.5))], list(readTrace(self.path)))
+
+    def test_replay_shouldReproduceRecordedResults(self):
+        recorded = []
+        with TraceWriter(self.path) as writer:
+            orderedSet = RecordingOrderedSet(BTreeSet(3), writer)
+            for _ in range(2000):
+                key = random.randint(0, 300)
+                choice = random.random()
+                if choice < 0.5:
+                    recorded.append(orderedSet.add(key))
+                elif choice < 0.7:
+                    recorded.append(orderedSet.discard(key))
+                elif choice < 0.9:
+                    recorded.append(key in orderedSet)
+                else:
+                    recorded.append(list(orderedSet.range(key, key + 20)))
+
+        records = list(readTrace(self.path))
+        for backend in (BTreeSet, SkipListSet, RedBlackTreeSet):
+            target = backend()
+            self.assertListEqual(recorded, [apply(target, operation, key) for operation, key in records])
+
+    def test_readTrace_withOtherFile_shouldRaise(self):
+        with open(self.path, 'wb') as file:
+            file.write(bytes(32))
+
+        with self.assertRaises(ValueError):
+            list(readTrace(self.path))
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from src.red_black_tree.interval_tree import IntervalTree
+
+
+class IntervalTreeTest(unittest.TestCase):
+
+    def test_overlapping(self):
+        intervals = self.__randomIntervals(2000)
+
+        tree = IntervalTree()
+        for low, high in intervals:
+            tree.insert(low, high)
+
+        for _ in range(100):
+            lo = random.randint(0, 10000)
+            hi = lo + random.randint(0, 300)
+            expected = sorted((low, high) for low, high in intervals if low <= hi and lo <= high)
+            self.assertListEqual(expected, list(tree.overlapping(lo, hi)))
+
+    def test_overlapping_afterDelete_shouldKeepMaxHigh(self):
+        intervals = self.__randomIntervals(2000)
+
+        tree = IntervalTree()
+        for low, high in intervals:
+            tree.insert(low, high)
+        random.shuffle(intervals)
+        for low, high in intervals[:1200]:
+            tree.delete(low, high)
+        remaining = intervals[1200:]
+
+        self.__assertMaxHigh(tree.root)
+        for _ in range(100):
+            lo = random.randint(0, 10000)
+            hi = lo + random.randint(0, 300)
+            expected = sorted((low, high) for low, high in remaining if low <= hi and lo <= high)
+            self.assertListEqual(expected, list(tree.overlapping(lo, hi)))
+
+    def test_stab(self):
+        tree = IntervalTree()
+        for low, high in [(1, 5), (3, 3), (4, 10), (6, 8), (11, 12)]:
+            tree.insert(low, high)
+
+        self.assertListEqual([(1, 5), (3, 3)], list(tree.stab(3)))
+        self.assertListEqual([(1, 5), (4, 10)], list(tree.stab(5)))
+        self.assertListEqual([(4, 10)], list(tree.stab(10)))
+        self.assertListEqual([], list(tree.stab(13)))
+
+    def test_insert_withReversedInterval_shouldRaise(self):
+        with self.assertRaises(ValueError):
+            IntervalTree().insert(5, 1)
+
+    @staticmethod
+    def __randomIntervals(count: int) -> list:
+        intervals = set()
+        while len(intervals) < count:
+            low = random.randint(0, 10000)
+            intervals.add((low, low + random.randint(0, 500)))
+        return list(intervals)
+
+    def __assertMaxHigh(self, node) -> int:
+        if node is None:
+            return -1
+        maxHigh = max(node.key[1], self.__assertMaxHigh(node.left), self.__assertMaxHigh(node.right))
+        self.assertEqual(maxHigh, node.maxHigh)
+        return maxHigh
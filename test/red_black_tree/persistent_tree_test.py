@@ -0,0 +1,130 @@
+import random
+import threading
+import unittest
+
+from src.red_black_tree.persistent_tree import PersistentRedBlackTree
+
+
+class PersistentRedBlackTreeTest(unittest.TestCase):
+
+    def test_insertAndDelete(self):
+        array = [x for x in range(2000)]
+        sortedArray = array.copy()
+        random.shuffle(array)
+
+        tree = PersistentRedBlackTree()
+        for x in array:
+            tree.insert(x)
+        self.assertListEqual(sortedArray, tree.linearize())
+        self.__assertRedBlackProperties(tree.root)
+
+        for x in array[:1500]:
+            tree.delete(x)
+            sortedArray.remove(x)
+        tree.delete(5000)
+
+        self.assertListEqual(sortedArray, tree.linearize())
+        self.assertEqual(len(sortedArray), len(tree))
+        self.__assertRedBlackProperties(tree.root)
+        self.assertIsNone(tree.get(array[0]))
+        self.assertEqual(array[1999], tree.get(array[1999]))
+
+    def test_duplicates(self):
+        tree = PersistentRedBlackTree()
+        for x in [5, 1, 5, 3, 5]:
+            tree.insert(x)
+        tree.delete(5)
+
+        self.assertListEqual([1, 3, 5, 5], tree.linearize())
+        self.__assertRedBlackProperties(tree.root)
+
+    def test_snapshot_shouldNotChange(self):
+        tree = PersistentRedBlackTree()
+        for x in range(0, 1000, 2):
+            tree.insert(x)
+
+        snapshot = tree.snapshot()
+        for x in range(1, 1000, 2):
+            tree.insert(x)
+        for x in range(0, 500, 2):
+            tree.delete(x)
+
+        self.assertListEqual([x for x in range(0, 1000, 2)], snapshot.linearize())
+        self.assertEqual(500, len(snapshot))
+        self.assertEqual(750, len(tree))
+        self.__assertRedBlackProperties(snapshot.root)
+
+    def test_insert_shouldShareUntouchedSubtrees(self):
+        tree = PersistentRedBlackTree()
+        for x in range(1024):
+            tree.insert(x)
+
+        before = self.__nodes(tree.root)
+        snapshot = tree.snapshot()
+        tree.insert(1024)
+        shared = before & self.__nodes(tree.root)
+
+        self.assertGreater(len(shared), 1000)
+        self.assertIs(snapshot.root.left, tree.root.left)
+
+    def test_selectAndRank(self):
+        tree = PersistentRedBlackTree()
+        keys = [x for x in range(0, 600, 3)]
+        for x in random.sample(keys, len(keys)):
+            tree.insert(x)
+
+        for index, key in enumerate(keys):
+            self.assertEqual(key, tree.select(index))
+            self.assertEqual(index, tree.rank(key))
+        self.assertListEqual([x for x in range(102, 201, 3)], list(tree.range(100, 201)))
+        with self.assertRaises(IndexError):
+            tree.select(len(keys))
+
+    def test_readersDuringWrites(self):
+        tree = PersistentRedBlackTree()
+        for x in range(1000):
+            tree.insert(x)
+        errors = []
+
+        def reader():
+            for _ in range(20):
+                snapshot = tree.snapshot()
+                keys = snapshot.linearize()
+                if keys != sorted(keys) or len(keys) != len(snapshot):
+                    errors.append(keys)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for x in range(1000, 3000):
+            tree.insert(x)
+            tree.delete(x - 1000)
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([], errors)
+        self.assertListEqual([x for x in range(2000, 3000)], tree.linearize())
+
+    def __nodes(self, node) -> set:
+        result = set()
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node is not None:
+                result.add(id(node))
+                stack.append(node.left)
+                stack.append(node.right)
+        return result
+
+    def __assertRedBlackProperties(self, node, isRoot=True) -> int:
+        if node is None:
+            return 0
+        if isRoot:
+            self.assertFalse(node.red)
+        if node.red:
+            self.assertFalse(node.left is not None and node.left.red)
+            self.assertFalse(node.right is not None and node.right.red)
+        self.assertEqual(1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0), node.size)
+        leftHeight = self.__assertRedBlackProperties(node.left, False)
+        self.assertEqual(leftHeight, self.__assertRedBlackProperties(node.right, False))
+        return leftHeight + (0 if node.red else 1)
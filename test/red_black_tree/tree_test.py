@@ -67,3 +67,194 @@ class RedBlackTreeTest(unittest.TestCase):
             sortedArray.remove(x)
 
         self.assertListEqual(sortedArray, tree.linearize())
+
+    def test_delete_shouldKeepRedBlackProperties(self):
+        array = [x for x in range(1000)]
+        random.shuffle(array)
+
+        tree = RedBlackTree()
+        for x in array:
+            tree.insert(x)
+        for x in array[:700]:
+            tree.delete(x)
+
+        self.assertEqual(Color.BLACK, tree.root.color)
+        self.__assertBlackHeight(tree.root)
+
+    def test_select(self):
+        array = [x for x in range(0, 2000, 2)]
+        sortedArray = array.copy()
+        random.shuffle(array)
+
+        tree = RedBlackTree()
+        for x in array:
+            tree.insert(x)
+        for x in array[:300]:
+            tree.delete(x)
+            sortedArray.remove(x)
+
+        self.assertEqual(len(sortedArray), len(tree))
+        for index, key in enumerate(sortedArray):
+            self.assertEqual(key, tree.select(index))
+        self.assertEqual(sortedArray[-1], tree.select(-1))
+        with self.assertRaises(IndexError):
+            tree.select(len(sortedArray))
+
+    def test_rank(self):
+        array = [x for x in range(0, 2000, 2)]
+        random.shuffle(array)
+
+        tree = RedBlackTree()
+        for x in array:
+            tree.insert(x)
+
+        self.assertEqual(0, tree.rank(0))
+        self.assertEqual(250, tree.rank(500))
+        self.assertEqual(251, tree.rank(501))
+        self.assertEqual(1000, tree.rank(5000))
+        self.assertEqual(50, tree.count_range(100, 200))
+        self.assertEqual(0, tree.count_range(200, 100))
+
+    def test_fromSorted(self):
+        for n in [0, 1, 2, 3, 7, 8, 100, 1023]:
+            tree = RedBlackTree.from_sorted(range(n))
+
+            self.assertListEqual([x for x in range(n)], tree.linearize())
+            self.assertEqual(n, len(tree))
+            if n > 0:
+                self.assertEqual(Color.BLACK, tree.root.color)
+                self.__assertBlackHeight(tree.root)
+
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_sorted([1, 3, 2])
+
+    def test_join(self):
+        for leftSize, rightSize in [(0, 10), (10, 0), (1, 500), (500, 1), (300, 300)]:
+            tree = self.__randomTree(range(leftSize))
+            other = self.__randomTree(range(leftSize, leftSize + rightSize))
+
+            tree.join(other)
+
+            self.assertListEqual([x for x in range(leftSize + rightSize)], tree.linearize())
+            self.assertIsNone(other.root)
+            if tree.root is not None:
+                self.__assertBlackHeight(tree.root)
+
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_sorted([5, 6]).join(RedBlackTree.from_sorted([1]))
+
+    def test_split(self):
+        for key in [-1, 0, 250, 251, 499, 1000]:
+            tree = self.__randomTree(range(0, 1000, 2))
+
+            greater = tree.split(key)
+
+            self.assertListEqual([x for x in range(0, 1000, 2) if x < key], tree.linearize())
+            self.assertListEqual([x for x in range(0, 1000, 2) if x >= key], greater.linearize())
+            for part in (tree, greater):
+                if part.root is not None:
+                    self.assertEqual(Color.BLACK, part.root.color)
+                    self.__assertBlackHeight(part.root)
+
+    def test_setOperations(self):
+        first = set(random.sample(range(3000), 1000))
+        second = set(random.sample(range(3000), 200))
+
+        for operation, expected in [('union', first | second),
+                                    ('intersection', first & second),
+                                    ('difference', first - second)]:
+            tree = self.__randomTree(first)
+            other = RedBlackTree.from_sorted(sorted(second))
+
+            getattr(tree, operation)(other)
+
+            self.assertListEqual(sorted(expected), tree.linearize())
+            self.assertEqual(len(expected), len(tree))
+            self.assertIsNone(other.root)
+            if tree.root is not None:
+                self.__assertBlackHeight(tree.root)
+
+    def test_setOperations_withItself(self):
+        tree = RedBlackTree.from_sorted(range(100))
+
+        tree.union(tree)
+        self.assertListEqual([x for x in range(100)], tree.linearize())
+        tree.intersection(tree)
+        self.assertListEqual([x for x in range(100)], tree.linearize())
+        with self.assertRaises(ValueError):
+            tree.join(tree)
+        self.assertListEqual([x for x in range(100)], tree.linearize())
+        tree.difference(tree)
+        self.assertListEqual([], tree.linearize())
+
+    def test_iter(self):
+        tree = self.__randomTree(range(500))
+
+        self.assertListEqual([x for x in range(500)], list(tree))
+        self.assertListEqual([x for x in range(499, -1, -1)], list(reversed(tree)))
+        self.assertListEqual([], list(RedBlackTree()))
+
+    def test_range(self):
+        tree = self.__randomTree(range(0, 1000, 2))
+
+        self.assertListEqual([x for x in range(100, 200, 2)], list(tree.range(99, 200)))
+        self.assertListEqual([x for x in range(198, 99, -2)], list(tree.range(99, 200, reverse=True)))
+        self.assertListEqual([x for x in range(0, 10, 2)], list(tree.range(hi=10)))
+        self.assertListEqual([x for x in range(998, 989, -2)], list(tree.range(lo=990, reverse=True)))
+        self.assertListEqual([], list(tree.range(300, 300)))
+
+        iterator = tree.range(lo=501)
+        self.assertEqual(502, next(iterator))
+        self.assertEqual(504, next(iterator))
+
+    def test_floorAndCeiling(self):
+        tree = self.__randomTree(range(0, 1000, 10))
+
+        self.assertEqual(500, tree.floor(500))
+        self.assertEqual(500, tree.floor(509))
+        self.assertIsNone(tree.floor(-1))
+        self.assertEqual(510, tree.ceiling(501))
+        self.assertEqual(0, tree.ceiling(-5))
+        self.assertIsNone(tree.ceiling(991))
+
+    def test_minAndMax(self):
+        tree = self.__randomTree(range(-50, 50))
+
+        self.assertEqual(-50, tree.min())
+        self.assertEqual(49, tree.max())
+        with self.assertRaises(AssertionError):
+            RedBlackTree().min()
+        with self.assertRaises(AssertionError):
+            RedBlackTree().max()
+
+    @staticmethod
+    def __randomTree(keys) -> RedBlackTree:
+        array = list(keys)
+        random.shuffle(array)
+        tree = RedBlackTree()
+        for x in array:
+            tree.insert(x)
+        return tree
+
+    def __assertBlackHeight(self, node) -> int:
+        if node is None:
+            return 0
+        if node.color == Color.RED:
+            self.assertFalse(node.left is not None and node.left.color == Color.RED)
+            self.assertFalse(node.right is not None and node.right.color == Color.RED)
+        for child in (node.left, node.right):
+            if child is not None:
+                self.assertIs(node, child.parent)
+        self.assertEqual(1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0), node.size)
+        leftHeight = self.__assertBlackHeight(node.left)
+        self.assertEqual(leftHeight, self.__assertBlackHeight(node.right))
+        return leftHeight + (1 if node.color == Color.BLACK else 0)
+
+    def test_nodeColor(self):
+        node = TreeNode(1, Color.RED)
+
+        self.assertEqual(Color.RED, node.color)
+        node.color = Color.BLACK
+        self.assertEqual(Color.BLACK, node.color)
+        self.assertFalse(node.red)
+        self.assertFalse(hasattr(node, '__dict__'))
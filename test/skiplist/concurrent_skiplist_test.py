@@ -0,0 +1,56 @@
+import random
+import threading
+import unittest
+
+from src.skiplist.concurrent_skiplist import ConcurrentSkipList
+
+
+class ConcurrentSkipListTest(unittest.TestCase):
+
+    def test_add(self):
+        expectedResult = [3, 6, 7, 9, 12, 17, 19, 21, 25, 26]
+        initialData = expectedResult.copy()
+        random.shuffle(initialData)
+
+        skipList = ConcurrentSkipList(3, 0.5)
+        for key in initialData:
+            self.assertTrue(skipList.add(key))
+
+        self.assertFalse(skipList.add(19))
+        self.assertListEqual(expectedResult, skipList.linearize())
+        self.assertEqual(19, skipList.get(19))
+
+    def test_delete(self):
+        skipList = ConcurrentSkipList(3, 0.5)
+        for key in range(100):
+            skipList.add(key)
+
+        self.assertTrue(skipList.delete(19))
+        self.assertFalse(skipList.delete(19))
+        self.assertFalse(skipList.delete(500))
+        self.assertIsNone(skipList.get(19))
+        self.assertListEqual([x for x in range(20, 30) if x != 19], list(skipList.range(19, 30)))
+
+    def test_concurrentWriters(self):
+        skipList = ConcurrentSkipList(10, 0.5)
+        for key in range(0, 4000, 2):
+            skipList.add(key)
+
+        def writer(offset):
+            for key in range(offset, 4000, 8):
+                skipList.add(key + 1)
+                skipList.delete(key)
+
+        def reader():
+            for _ in range(20):
+                keys = skipList.linearize()
+                self.assertListEqual(sorted(keys), keys)
+
+        threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(0, 8, 2)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([x for x in range(1, 4000, 2)], skipList.linearize())
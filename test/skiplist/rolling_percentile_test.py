@@ -0,0 +1,24 @@
+import math
+import random
+import unittest
+
+from src.skiplist.rolling_percentile import RollingPercentile
+
+
+class RollingPercentileTest(unittest.TestCase):
+
+    def test_percentile(self):
+        stream = [random.randint(0, 50) for _ in range(2000)]
+        rolling = RollingPercentile(100)
+
+        for i, value in enumerate(stream):
+            rolling.add(value)
+            window = sorted(stream[max(0, i - 99): i + 1])
+
+            self.assertEqual(len(window), len(rolling))
+            self.assertEqual(window[math.ceil(len(window) / 2) - 1], rolling.median())
+            self.assertEqual(window[math.ceil(len(window) * 0.99) - 1], rolling.percentile(99))
+
+    def test_percentile_whenEmpty_shouldRaise(self):
+        with self.assertRaises(AssertionError):
+            RollingPercentile(10).median()
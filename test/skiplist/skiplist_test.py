@@ -1,5 +1,7 @@
-import unittest
+import os
 import random
+import tempfile
+import unittest
 
 from src.skiplist.skiplist import SkipList
 
@@ -41,3 +43,123 @@ class SkipListTest(unittest.TestCase):
 
         self.assertIsNone(skipList.get(19))
         self.assertIsNone(skipList.get(500))
+
+    def test_at(self):
+        expectedResult = [x for x in range(0, 1000, 3)]
+        initialData = expectedResult.copy()
+        random.shuffle(initialData)
+
+        skipList = SkipList(8, 0.5)
+        for key in initialData:
+            skipList.add(key)
+        for key in initialData[:100]:
+            skipList.delete(key)
+            expectedResult.remove(key)
+
+        self.assertEqual(len(expectedResult), len(skipList))
+        for index, key in enumerate(expectedResult):
+            self.assertEqual(key, skipList.at(index))
+        self.assertEqual(expectedResult[-1], skipList.at(-1))
+        with self.assertRaises(IndexError):
+            skipList.at(len(expectedResult))
+
+    def test_rank(self):
+        initialData = [3, 6, 7, 9, 12, 17, 19, 21, 25, 26]
+        random.shuffle(initialData)
+
+        skipList = SkipList(3, 0.5)
+        for key in initialData:
+            skipList.add(key)
+
+        self.assertEqual(0, skipList.rank(3))
+        self.assertEqual(4, skipList.rank(12))
+        self.assertEqual(5, skipList.rank(13))
+        self.assertEqual(10, skipList.rank(100))
+        self.assertEqual(3, skipList.count_between(7, 17))
+        self.assertEqual(0, skipList.count_between(17, 7))
+
+    def test_percentile(self):
+        initialData = [x for x in range(1, 101)]
+        random.shuffle(initialData)
+
+        skipList = SkipList(8, 0.5)
+        for key in initialData:
+            skipList.add(key)
+
+        self.assertEqual(1, skipList.percentile(0))
+        self.assertEqual(50, skipList.median())
+        self.assertEqual(99, skipList.percentile(99))
+        self.assertEqual(100, skipList.percentile(100))
+
+    def test_add_many(self):
+        skipList = SkipList(8, 0.5)
+        skipList.add_many([x for x in range(0, 1000, 2)])
+        skipList.add_many([x for x in range(1, 1000, 2)])
+        skipList.add_many([5, 3, 2000, 1])
+
+        self.assertListEqual([x for x in range(1000)] + [2000], skipList.linearize())
+        self.assertEqual(1001, len(skipList))
+        self.assertEqual(500, skipList.at(500))
+
+    def test_add_many_withRepeatedKeys_shouldAddEachKeyOnce(self):
+        skipList = SkipList(8, 0.5)
+        skipList.add_many([1, 2, 2, 2, 3])
+        skipList.add_many([3, 3, 4, 4, 0, 0])
+
+        self.assertListEqual([0, 1, 2, 3, 4], skipList.linearize())
+        self.assertEqual(5, len(skipList))
+        self.assertEqual(4, skipList.at(4))
+
+    def test_delete_many(self):
+        skipList = SkipList(8, 0.5)
+        skipList.add_many([x for x in range(1000)])
+
+        skipList.delete_many([x for x in range(0, 1000, 2)] + [5000])
+
+        self.assertListEqual([x for x in range(1, 1000, 2)], skipList.linearize())
+        self.assertEqual(500, len(skipList))
+        self.assertEqual(201, skipList.at(100))
+
+    def test_range(self):
+        skipList = SkipList(8, 0.5)
+        skipList.add_many([x for x in range(0, 1000, 2)])
+
+        self.assertListEqual([x for x in range(100, 200, 2)], list(skipList.range(100, 200)))
+        self.assertListEqual([x for x in range(102, 200, 2)], list(skipList.range(101, 199)))
+        self.assertListEqual([x for x in range(0, 10, 2)], list(skipList.range(hi=10)))
+        self.assertListEqual([], list(skipList.range(2000)))
+
+    def test_from_sorted(self):
+        keys = [x for x in range(0, 3000, 3)]
+        skipList = SkipList.from_sorted(keys[:1] + keys, 12, 0.5)
+
+        self.assertListEqual(keys, skipList.linearize())
+        self.assertEqual(len(keys), len(skipList))
+        for index in range(0, len(keys), 7):
+            self.assertEqual(keys[index], skipList.at(index))
+            self.assertEqual(index, skipList.rank(keys[index]))
+
+        skipList.add(1)
+        skipList.delete(3)
+        self.assertEqual(1, skipList.at(1))
+        self.assertEqual(6, skipList.at(2))
+        self.assertEqual(len(keys), len(skipList))
+
+        with self.assertRaises(ValueError):
+            SkipList.from_sorted([2, 1], 4, 0.5)
+
+    def test_dumpAndLoad(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'keys.snapshot')
+            for keys in ([x * 0.5 for x in range(1000)], [str(x) for x in range(100, 400)], []):
+                skipList = SkipList(10, 0.5)
+                for key in random.sample(keys, len(keys)):
+                    skipList.add(key)
+
+                skipList.dump(path)
+                loaded = SkipList.load(path)
+
+                self.assertListEqual(sorted(keys), loaded.linearize())
+                self.assertEqual(10, loaded.maxLevel)
+                if len(keys) > 0:
+                    self.assertEqual(sorted(keys)[len(keys) // 2], loaded.at(len(keys) // 2))